@@ -20,10 +20,9 @@ import json
 import re
 import base64
 
-from engine.data_provider import DataProvider
-from ui.components import premium_card, kitsune_sidebar_header, asset_header, macro_insight_banner, render_mascot, render_header, render_agent_message, render_agent_sandbox
+from engine.registry import get_data_provider, get_analytics_engine
+from ui.components import premium_card, kitsune_sidebar_header, asset_header, macro_insight_banner, render_mascot, render_header, render_agent_message, render_agent_sandbox, ticker_selector, ticker_multiselector
 from ui.localization import TRANSLATIONS
-from engine.analytics import AnalyticsEngine
 from engine.kitsune import KitsuneAI
 from engine.report_generator import ReportGenerator
 from engine.agent import AgentEngine
@@ -129,15 +128,16 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 def get_engines():
+    # Provider and analytics are shared process-wide; the AI engine keeps per-session model state
     if 'provider' not in st.session_state:
-        st.session_state.provider = DataProvider()
+        st.session_state.provider = get_data_provider()
     if 'analytics' not in st.session_state:
-        st.session_state.analytics = AnalyticsEngine()
+        st.session_state.analytics = get_analytics_engine()
     if 'sensei' not in st.session_state:
         st.session_state.sensei = KitsuneAI()
     return st.session_state.provider, st.session_state.analytics, st.session_state.sensei
 
-def render_report_hub(t, provider, kitsune, analytics, all_tickers):
+def render_report_hub(t, provider, kitsune, analytics):
     st.title(t['report_hub'])
     st.markdown(f"> {t['report_outlook']}")
     
@@ -146,9 +146,8 @@ def render_report_hub(t, provider, kitsune, analytics, all_tickers):
     
     with col_left:
         st.markdown(f"#### {t['active_selection']}")
-        assets = st.multiselect("Add Assets to Brief", 
-                                all_tickers,
-                                default=["BTC/USDT", "ETH/USDT"] if "BTC/USDT" in all_tickers else [])
+        assets = ticker_multiselector("Add Assets to Brief", provider.search_tickers, key="brief_assets",
+                                      default=["BTC/USDT", "ETH/USDT"])
         st.divider()
         generate_clicked = st.button(t["generate_report"], use_container_width=True, type="primary")
     
@@ -159,18 +158,22 @@ def render_report_hub(t, provider, kitsune, analytics, all_tickers):
         else:
             # We show a limited grid for the report hub preview
             cols_icons = st.columns(3)
+            # Prices come from the in-memory ticker snapshots; bars (for metrics) and headlines in one concurrent batch
+            quotes = provider.get_quotes(assets)
+            batch = []
+            for ticker in assets:
+                batch.append({"kind": "asset", "ticker": ticker})
+                batch.append({"kind": "news", "ticker": ticker})
+            results = provider.fetch_many(batch)
+            basket_frames = {}
             for i, ticker in enumerate(assets):
-                data = provider.fetch_crypto_data(ticker, timeframe='1d', limit=2)
-                if not data.empty:
-                    close_col = 'close' if 'close' in data.columns else 'Close'
-                    price = data[close_col].iloc[-1]
-                    change = 0.0
-                    if len(data) > 1:
-                        prev_price = data[close_col].iloc[-2]
-                        change = ((price - prev_price) / prev_price) * 100
+                data, news = results[2 * i], results[2 * i + 1] or []
+                if data is not None and not data.empty:
+                    basket_frames[ticker] = data
+                    quote = quotes.get(ticker) or {"last": float(data['close'].iloc[-1]), "change_pct": 0.0}
+                    price, change = quote["last"], quote["change_pct"]
                     
-                    news = provider.fetch_news(ticker)
-                    sentiment = sensei.analyze_sentiment(news)
+                    sentiment = kitsune.analyze_sentiment(news)
                     metrics = analytics.calculate_metrics(data)
                     neural_info = analytics.neural_core.predict_price_trend(data)
                     
@@ -193,6 +196,17 @@ def render_report_hub(t, provider, kitsune, analytics, all_tickers):
                         </div>
                         """, unsafe_allow_html=True)
 
+            if basket_frames:
+                # Equal-weight basket; correlated paths run on the analytics process pool
+                risk = analytics.portfolio_var(basket_frames, seed=42)
+                st.markdown("#### Portfolio Risk (VaR / CVaR)")
+                if risk.empty:
+                    st.caption("Not enough overlapping history across the selected assets.")
+                else:
+                    st.dataframe(risk.style.format({c: "{:.2%}" for c in risk.columns if c != "Horizon (days)"}),
+                                 hide_index=True, use_container_width=True)
+                    st.caption("Equal-weight basket, 100k correlated Monte Carlo paths; losses as a share of portfolio value.")
+
     if generate_clicked and selected_basket_data:
         with st.spinner("Synthesizing institutional data..."):
             generator = ReportGenerator(kitsune)
@@ -218,17 +232,19 @@ def run_background_shadows(model_name, kitsune):
     try:
         agent = AgentEngine(model_name=model_name)
         
-        # 1. Alpha Hunter Analysis
-        alpha_report = agent.run_alpha_benchmark()
-        kitsune.update_relational_memory(f"ALPHA HUNTER LOG:\n{alpha_report}")
-        
-        # 2. UI Architect Analysis
-        ui_report = agent.run_ui_benchmark()
-        kitsune.update_relational_memory(f"UI ARCHITECT LOG:\n{ui_report}")
-        
-        # 3. Kitsune Oracle (Deep $ATH Research)
-        oracle_report = agent.run_oracle_research()
-        kitsune.update_relational_memory(f"KITSUNE ORACLE LOG:\n{oracle_report}")
+        # Market data requested by shadow agents queues behind interactive users
+        with get_data_provider().rate_scheduler.background():
+            # 1. Alpha Hunter Analysis
+            alpha_report = agent.run_alpha_benchmark()
+            kitsune.update_relational_memory(f"ALPHA HUNTER LOG:\n{alpha_report}")
+            
+            # 2. UI Architect Analysis
+            ui_report = agent.run_ui_benchmark()
+            kitsune.update_relational_memory(f"UI ARCHITECT LOG:\n{ui_report}")
+            
+            # 3. Kitsune Oracle (Deep $ATH Research)
+            oracle_report = agent.run_oracle_research()
+            kitsune.update_relational_memory(f"KITSUNE ORACLE LOG:\n{oracle_report}")
         
     except Exception as e:
         print(f"Shadow Agent Thread Error: {e}")
@@ -375,18 +391,23 @@ def render_world_chain_hub(t, provider, kitsune, lang):
     # Tech Diagnostics (RPC)
     chain_info = provider.get_athene_chain_status()
     st.markdown(f"#### ⛓️ World Chain Tech-Bridge")
-    t1, t2, t3 = st.columns(3)
+    t1, t2, t3, t4, t5 = st.columns(5)
     with t1: st.metric("Network Status", chain_info.get('status', 'N/A'), delta=None if chain_info.get('status') == "Online" else -1)
     with t2: st.metric("Current Block", f"#{chain_info.get('block', 'N/A')}")
-    with t3: st.metric("Network Capacity", chain_info.get('tps_est', '---'), help="Expected peak TPS on World Chain")
+    with t3: st.metric("Throughput", chain_info.get('tps_est', '---'), help="Observed transactions per second over the last 100 blocks")
+    with t4: st.metric("Block Time", f"{chain_info['block_time']:.2f}s" if chain_info.get('block_time') else "---")
+    with t5: st.metric("Gas Used", f"{chain_info['gas_utilization']:.1%}" if 'gas_utilization' in chain_info else "---",
+                       help=f"Base fee: {chain_info['base_fee_gwei']:.4f} gwei" if chain_info.get('base_fee_gwei') is not None else None)
 
     col_main, col_oracle, col_chat = st.columns([1.2, 0.8, 1], gap="medium")
     
     with col_main:
         # A. WLD Miner Intelligence Panel
         st.markdown(f"#### 💎 {t.get('wld_miner_title', 'WLD Miner Intelligence')}")
-        wld_miner_pool = provider.get_world_chain_assets()["WLD_MINER"]
-        wld_miner_data = provider.fetch_dex_price(wld_miner_pool)
+        world_assets = provider.get_world_chain_assets()
+        # Every watched pool in one GeckoTerminal request
+        dex_quotes = provider.fetch_dex_prices(list(world_assets.values()))
+        wld_miner_data = dex_quotes[world_assets["WLD_MINER"]]
         
         w1, w2 = st.columns(2)
         with w1:
@@ -434,8 +455,7 @@ def render_world_chain_hub(t, provider, kitsune, lang):
         # D. Market Pulse
         st.divider()
         st.markdown("#### Real-time World Hub Prices (On-Chain)")
-        atn_pool = provider.get_world_chain_assets()["ATHENE"]
-        atn_data = provider.fetch_dex_price(atn_pool)
+        atn_data = dex_quotes[world_assets["ATHENE"]]
         
         p1, p2 = st.columns(2)
         with p1: st.metric("WLD Miner / WETH", f"${wld_miner_data['price']:.10f}", f"{wld_miner_data['change_24h']:.2f}%")
@@ -517,13 +537,11 @@ def main():
                 dca_freq_label = st.selectbox(t.get('dca_frequency', 'Frequency'), ['Daily', 'Weekly', 'Monthly'], index=1)
                 dca_freq = {'Daily': 1, 'Weekly': 7, 'Monthly': 30}.get(dca_freq_label, 7)
 
-        # Asset Data Cache
-        crypto_tickers = provider.get_all_crypto_tickers()
-        macro_tickers = list(provider.macro_tickers.keys())
-        all_tickers = macro_tickers + crypto_tickers
+        # Asset universe (crypto pairs, macro names and World Chain pools) behind the type-ahead pickers
+        provider.get_all_crypto_tickers()
 
         if app_mode == "Reports":
-            render_report_hub(t, provider, kitsune, analytics, all_tickers)
+            render_report_hub(t, provider, kitsune, analytics)
         elif app_mode == "Athene Hub":
             render_world_chain_hub(t, provider, kitsune, lang)
         elif app_mode == "Archive":
@@ -535,13 +553,10 @@ def main():
             # Asset Selectors
             c1, c2 = st.columns(2)
             with c1:
-                primary_default = "BTC/USDT"
-                if "ATH/USDT" in all_tickers: primary_default = "ATH/USDT"
-                elif "BTC/USDT" in all_tickers: primary_default = "BTC/USDT"
-                
-                primary = st.selectbox(t["asset_primary"], all_tickers, index=all_tickers.index(primary_default) if primary_default in all_tickers else 0)
+                primary_default = "ATH/USDT" if "ATH/USDT" in provider.ticker_index else "BTC/USDT"
+                primary = ticker_selector(t["asset_primary"], provider.search_tickers, key="primary_asset", default=primary_default)
             with c2:
-                secondary = st.selectbox(t["asset_optional"], [""] + all_tickers)
+                secondary = ticker_selector(t["asset_optional"], provider.search_tickers, key="secondary_asset", allow_empty=True)
 
             st.divider()
             
@@ -554,8 +569,9 @@ def main():
             with col_data:
                 # Market Overview
                 cols = st.columns(4)
-            for i, tick in enumerate(["BTC-USD", "S&P500", "GOLD", "DXY"]):
-                p = provider.get_latest_price(tick)
+            pulse_tickers = ["BTC-USD", "S&P500", "GOLD", "DXY"]
+            pulse_prices = provider.fetch_many([{"kind": "price", "ticker": tick} for tick in pulse_tickers])
+            for i, (tick, p) in enumerate(zip(pulse_tickers, pulse_prices)):
                 with cols[i]:
                     premium_card(tick, f"${p:,.2f}" if p else "N/A", "Market Pulse")
 
@@ -563,9 +579,8 @@ def main():
             if primary:
                 data = provider.get_asset_data(primary)
                 if not data.empty:
-                    col = 'close' if 'close' in data.columns else 'Close'
-                    price = float(data[col].iloc[-1])
-                    returns = data[col].pct_change().dropna()
+                    price = float(data['close'].iloc[-1])
+                    returns = data['close'].pct_change().dropna()
                     change = float(returns.iloc[-1] * 100) if not returns.empty else 0.0
                     
                     asset_header(primary, price, change)
@@ -573,26 +588,40 @@ def main():
                     tabs = st.tabs([t["price_action"], t["monte_carlo"], t["scenario_sandbox"], t["inst_intel"], t["neural_prediction"]])
                     
                     with tabs[0]:
-                        fig = go.Figure(data=[go.Candlestick(x=data.index,
-                                        open=data['open'] if 'open' in data else data['Open'],
-                                        high=data['high'] if 'high' in data else data['High'],
-                                        low=data['low'] if 'low' in data else data['Low'],
-                                        close=data[col])])
+                        chart_data = data
+                        if "/" in primary:
+                            # Intraday views derive from one 1h feed, weekly from the daily bars already held
+                            chart_tf = st.radio("TF", ["1h", "4h", "1d", "1w"], index=2, horizontal=True, label_visibility="collapsed", key="chart_tf")
+                            tf_base = {"1h": "1h", "4h": "1h", "1w": "1d"}
+                            if chart_tf in tf_base:
+                                chart_data = provider.fetch_resampled(primary, chart_tf, base_timeframe=tf_base[chart_tf])
+                        fig = go.Figure(data=[go.Candlestick(x=chart_data.index,
+                                        open=chart_data['open'],
+                                        high=chart_data['high'],
+                                        low=chart_data['low'],
+                                        close=chart_data['close'])])
                         fig.update_layout(template="plotly_dark", height=400, margin=dict(t=0,b=0,l=0,r=0))
                         st.plotly_chart(fig, use_container_width=True)
                     
                     with tabs[1]:
-                        # Monte Carlo
-                        mu = returns.mean() * 252
-                        sigma = returns.std() * np.sqrt(252)
-                        paths = analytics.monte_carlo_simulation(price, 90, mu, sigma, 100)
+                        # Monte Carlo (drift/volatility estimated on multi-year history where available)
+                        mc_returns = returns
+                        if "/" in primary:
+                            history = provider.fetch_crypto_history(primary, '1d')
+                            if len(history) > len(data):
+                                mc_returns = history['close'].pct_change().dropna()
+                        mu = mc_returns.mean() * 252
+                        sigma = mc_returns.std() * np.sqrt(252)
+                        # 100k paths streamed into percentile bands; no path matrix reaches the chart
+                        bands = analytics.monte_carlo_bands(price, 90, mu, sigma, 100_000, seed=42)
                         
                         fig_mc = go.Figure()
-                        for i in range(50):
-                            fig_mc.add_trace(go.Scatter(y=paths[i], mode='lines', line=dict(width=0.5, color='rgba(88, 166, 255, 0.1)'), showlegend=False))
+                        for lo, hi, fill, name in [('p5', 'p95', 'rgba(88, 166, 255, 0.12)', '5–95%'),
+                                                   ('p25', 'p75', 'rgba(88, 166, 255, 0.28)', '25–75%')]:
+                            fig_mc.add_trace(go.Scatter(y=bands[lo], mode='lines', line=dict(width=0), showlegend=False, hoverinfo='skip'))
+                            fig_mc.add_trace(go.Scatter(y=bands[hi], mode='lines', line=dict(width=0), fill='tonexty', fillcolor=fill, name=name))
                         
-                        median_path = np.median(paths, axis=0)
-                        fig_mc.add_trace(go.Scatter(y=median_path, mode='lines', line=dict(width=3, color='#7EE787'), name='Median Projection'))
+                        fig_mc.add_trace(go.Scatter(y=bands['p50'], mode='lines', line=dict(width=3, color='#7EE787'), name='Median Projection'))
                         fig_mc.update_layout(
                             template="plotly_dark",
                             plot_bgcolor='rgba(0,0,0,1)',
@@ -617,6 +646,7 @@ def main():
                         i1, i2 = st.columns(2)
                         with i1:
                             st.markdown(f"**{t['order_flow']}**")
+                            provider.subscribe_order_book(primary)
                             ob = provider.fetch_order_book(primary)
                             imb = analytics.analyze_order_imbalance(ob)
                             st.metric("Bias", imb['bias'], f"Ratio: {imb['ratio']:.2f}")
@@ -654,12 +684,9 @@ def main():
             # Correlation Sidebar (Column or extra section)
             st.divider()
             with st.expander(t["corr_matrix"], expanded=True):
-                macro_dfs = {
-                    "S&P500": provider.get_asset_data("S&P500"),
-                    "GOLD": provider.get_asset_data("GOLD"),
-                    "DXY": provider.get_asset_data("DXY"),
-                    "BTC": provider.get_asset_data("BTC-USD")
-                }
+                macro_names = {"S&P500": "S&P500", "GOLD": "GOLD", "DXY": "DXY", "BTC": "BTC-USD"}
+                macro_frames = provider.fetch_many([{"kind": "asset", "ticker": tick} for tick in macro_names.values()])
+                macro_dfs = {name: df if df is not None else pd.DataFrame() for name, df in zip(macro_names, macro_frames)}
                 corr_df = analytics.calculate_correlations(data, macro_dfs)
                 if not corr_df.empty:
                     for _, row in corr_df.iterrows():
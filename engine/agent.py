@@ -5,14 +5,14 @@ from typing import List, Dict, Any
 from .tools import Tool, WebSearchTool, FileReadTool, FileWriteTool, NeuralPredictTool, GenerativeCanvasTool
 from .browser_tool import KitsuneBrowserTool
 from .kitsune import KitsuneAI
-from .analytics import AnalyticsEngine
+from .registry import get_analytics_engine
 
 class AgentEngine:
     def __init__(self, model_name: str = "llama3.1:latest"):
         self.kitsune = KitsuneAI() 
         self.ollama_chat_url = "http://localhost:11434/api/chat"
         self.model_name = model_name
-        self.analytics = AnalyticsEngine()
+        self.analytics = get_analytics_engine()
         self.tools: List[Tool] = [
             WebSearchTool(),
             FileReadTool(),
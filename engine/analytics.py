@@ -2,27 +2,28 @@ from sklearn.linear_model import LinearRegression
 import numpy as np
 import pandas as pd
 from scipy.stats import norm
+from typing import Optional
+from .monte_carlo import MonteCarloEngine
+from .portfolio_risk import PortfolioRiskEngine
+from .indicators import IndicatorSet
 
 class NeuralCore:
-    def __init__(self):
-        self.model = LinearRegression()
-
     def predict_price_trend(self, df: pd.DataFrame, days_ahead: int = 7) -> dict:
         """Use Linear Regression to predict technical price direction."""
-        col = 'close' if 'close' in df.columns else 'Close'
         if len(df) < 15:
             return {"status": "Error", "message": "Inadequate history for ML neural sync"}
         
-        y = df[col].values
+        y = df['close'].to_numpy(dtype=np.float64)
         X = np.arange(len(y)).reshape(-1, 1)
         
-        # Linear Regression for trend discovery
-        self.model.fit(X, y)
-        confidence = self.model.score(X, y)
+        # Linear Regression for trend discovery (a model per call: the engine is shared across threads)
+        model = LinearRegression()
+        model.fit(X, y)
+        confidence = model.score(X, y)
         
         # Future prediction
         future_X = np.arange(len(y), len(y) + days_ahead).reshape(-1, 1)
-        forecast = self.model.predict(future_X)
+        forecast = model.predict(future_X)
         
         current_price = y[-1]
         final_target = forecast[-1]
@@ -39,6 +40,13 @@ class NeuralCore:
 class AnalyticsEngine:
     def __init__(self):
         self.neural_core = NeuralCore()
+        self.portfolio_risk = PortfolioRiskEngine()
+
+    def portfolio_var(self, frames: dict, weights: Optional[dict] = None, simulations: int = 100_000,
+                      seed: Optional[int] = None) -> pd.DataFrame:
+        """Correlated Monte Carlo VaR/CVaR of a basket (ticker -> OHLCV frame) at 1/5/10/21-day horizons."""
+        return self.portfolio_risk.simulate(frames, weights, simulations=simulations, seed=seed)
+
     @staticmethod
     def calculate_sharpe_ratio(returns: pd.Series, risk_free_rate: float = 0.02) -> float:
         """Calculate the Sharpe Ratio for a given series of returns."""
@@ -49,45 +57,107 @@ class AnalyticsEngine:
         return (mean_return - risk_free_rate) / std_dev
 
     @staticmethod
-    def monte_carlo_simulation(initial_price: float, days: int, mu: float, sigma: float, simulations: int = 100) -> np.ndarray:
-        """Run a simple Monte Carlo simulation for price paths."""
-        results = np.zeros((simulations, days))
-        for i in range(simulations):
-            prices = [initial_price]
-            for _ in range(1, days):
-                # Geometric Brownian Motion
-                change = np.random.normal(mu/252, sigma/np.sqrt(252))
-                prices.append(prices[-1] * (1 + change))
-            results[i, :] = prices
-        return results
+    def monte_carlo_simulation(initial_price: float, days: int, mu: float, sigma: float, simulations: int = 100,
+                               seed: Optional[int] = None, antithetic: bool = False) -> np.ndarray:
+        """Run a Monte Carlo simulation (geometric Brownian motion) for price paths."""
+        return MonteCarloEngine(seed=seed).simulate_paths(initial_price, days, mu, sigma, simulations, antithetic=antithetic)
+
+    @staticmethod
+    def monte_carlo_bands(initial_price: float, days: int, mu: float, sigma: float, simulations: int = 100_000,
+                          seed: Optional[int] = None) -> dict:
+        """Per-day p5/p25/p50/p75/p95 price bands, mean path and terminal histogram, streamed without keeping paths."""
+        return MonteCarloEngine(seed=seed).percentile_bands(initial_price, days, mu, sigma, simulations)
+
+    @staticmethod
+    def calculate_metrics(df: pd.DataFrame, rsi_window: int = 14, vol_window: int = 21, whale_window: int = 20,
+                          whale_threshold: float = 2.0, risk_free_rate: float = 0.02) -> dict:
+        """Headline metrics of one asset in a single pass over shared arrays.
+
+        Returns are computed once from the close column and reused for RSI, rolling volatility
+        (annualized, last window), Sharpe, ATH distance and drawdown; whale flags reuse the volume
+        array. Definitions match calculate_rsi, calculate_volatility, calculate_sharpe_ratio,
+        get_ath_stats and detect_whale_activity.
+        """
+        close = df['close'].to_numpy(dtype=np.float64)
+        volume = df['volume'].to_numpy(dtype=np.float64)
+        if len(close) < 2:
+            price = float(close[-1]) if len(close) else 0.0
+            return {"price": price, "rsi": 50.0, "volatility": 0.0, "sharpe": 0.0, "ath": price, "ath_distance_pct": 0.0,
+                    "drawdown_pct": 0.0, "max_drawdown_pct": 0.0, "whale_count": 0, "whale_last": False, "volume_z": 0.0}
+
+        delta = np.diff(close)
+        returns = delta / close[:-1]
+        price = close[-1]
+
+        # RSI: simple averages of gains and losses over the last window
+        last = delta[-rsi_window:]
+        gain = np.clip(last, 0, None).mean()
+        loss = -np.clip(last, None, 0).mean()
+        rsi = 100.0 - 100.0 / (1.0 + gain / loss) if loss > 0 else (100.0 if gain > 0 else 50.0)
+
+        window = returns[-vol_window:]
+        volatility = window.std(ddof=1) * np.sqrt(252) if len(window) >= vol_window else 0.0
+        std = returns.std(ddof=1) * np.sqrt(252)
+        sharpe = (returns.mean() * 252 - risk_free_rate) / std if std > 0 else 0.0
+
+        peaks = np.maximum.accumulate(close)
+        drawdown = (close - peaks) / peaks * 100
+        ath = peaks[-1]
+
+        # Whale bars: volume above the rolling mean + threshold * rolling std (both including the bar)
+        whale_count, whale_last, volume_z = 0, False, 0.0
+        if len(volume) >= whale_window:
+            windows = np.lib.stride_tricks.sliding_window_view(volume, whale_window)
+            mean = windows.mean(axis=1)
+            spread = windows.std(axis=1, ddof=1)
+            flags = volume[whale_window - 1:] > mean + whale_threshold * spread
+            whale_count, whale_last = int(flags.sum()), bool(flags[-1])
+            volume_z = float((volume[-1] - mean[-1]) / spread[-1]) if spread[-1] > 0 else 0.0
+
+        return {
+            "price": float(price),
+            "rsi": float(rsi),
+            "volatility": float(volatility),
+            "sharpe": float(sharpe),
+            "ath": float(ath),
+            "ath_distance_pct": float((price - ath) / ath * 100),
+            "drawdown_pct": float(drawdown[-1]),
+            "max_drawdown_pct": float(drawdown.min()),
+            "whale_count": whale_count,
+            "whale_last": whale_last,
+            "volume_z": volume_z,
+        }
+
+    @staticmethod
+    def update_indicators(df: pd.DataFrame, state: Optional[dict] = None) -> IndicatorSet:
+        """Incremental RSI / volatility / volume z-score: resume from a saved state and apply only the new bars."""
+        indicators = IndicatorSet.from_state(state) if state else IndicatorSet()
+        return indicators.catch_up(df)
 
     @staticmethod
     def calculate_volatility(df: pd.DataFrame, window: int = 21) -> pd.Series:
         """Calculate rolling annualized volatility."""
-        col = 'close' if 'close' in df.columns else 'Close'
-        returns = df[col].pct_change()
+        returns = df['close'].pct_change()
         return returns.rolling(window=window).std() * np.sqrt(252)
 
     @staticmethod
     def get_ath_stats(df: pd.DataFrame) -> dict:
         """Calculate ATH and distance from ATH."""
-        col = 'close' if 'close' in df.columns else 'Close'
-        current_price = df[col].iloc[-1]
-        ath = df[col].max()
+        close = df['close'].to_numpy()
+        current_price = close[-1]
+        ath = close.max()
         distance = (current_price - ath) / ath * 100
         return {"ath": ath, "distance_pct": distance}
 
     @staticmethod
     def calculate_correlations(target_df: pd.DataFrame, comparison_dfs: dict) -> pd.DataFrame:
         """Calculate correlations between target asset and a set of macro assets."""
-        target_col = 'close' if 'close' in target_df.columns else 'Close'
-        target_returns = target_df[target_col].pct_change().dropna()
+        target_returns = target_df['close'].pct_change().dropna()
         
         correlations = []
         for name, df in comparison_dfs.items():
             if df.empty: continue
-            comp_col = 'close' if 'close' in df.columns else 'Close'
-            comp_returns = df[comp_col].pct_change().dropna()
+            comp_returns = df['close'].pct_change().dropna()
             
             # Align dates
             combined = pd.concat([target_returns, comp_returns], axis=1).dropna()
@@ -100,8 +170,7 @@ class AnalyticsEngine:
     @staticmethod
     def calculate_dca(df: pd.DataFrame, amount: float, frequency_days: int) -> dict:
         """Simulate a DCA strategy performance."""
-        col = 'close' if 'close' in df.columns else 'Close'
-        prices = df[col]
+        prices = df['close']
         
         # Select prices at the given frequency
         dca_prices = prices.iloc[::frequency_days]
@@ -121,8 +190,7 @@ class AnalyticsEngine:
     @staticmethod
     def calculate_rsi(df: pd.DataFrame, window: int = 14) -> float:
         """Calculate relative strength index (RSI)."""
-        col = 'close' if 'close' in df.columns else 'Close'
-        delta = df[col].diff()
+        delta = df['close'].diff()
         gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
         loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
         
@@ -133,14 +201,13 @@ class AnalyticsEngine:
     @staticmethod
     def detect_whale_activity(df: pd.DataFrame, threshold: float = 2.0) -> pd.DataFrame:
         """Detect volume outliers suggestive of 'Whale' activity."""
-        vol_col = 'volume' if 'volume' in df.columns else 'Volume'
-        if vol_col not in df.columns or df.empty: return pd.DataFrame()
+        if df.empty: return pd.DataFrame()
         
-        avg_vol = df[vol_col].rolling(window=20).mean()
-        std_vol = df[vol_col].rolling(window=20).std()
+        avg_vol = df['volume'].rolling(window=20).mean()
+        std_vol = df['volume'].rolling(window=20).std()
         
         # Detect volume > Mean + 2*StdDev
-        whales = df[df[vol_col] > (avg_vol + threshold * std_vol)]
+        whales = df[df['volume'] > (avg_vol + threshold * std_vol)]
         return whales
 
     @staticmethod
@@ -0,0 +1,562 @@
+import time
+import asyncio
+import functools
+import threading
+import aiohttp
+import ccxt
+import ccxt.async_support as ccxt_async
+import pandas as pd
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+from .data_provider import (DataProvider, FALLBACK_CRYPTO_TICKERS, GECKOTERMINAL_MULTI_LIMIT, GECKOTERMINAL_OHLCV_LIMIT,
+                            GECKOTERMINAL_POOLS_URL, ATHENE_RPC_URL, LIVE_BOOK_MAX_AGE)
+from .ohlcv_store import OHLCVStore
+from .schema import empty_ohlcv
+from .resampler import resample_ohlcv, timeframe_seconds
+from .rate_limiter import RateScheduler, _priority
+from .ticker_snapshots import TickerSnapshotService
+from .block_index import BlockPoller
+
+class AsyncDataProvider:
+    """Non-blocking DataProvider: the same public methods as coroutines, on ccxt.async_support clients
+    and one pooled aiohttp session (GeckoTerminal and the Athene JSON-RPC endpoint).
+
+    It works on the state of a synchronous DataProvider (by default the process-wide one): routing,
+    the OHLCV store, the SWR cache, the rate scheduler and the cassette are the same objects, so both
+    see each other's data and draw from one set of rate limits, and recordings are interchangeable.
+    Requests are awaited on the event loop, so hundreds of concurrent fetches need no thread each.
+    Off the loop run only yfinance (no async client: macro and news), parquet reads/writes of the
+    OHLCV store and the first load of an exchange's markets. Stale cache entries are refreshed by the
+    cache's background workers through the synchronous provider.
+
+    The session and clients belong to the event loop that first used them; call close() when done.
+    """
+
+    def __init__(self, provider: Optional[DataProvider] = None, max_connections: int = 100):
+        if provider is None:
+            from .registry import get_data_provider
+            provider = get_data_provider()
+        self.provider = provider
+        self.max_connections = max_connections
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._clients: Dict[str, Any] = {}
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        # Shared state (macro_tickers, ohlcv_store, cache, router, ...) and pure helpers of the provider
+        if name == "provider":
+            raise AttributeError(name)
+        return getattr(self.provider, name)
+
+    # Transport
+
+    def _bind_loop(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Sessions, clients, semaphores and futures cannot cross event loops
+            self._loop = loop
+            self._session = None
+            self._clients = {}
+            self._slots = {}
+            self._inflight = {}
+
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        self._bind_loop()
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._clients = {}
+        return self._session
+
+    async def close(self):
+        """Close the exchange clients and the shared session."""
+        for client in self._clients.values():
+            await client.close()
+        self._clients = {}
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _client(self, ex):
+        """ccxt.async_support twin of one of the provider's clients, on the shared session and with its markets."""
+        session = await self._ensure_session()
+        client = self._clients.get(ex.id)
+        if client is None:
+            # Pacing is done by the shared RateScheduler, as for the sync clients
+            client = self._clients[ex.id] = getattr(ccxt_async, ex.id)({'enableRateLimit': False, 'session': session})
+        if not client.markets:
+            if not ex.markets:
+                # Once per exchange: from the disk cache, else one rate-limited load_markets
+                await asyncio.to_thread(self.provider.markets_cache.ensure, ex)
+            client.set_markets(ex.markets, ex.currencies)
+        return client
+
+    def _slot(self, upstream: str) -> asyncio.Semaphore:
+        if upstream not in self._slots:
+            self._slots[upstream] = asyncio.Semaphore(self.provider.max_concurrency.get(upstream, 2))
+        return self._slots[upstream]
+
+    async def _coalesce(self, key: Hashable, factory: Callable[[], Awaitable]) -> Any:
+        """Single-flight for coroutines: concurrent awaits of one key share one task."""
+        self._bind_loop()
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._inflight[key] = asyncio.ensure_future(factory())
+            task.add_done_callback(lambda done: self._inflight.pop(key, None) if self._inflight.get(key) is done else None)
+        # A cancelled waiter must not cancel the request the others are waiting on
+        return await asyncio.shield(task)
+
+    async def _upstream_call(self, upstream: str, method: str, fn, *args, **kwargs):
+        """Async twin of DataProvider._upstream_call: coalesce identical calls, wait for a rate-limit
+        token, bound concurrency, then call through the cassette if one is set."""
+        key = (upstream, method, repr(args), repr(sorted(kwargs.items())))
+        cost = self.provider._request_cost(method, kwargs)
+
+        async def call():
+            await self.provider.rate_scheduler.acquire_async(upstream, cost)
+            async with self._slot(upstream):
+                if self.provider.cassette is not None:
+                    return await self.provider.cassette.play_async(upstream, method, fn, *args, **kwargs)
+                return await fn(*args, **kwargs)
+
+        return await self._coalesce(key, call)
+
+    async def _exchange_call(self, ex, method: str, *args, **kwargs):
+        client = await self._client(ex)
+        return await self._upstream_call(ex.id, method, getattr(client, method), *args, **kwargs)
+
+    async def _http_json(self, method: str, url: str, timeout: Optional[float] = None, **kwargs) -> Any:
+        """DataProvider._http_json on the pooled aiohttp session."""
+        session = await self._ensure_session()
+        async with session.request(method, url, timeout=aiohttp.ClientTimeout(total=timeout), **kwargs) as resp:
+            resp.raise_for_status()
+            return await resp.json(content_type=None)
+
+    async def _cached(self, kind: str, key: Hashable, load: Callable[[], Awaitable], sync_load: Callable[[], Any]) -> Any:
+        """SWRCache.get with a coroutine loader: warm keys answer at once, stale ones are refreshed in the
+        background by `sync_load`, cold keys are loaded once however many coroutines ask."""
+        value, state = self.provider.cache.peek(kind, key)
+        if state == "stale":
+            self.provider.cache.refresh_many(kind, [key], lambda keys: {keys[0]: sync_load()})
+        if state != "miss":
+            return value
+
+        async def load_and_store():
+            loaded = await load()
+            self.provider.cache.put(kind, key, loaded)
+            return loaded
+
+        return await self._coalesce(("cache", kind, key), load_and_store)
+
+    # Tickers
+
+    async def get_all_crypto_tickers(self) -> List[str]:
+        """Fetch and cache all available trading pairs from the exchange."""
+        markets = await self._cached("tickers", "all", self._load_crypto_tickers, self.provider._load_crypto_tickers)
+        if not markets:
+            markets = list(FALLBACK_CRYPTO_TICKERS)
+            self.provider.ticker_index.add(markets)
+        return markets
+
+    async def _load_crypto_tickers(self) -> List[str]:
+        try:
+            await asyncio.gather(self._client(self.provider.binance), self._client(self.provider.mexc))
+        except Exception as e:
+            print(f"Error fetching symbols: {e}")
+            return []
+        # Markets are loaded now: indexing them is local work
+        return self.provider._load_crypto_tickers()
+
+    async def search_tickers(self, query: str, limit: int = 20) -> List[str]:
+        """Top matches for a type-ahead query across crypto pairs, macro names and DEX pools."""
+        if len(self.provider.ticker_index) <= len(self.provider.macro_tickers) + len(self.provider.get_world_chain_assets()):
+            await self.get_all_crypto_tickers()
+        return self.provider.search_tickers(query, limit=limit)
+
+    # Exchange OHLCV
+
+    async def fetch_crypto_data(self, symbol: str, timeframe: str = '1d', limit: int = 100) -> pd.DataFrame:
+        """Fetch historical data from CCXT (Binance/MEXC), topping up the local OHLCV store. Served from the cache."""
+        return await self._cached("ohlcv", (symbol, timeframe, limit), lambda: self._load_crypto_data(symbol, timeframe, limit),
+                                  lambda: self.provider._load_crypto_data(symbol, timeframe, limit))
+
+    async def _load_crypto_data(self, symbol: str, timeframe: str, limit: int) -> pd.DataFrame:
+        store, router = self.provider.ohlcv_store, self.provider.router
+        exchanges = self.provider._route(symbol)
+        exchanges.sort(key=lambda ex: not store.has(ex.id, symbol, timeframe))
+        unlisted = 0
+        for ex in exchanges:
+            try:
+                df = await self._sync_ohlcv(ex, symbol, timeframe, limit)
+                if df.empty:
+                    continue
+                router.record_success(symbol, ex.id)
+                return df.tail(limit)
+            except ccxt.BadSymbol:
+                unlisted += 1
+                router.record_unlisted(symbol, ex.id)
+            except Exception:
+                continue
+
+        if exchanges and unlisted == len(exchanges):
+            router.mark_missing(symbol)
+        print(f"Error: Symbol {symbol} not found on any supported exchanges.")
+        return empty_ohlcv(self.provider.ohlcv_dtype)
+
+    async def _sync_ohlcv(self, ex, symbol: str, timeframe: str, limit: int) -> pd.DataFrame:
+        """DataProvider._sync_ohlcv with awaited requests; parquet I/O runs off the loop."""
+        store = self.provider.ohlcv_store
+        stored = await asyncio.to_thread(store.load, ex.id, symbol, timeframe)
+        if len(stored) >= limit:
+            since = int(stored.index[-1].timestamp() * 1000)
+            ohlcv = await self._exchange_call(ex, "fetch_ohlcv", symbol, timeframe, since=since, limit=limit)
+            if len(ohlcv) < limit:
+                return await asyncio.to_thread(store.append, ex.id, symbol, timeframe, OHLCVStore.ohlcv_to_frame(ohlcv))
+
+        ohlcv = await self._exchange_call(ex, "fetch_ohlcv", symbol, timeframe, limit=limit)
+        return await asyncio.to_thread(store.append, ex.id, symbol, timeframe, OHLCVStore.ohlcv_to_frame(ohlcv))
+
+    async def fetch_crypto_history(self, symbol: str, timeframe: str = '1d', days: int = 3 * 365, since_ms: Optional[int] = None,
+                                   until_ms: Optional[int] = None, page_limit: int = 1000) -> pd.DataFrame:
+        """Fetch history beyond a single exchange page (default: 3 years); pages are awaited concurrently. Served from the cache."""
+        key = (symbol, timeframe, days, since_ms, until_ms, page_limit)
+        return await self._cached("history", key, lambda: self._load_crypto_history(symbol, timeframe, days, since_ms, until_ms, page_limit),
+                                  lambda: self.provider._load_crypto_history(symbol, timeframe, days, since_ms, until_ms, page_limit))
+
+    async def _load_crypto_history(self, symbol: str, timeframe: str, days: int, since_ms: Optional[int],
+                                   until_ms: Optional[int], page_limit: int) -> pd.DataFrame:
+        until_ms = until_ms or int(self.provider._now() * 1000)
+        since_ms = since_ms if since_ms is not None else until_ms - days * 86400 * 1000
+        exchanges = self.provider._route(symbol)
+        exchanges.sort(key=lambda ex: not self.provider.ohlcv_store.has(ex.id, symbol, timeframe))
+        for ex in exchanges:
+            try:
+                df = await self._backfill_ohlcv(ex, symbol, timeframe, since_ms, until_ms, page_limit)
+                if df.empty:
+                    continue
+                self.provider.router.record_success(symbol, ex.id)
+                return df
+            except ccxt.BadSymbol:
+                self.provider.router.record_unlisted(symbol, ex.id)
+            except Exception as e:
+                print(f"History fetch error for {symbol} on {ex.id}: {e}")
+        return empty_ohlcv(self.provider.ohlcv_dtype)
+
+    async def _backfill_ohlcv(self, ex, symbol: str, timeframe: str, since_ms: int, until_ms: int, page_limit: int) -> pd.DataFrame:
+        store = self.provider.ohlcv_store
+        stored = await asyncio.to_thread(store.load, ex.id, symbol, timeframe)
+        starts, holes, head = self.provider._backfill_plan(ex.id, symbol, timeframe, stored, since_ms, until_ms, page_limit)
+        pages = await asyncio.gather(*(self._exchange_call(ex, "fetch_ohlcv", symbol, timeframe, since=start, limit=page_limit)
+                                       for start in starts))
+        bars = [bar for page in pages for bar in page]
+        merged = await asyncio.to_thread(store.append, ex.id, symbol, timeframe, OHLCVStore.ohlcv_to_frame(bars))
+        return self.provider._backfill_window(ex.id, symbol, timeframe, merged, holes, head, since_ms, until_ms)
+
+    async def fetch_multi_timeframe(self, symbol: str, timeframes: tuple, limit: int = 100, include_partial: bool = True) -> Dict[str, pd.DataFrame]:
+        """Fetch the finest of `timeframes` once and derive the coarser ones locally from the cached base series."""
+        ordered = sorted(timeframes, key=timeframe_seconds)
+        base = ordered[0]
+        ratio = timeframe_seconds(ordered[-1]) // timeframe_seconds(base)
+        base_df = await self.fetch_crypto_data(symbol, timeframe=base, limit=min(limit * ratio, 1000))
+        frames = {}
+        for tf in ordered:
+            if tf == base:
+                frames[tf] = base_df.tail(limit)
+            else:
+                frames[tf] = resample_ohlcv(base_df, tf, base, include_partial=include_partial).tail(limit)
+        return frames
+
+    async def fetch_resampled(self, symbol: str, timeframe: str, base_timeframe: str = '1h', limit: int = 100) -> pd.DataFrame:
+        """Bars for `timeframe` aggregated from `base_timeframe` data instead of a separate exchange request."""
+        return (await self.fetch_multi_timeframe(symbol, (base_timeframe, timeframe), limit=limit))[timeframe]
+
+    # Yahoo (yfinance has no async client: loads run in worker threads)
+
+    async def fetch_macro_data(self, ticker: str, period: str = "1y") -> pd.DataFrame:
+        """Fetch historical data from YFinance. Known macro names are served from the shared batch download."""
+        if ticker in self.provider.macro_tickers:
+            return (await self.fetch_macro_batch(period=period)).get(ticker, empty_ohlcv(self.provider.ohlcv_dtype))
+        load = functools.partial(self.provider._load_macro_data, ticker, period)
+        return await self._cached("macro", (ticker, period), lambda: asyncio.to_thread(load), load)
+
+    async def fetch_macro_batch(self, extras: tuple = (), period: str = "1y") -> Dict[str, pd.DataFrame]:
+        """Download every macro ticker (plus any extras) in a single yf.download call. Served from the cache."""
+        names = list(self.provider.macro_tickers) + [t for t in extras if t not in self.provider.macro_tickers]
+        load = functools.partial(self.provider._load_macro_batch, names, period)
+        frames = await self._cached("macro", (tuple(names), period), lambda: asyncio.to_thread(load), load)
+        return frames or {name: empty_ohlcv(self.provider.ohlcv_dtype) for name in names}
+
+    async def fetch_news(self, ticker: str) -> List[dict]:
+        """Fetch news for a given ticker via Yahoo Finance."""
+        load = functools.partial(self.provider._load_news, ticker)
+        return await self._cached("news", ticker, lambda: asyncio.to_thread(load), load)
+
+    # Quotes
+
+    async def get_asset_data(self, ticker: str) -> pd.DataFrame:
+        """Smart asset selection logic."""
+        pool = self.provider.dex_pool_address(ticker)
+        if pool:
+            return await self.fetch_dex_ohlcv(pool)
+        if "/" in ticker:
+            return await self.fetch_crypto_data(ticker)
+        return await self.fetch_macro_data(ticker)
+
+    async def _snapshot(self, ex) -> Dict[str, Dict[str, Any]]:
+        return await self._cached(TickerSnapshotService.KIND, ex.id, lambda: self._load_snapshot(ex),
+                                  lambda: self.provider.snapshots._load(ex))
+
+    async def _load_snapshot(self, ex) -> Dict[str, Dict[str, Any]]:
+        try:
+            tickers = await self._exchange_call(ex, "fetch_tickers")
+        except Exception as e:
+            print(f"Ticker snapshot error ({ex.id}): {e}")
+            return {}
+        return TickerSnapshotService.compact_all(tickers)
+
+    async def get_quote(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """Last price and 24h change ({'last', 'change_pct', ...}) for any asset, or None."""
+        pool = self.provider.dex_pool_address(ticker)
+        if pool:
+            quote = await self.fetch_dex_price(pool)
+            return {"last": quote["price"], "change_pct": quote["change_24h"]} if quote["price"] else None
+        if "/" in ticker:
+            for ex in self.provider._route(ticker):
+                quote = (await self._snapshot(ex)).get(ticker)
+                if quote:
+                    return quote
+            return None
+        df = await self.get_asset_data(ticker)
+        if df.empty:
+            return None
+        last = float(df['close'].iloc[-1])
+        prev = float(df['close'].iloc[-2]) if len(df) > 1 else last
+        return {"last": last, "change_pct": (last - prev) / prev * 100 if prev else 0.0}
+
+    async def get_quotes(self, tickers: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """get_quote for several assets, concurrently; crypto pairs share their exchange's snapshot."""
+        pools = [pool for pool in map(self.provider.dex_pool_address, tickers) if pool]
+        if pools:
+            await self.fetch_dex_prices(pools)
+        quotes = await asyncio.gather(*(self.get_quote(ticker) for ticker in tickers))
+        return dict(zip(tickers, quotes))
+
+    async def get_quote_board(self, exchange_id: str = "binance", quote_currency: str = "USDT") -> pd.DataFrame:
+        """Every `quote_currency` pair on an exchange with last price and 24h change, by quote volume."""
+        ex = {ex.id: ex for ex in self.provider._exchanges()}[exchange_id]
+        rows = {symbol: quote for symbol, quote in (await self._snapshot(ex)).items() if symbol.endswith(f"/{quote_currency}")}
+        if not rows:
+            return pd.DataFrame()
+        return pd.DataFrame.from_dict(rows, orient='index').sort_values('quote_volume', ascending=False)
+
+    async def get_latest_price(self, ticker: str) -> Optional[float]:
+        """Fetch the most recent price for an asset."""
+        quote = await self.get_quote(ticker)
+        return quote["last"] if quote else None
+
+    async def fetch_many(self, batch: List[Dict[str, Any]]) -> List[Any]:
+        """Run several fetches concurrently on the event loop and return their results in input order.
+
+        Same entries as DataProvider.fetch_many; failed entries yield None.
+        """
+        handlers = {
+            "ohlcv": self.fetch_crypto_data,
+            "macro": self.fetch_macro_data,
+            "asset": self.get_asset_data,
+            "price": self.get_latest_price,
+            "quote": self.get_quote,
+            "news": self.fetch_news,
+            "order_book": self.fetch_order_book,
+            "dex": self.fetch_dex_price,
+        }
+
+        async def run(entry: Dict[str, Any]):
+            params = dict(entry)
+            handler = handlers[params.pop("kind")]
+            return await handler(**params)
+
+        results = await asyncio.gather(*(run(entry) for entry in batch), return_exceptions=True)
+        for i, (entry, result) in enumerate(zip(batch, results)):
+            if isinstance(result, Exception):
+                print(f"Batch fetch error for {entry}: {result}")
+                results[i] = None
+        return results
+
+    # Order books
+
+    async def subscribe_order_book(self, symbol: str) -> bool:
+        """Start (or renew) streaming a live local book; the stream runs on the provider's order-book engine."""
+        return self.provider.subscribe_order_book(symbol)
+
+    async def fetch_order_book(self, symbol: str, limit: int = 50) -> dict:
+        """Fetch the order book for a given symbol: from the live local book if subscribed, else via REST."""
+        if self.provider.order_books.is_ready(symbol, max_age=LIVE_BOOK_MAX_AGE):
+            return self.provider.order_books.top(symbol, limit)
+        return await self._cached("order_book", (symbol, limit), lambda: self._load_order_book(symbol, limit),
+                                  lambda: self.provider._load_order_book(symbol, limit))
+
+    async def _load_order_book(self, symbol: str, limit: int) -> dict:
+        for ex in self.provider._route(symbol):
+            try:
+                book = await self._exchange_call(ex, "fetch_order_book", symbol, limit=limit)
+                self.provider.router.record_success(symbol, ex.id)
+                return book
+            except ccxt.BadSymbol:
+                self.provider.router.record_unlisted(symbol, ex.id)
+            except Exception as e:
+                print(f"Error fetching order book for {symbol} on {ex.id}: {e}")
+        return {}
+
+    # World Chain DEX (GeckoTerminal)
+
+    async def get_world_chain_assets(self):
+        """Pre-defined alpha assets for World Chain monitoring."""
+        return self.provider.get_world_chain_assets()
+
+    async def dex_pool_address(self, ticker: str) -> Optional[str]:
+        """Pool address for a DEX ticker (a World Chain watchlist name or "DEX:<address>"), else None."""
+        return self.provider.dex_pool_address(ticker)
+
+    async def fetch_dex_price(self, pool_address: str) -> Dict[str, Any]:
+        """Fetch real-time price from GeckoTerminal for a specific pool on World Chain."""
+        return (await self.fetch_dex_prices([pool_address]))[pool_address]
+
+    async def fetch_dex_prices(self, pools: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Quotes for several World Chain pools, keyed by address (see DataProvider.fetch_dex_prices)."""
+        cache = self.provider.cache
+        quotes, stale, missing = {}, [], []
+        for pool in dict.fromkeys(pools):
+            quote, state = cache.peek("dex", pool)
+            if state == "miss":
+                missing.append(pool)
+                continue
+            quotes[pool] = quote
+            if state == "stale":
+                stale.append(pool)
+        if stale:
+            cache.refresh_many("dex", stale, self.provider._load_dex_prices)
+        if missing:
+            loaded = await self._load_dex_prices(missing)
+            for pool in missing:
+                quote = loaded.get(pool) or {"price": 0.0, "change_24h": 0.0, "volume": 0.0, "name": "N/A"}
+                quotes[pool] = quote
+                if pool in loaded:
+                    cache.put("dex", pool, quote)
+        return {pool: quotes[pool] for pool in pools}
+
+    async def _load_dex_prices(self, pools: List[str]) -> Dict[str, Dict[str, Any]]:
+        async def load_chunk(chunk):
+            url = f"{GECKOTERMINAL_POOLS_URL}/multi/{','.join(chunk)}"
+            try:
+                data = await self._upstream_call("geckoterminal", "get", self._http_json, "GET", url, timeout=10)
+            except Exception as e:
+                print(f"DEX multi-pool error: {e}")
+                return {}
+            return self.provider._parse_dex_multi(data, chunk)
+
+        chunks = [pools[i:i + GECKOTERMINAL_MULTI_LIMIT] for i in range(0, len(pools), GECKOTERMINAL_MULTI_LIMIT)]
+        quotes = {}
+        for loaded in await asyncio.gather(*(load_chunk(chunk) for chunk in chunks)):
+            quotes.update(loaded)
+        return quotes
+
+    async def fetch_dex_ohlcv(self, pool_address: str, timeframe: str = '1d', limit: int = 100) -> pd.DataFrame:
+        """Pool OHLCV (USD) from GeckoTerminal, kept in the local OHLCV store under 'geckoterminal'. Served from the cache."""
+        return await self._cached("ohlcv", ("dex", pool_address, timeframe, limit), lambda: self._load_dex_ohlcv(pool_address, timeframe, limit),
+                                  lambda: self.provider._load_dex_ohlcv(pool_address, timeframe, limit))
+
+    async def _load_dex_ohlcv(self, pool_address: str, timeframe: str, limit: int) -> pd.DataFrame:
+        try:
+            return (await self._sync_dex_ohlcv(pool_address, timeframe, limit)).tail(limit)
+        except Exception as e:
+            print(f"DEX OHLCV error for {pool_address}: {e}")
+            return empty_ohlcv(self.provider.ohlcv_dtype)
+
+    async def _sync_dex_ohlcv(self, pool_address: str, timeframe: str, limit: int) -> pd.DataFrame:
+        store = self.provider.ohlcv_store
+        stored = await asyncio.to_thread(store.load, "geckoterminal", pool_address, timeframe)
+        wanted = self.provider._dex_bars_wanted(stored, timeframe, limit, self.provider._now())
+        # Pages chain backwards (each ends before the previous one's first bar), so they are sequential
+        bars, before = [], None
+        while wanted > 0:
+            page_limit = min(wanted, GECKOTERMINAL_OHLCV_LIMIT)
+            url, params = self.provider._dex_ohlcv_request(pool_address, timeframe, page_limit, before)
+            page = self.provider._parse_dex_ohlcv(
+                await self._upstream_call("geckoterminal", "get", self._http_json, "GET", url, params=params, timeout=10))
+            bars.extend(page)
+            wanted -= len(page)
+            if len(page) < page_limit:
+                break
+            before = min(bar[0] for bar in page) // 1000
+        return await asyncio.to_thread(store.append, "geckoterminal", pool_address, timeframe, OHLCVStore.ohlcv_to_frame(bars))
+
+    # Athene chain
+
+    async def _rpc_batch(self, calls: List[dict]) -> List[dict]:
+        """POST a JSON-RPC batch to the Athene endpoint and return its responses."""
+        return self.provider._check_rpc_batch(
+            await self._upstream_call("rpc", "post", self._http_json, "POST", ATHENE_RPC_URL, json=calls, timeout=5))
+
+    async def _background_rpc_batch(self, calls: List[dict]) -> List[dict]:
+        with RateScheduler.background():
+            return await self._rpc_batch(calls)
+
+    async def start_block_poller(self, wait: float = 0.0) -> BlockPoller:
+        """Follow the Athene chain as a task on this event loop, unless the provider's poller already runs; optionally wait for the first block."""
+        poller = self.provider._block_poller()
+        if poller.start_async(self._background_rpc_batch) and wait:
+            deadline = time.monotonic() + wait
+            while not poller.wait_ready(0) and time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+        return poller
+
+    async def get_athene_chain_status(self):
+        """Technical status of the Athene Parthenon chain, read from the local block index (no network call)."""
+        return self.provider._chain_status(await self.start_block_poller(wait=3.0))
+
+    async def use_cassette(self, cassette):
+        """Record or replay upstream responses (DataProvider.use_cassette); shared with the provider."""
+        self.provider.use_cassette(cassette)
+
+
+class SyncDataProvider:
+    """Blocking façade over AsyncDataProvider, for synchronous code that wants the async transport
+    (e.g. fetch_many over hundreds of symbols on one connection pool instead of worker threads).
+
+    The async provider runs on a private event-loop thread; every public method has the DataProvider
+    signature and blocks for its result, at the caller's request priority. Call close() when done.
+    """
+
+    def __init__(self, provider: Optional[DataProvider] = None, max_connections: int = 100):
+        self.async_provider = AsyncDataProvider(provider, max_connections)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="kitsune-async-provider", daemon=True)
+        self._thread.start()
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "async_provider":
+            raise AttributeError(name)
+        attr = getattr(self.async_provider, name)
+        if name.startswith("_") or not asyncio.iscoroutinefunction(attr):
+            return attr
+
+        @functools.wraps(attr)
+        def call(*args, **kwargs):
+            return self._run(attr(*args, **kwargs))
+        return call
+
+    def _run(self, coro):
+        priority = _priority.get()
+
+        async def at_priority():
+            # The task runs in its own context copy; give it the caller's priority
+            _priority.set(priority)
+            return await coro
+
+        return asyncio.run_coroutine_threadsafe(at_priority(), self._loop).result()
+
+    def close(self):
+        self._run(self.async_provider.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(5)
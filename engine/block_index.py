@@ -0,0 +1,259 @@
+import os
+import time
+import asyncio
+import sqlite3
+import threading
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+class BlockIndex:
+    """SQLite index of block headers with rolling throughput/gas statistics kept in memory.
+
+    Statistics cover the last `window` blocks and are updated incrementally as headers are added,
+    so reads never touch the database. The table keeps the newest `retention` blocks (about 2.5 days
+    at 2-second blocks by default); older rows are pruned as new ones arrive.
+    """
+
+    def __init__(self, path: str = os.path.join("data_cache", "blocks", "athene.sqlite"), window: int = 100, retention: int = 100_000):
+        self.path = path
+        self.window = window
+        self.retention = max(retention, window)
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS blocks ("
+            "number INTEGER PRIMARY KEY, hash TEXT, timestamp INTEGER, tx_count INTEGER, "
+            "gas_used INTEGER, gas_limit INTEGER, base_fee INTEGER)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._recent = deque()  # (number, timestamp, tx_count, gas_used, gas_limit, base_fee), ascending
+        self._tx_sum = 0
+        self._gas_sum = 0
+        self._gas_limit_sum = 0
+        rows = self._conn.execute(
+            "SELECT number, timestamp, tx_count, gas_used, gas_limit, base_fee FROM blocks ORDER BY number DESC LIMIT ?",
+            (window,),
+        ).fetchall()
+        for row in reversed(rows):
+            if self._recent and row[0] != self._recent[-1][0] + 1:
+                self._recent.clear()
+                self._tx_sum = self._gas_sum = self._gas_limit_sum = 0
+            self._push(row)
+
+    @staticmethod
+    def parse_header(block: Dict[str, Any]) -> tuple:
+        """eth_getBlockByNumber result (hex quantities) -> index row."""
+        txs = block.get('transactions') or []
+        return (
+            int(block['number'], 16),
+            block.get('hash'),
+            int(block['timestamp'], 16),
+            len(txs),
+            int(block.get('gasUsed', '0x0'), 16),
+            int(block.get('gasLimit', '0x0'), 16),
+            int(block['baseFeePerGas'], 16) if block.get('baseFeePerGas') else None,
+        )
+
+    def _push(self, row: tuple):
+        # Caller holds self._lock (or is __init__)
+        self._recent.append(row)
+        self._tx_sum += row[2]
+        self._gas_sum += row[3]
+        self._gas_limit_sum += row[4]
+        while len(self._recent) > self.window:
+            old = self._recent.popleft()
+            self._tx_sum -= old[2]
+            self._gas_sum -= old[3]
+            self._gas_limit_sum -= old[4]
+
+    def add(self, headers: List[Dict[str, Any]]) -> int:
+        """Store raw block headers; returns how many extended the index."""
+        rows = sorted((self.parse_header(h) for h in headers if h), key=lambda r: r[0])
+        if not rows:
+            return 0
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO blocks VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            # Range delete on the primary key: cheap enough to run on every add
+            self._conn.execute("DELETE FROM blocks WHERE number <= ?", (rows[-1][0] - self.retention,))
+            self._conn.commit()
+            added = 0
+            for row in rows:
+                if self._recent and row[0] <= self._recent[-1][0]:
+                    continue
+                if self._recent and row[0] != self._recent[-1][0] + 1:
+                    # A gap (e.g. poller downtime) would distort the rates: restart the window
+                    self._recent.clear()
+                    self._tx_sum = self._gas_sum = self._gas_limit_sum = 0
+                self._push((row[0],) + row[2:])
+                added += 1
+            return added
+
+    def latest_number(self) -> Optional[int]:
+        with self._lock:
+            return self._recent[-1][0] if self._recent else None
+
+    def stats(self) -> Dict[str, Any]:
+        """Throughput and gas figures over the indexed window (empty until a block is indexed)."""
+        with self._lock:
+            if not self._recent:
+                return {}
+            first, last = self._recent[0], self._recent[-1]
+            n = len(self._recent)
+            span = last[1] - first[1]
+            # The first block's transactions were produced before the measured span began
+            txs_in_span = self._tx_sum - first[2]
+            return {
+                "block": last[0],
+                "block_timestamp": last[1],
+                "blocks": n,
+                "tps": txs_in_span / span if span > 0 else 0.0,
+                "block_time": span / (last[0] - first[0]) if last[0] > first[0] else None,
+                "gas_used_avg": self._gas_sum / n,
+                "gas_utilization": self._gas_sum / self._gas_limit_sum if self._gas_limit_sum else 0.0,
+                "base_fee_gwei": last[5] / 1e9 if last[5] is not None else None,
+            }
+
+    def count(self) -> int:
+        """Number of stored headers."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM blocks").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class BlockPoller:
+    """Follows a chain head on a daemon thread and feeds new headers into a BlockIndex.
+
+    Each poll is a single JSON-RPC batch: eth_blockNumber plus eth_getBlockByNumber for the next
+    blocks after the index (the first poll only learns the head). `rpc_batch` takes a list of JSON-RPC
+    request objects and returns the list of responses. start_async() runs the same loop as a task on
+    an event loop with a coroutine batch function instead.
+    """
+
+    def __init__(self, rpc_batch: Callable[[List[dict]], List[dict]], index: BlockIndex,
+                 interval: float = 2.0, max_batch: int = 20, backfill: int = 100):
+        self.rpc_batch = rpc_batch
+        self.index = index
+        self.interval = interval
+        self.max_batch = max_batch
+        self.backfill = backfill
+        self.head: Optional[int] = None
+        self.last_poll_ok: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._ready = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+
+    def _running(self) -> bool:
+        # Caller holds self._lock
+        return (self._thread is not None and self._thread.is_alive()) or (self._task is not None and not self._task.done())
+
+    def start(self) -> bool:
+        """Start polling. Returns False if already running."""
+        with self._lock:
+            if self._running():
+                return False
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="block-poller", daemon=True)
+        self._thread.start()
+        return True
+
+    def start_async(self, rpc_batch: Callable[[List[dict]], Awaitable[List[dict]]]) -> bool:
+        """Start polling as a task on the running event loop, using a coroutine `rpc_batch`. Returns False if already running."""
+        with self._lock:
+            if self._running():
+                return False
+            self._stopped.clear()
+            self._task = asyncio.get_running_loop().create_task(self._run_async(rpc_batch))
+        return True
+
+    def stop(self):
+        self._stopped.set()
+
+    def wait_ready(self, timeout: float = None) -> bool:
+        """Wait until the index has caught up with the chain head."""
+        return self._ready.wait(timeout)
+
+    def _next_requests(self) -> List[dict]:
+        calls = [{"jsonrpc": "2.0", "method": "eth_blockNumber", "params": [], "id": 0}]
+        if self.head is None:
+            return calls
+        last = self.index.latest_number()
+        # After downtime (or on first start), resume from the recent window instead of crawling the whole gap
+        start = self.head - self.backfill + 1
+        if last is not None:
+            start = max(start, last + 1)
+        # Also ask for the block about to be produced; until it exists the node answers null
+        end = min(self.head + 1, start + self.max_batch - 2)
+        for i, number in enumerate(range(start, end + 1), start=1):
+            calls.append({"jsonrpc": "2.0", "method": "eth_getBlockByNumber", "params": [hex(number), False], "id": i})
+        return calls
+
+    def _behind(self) -> bool:
+        last = self.index.latest_number()
+        return self.head is not None and (last is None or last < self.head)
+
+    def poll_once(self) -> int:
+        """Run one batch; returns the number of new blocks indexed."""
+        return self._apply(self.rpc_batch(self._next_requests()))
+
+    async def poll_once_async(self, rpc_batch: Callable[[List[dict]], Awaitable[List[dict]]]) -> int:
+        return self._apply(await rpc_batch(self._next_requests()))
+
+    def _apply(self, responses: List[dict]) -> int:
+        by_id = {r.get('id'): r for r in responses}
+        head = by_id.get(0, {}).get('result')
+        if head:
+            self.head = int(head, 16)
+        # Blocks not produced yet come back as null and are requested again next time
+        headers = [r.get('result') for i, r in by_id.items() if i != 0 and r.get('result')]
+        added = self.index.add(headers)
+        self.last_poll_ok = time.time()
+        self.last_error = None
+        if self.index.latest_number() is not None and not self._behind():
+            self._ready.set()
+        return added
+
+    def _run(self):
+        backoff = self.interval
+        while not self._stopped.is_set():
+            try:
+                cold = self.head is None
+                added = self.poll_once()
+                backoff = self.interval
+                # Still catching up: go again without sleeping
+                if (cold or added) and self._behind():
+                    continue
+            except Exception as e:
+                self.last_error = str(e)
+                backoff = min(backoff * 2, 60.0)
+            self._stopped.wait(backoff)
+
+    async def _run_async(self, rpc_batch):
+        backoff = self.interval
+        while not self._stopped.is_set():
+            try:
+                cold = self.head is None
+                added = await self.poll_once_async(rpc_batch)
+                backoff = self.interval
+                if (cold or added) and self._behind():
+                    continue
+            except Exception as e:
+                self.last_error = str(e)
+                backoff = min(backoff * 2, 60.0)
+            await asyncio.sleep(backoff)
+
+    def status(self) -> Dict[str, Any]:
+        """Latest index statistics plus poller health; never blocks on the network."""
+        stats = self.index.stats()
+        if self.head is not None:
+            stats["head"] = self.head
+        stats["last_poll_ok"] = self.last_poll_ok
+        stats["last_error"] = self.last_error
+        return stats
@@ -0,0 +1,185 @@
+import os
+import gzip
+import asyncio
+import time
+import pickle
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, Optional, Union
+
+# Bump when the on-disk layout changes
+CASSETTE_VERSION = 3
+
+class CassetteMiss(KeyError):
+    """Replay was asked for an upstream call that the cassette never recorded."""
+
+
+class Cassette:
+    """Records every upstream response DataProvider receives and replays them without network.
+
+    mode='record' passes calls through and keeps (result or exception, elapsed seconds) per request;
+    save() writes them to a gzip-compressed pickle. mode='replay' serves the recorded responses in
+    their original order per request, repeating the last one once exhausted; requests are matched on
+    all of their arguments, never approximately. Windows anchored to "now" stay identical because the
+    provider reads the time through now(), whose readings are recorded and played back in the same
+    order. `latency` simulates network time on replay: None for instant,
+    a number of seconds per call, or 'recorded' to reproduce the timings captured while recording.
+    """
+
+    def __init__(self, path: str, mode: str = "replay", latency: Union[None, float, str] = None):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._entries: Dict[tuple, list] = defaultdict(list)   # exact request -> responses
+        self._cursors: Dict[tuple, int] = defaultdict(int)
+        self._clock: list = []                                 # time.time() readings handed out by now()
+        self._clock_cursor = 0
+        self.markets: Dict[str, Dict[str, Any]] = {}           # exchange id -> {'markets', 'currencies'}
+        self.before_save = []  # callables run by save(), e.g. to snapshot markets
+        self.recorded = 0
+        self.replayed = 0
+        if mode == "replay":
+            self.load()
+
+    @staticmethod
+    def from_env() -> Optional["Cassette"]:
+        """Cassette configured by KITSUNE_CASSETTE (path), KITSUNE_CASSETTE_MODE and KITSUNE_CASSETTE_LATENCY, if any."""
+        path = os.environ.get("KITSUNE_CASSETTE")
+        if not path:
+            return None
+        latency = os.environ.get("KITSUNE_CASSETTE_LATENCY") or None
+        if latency not in (None, "recorded"):
+            latency = float(latency)
+        cassette = Cassette(path, os.environ.get("KITSUNE_CASSETTE_MODE", "replay"), latency)
+        if cassette.mode == "record":
+            import atexit
+            atexit.register(cassette.save)
+        return cassette
+
+    @staticmethod
+    def _key(upstream: str, method: str, args: tuple, kwargs: dict) -> tuple:
+        return upstream, method, repr(args), repr(sorted(kwargs.items()))
+
+    def now(self) -> float:
+        """Wall-clock time for planning requests: recorded while recording, played back in order on replay."""
+        with self._lock:
+            if self.mode == "record":
+                self._clock.append(time.time())
+                return self._clock[-1]
+            if not self._clock:
+                return time.time()
+            cursor = self._clock_cursor
+            self._clock_cursor = cursor + 1
+            return self._clock[min(cursor, len(self._clock) - 1)]
+
+    def play(self, upstream: str, method: str, fn: Callable, *args, **kwargs) -> Any:
+        """Perform (record) or look up (replay) one upstream call."""
+        key = self._key(upstream, method, args, kwargs)
+        if self.mode == "record":
+            return self._record(key, fn, args, kwargs)
+        return self._replay(key)
+
+    def _record(self, key: tuple, fn: Callable, args: tuple, kwargs: dict) -> Any:
+        start = time.monotonic()
+        try:
+            result, error = fn(*args, **kwargs), None
+        except Exception as e:
+            result, error = None, e
+        self._store(key, result, error, time.monotonic() - start)
+        if error is not None:
+            raise error
+        return result
+
+    async def play_async(self, upstream: str, method: str, fn: Callable, *args, **kwargs) -> Any:
+        """play() for a coroutine function; recordings are shared with synchronous calls of the same request."""
+        key = self._key(upstream, method, args, kwargs)
+        if self.mode == "record":
+            start = time.monotonic()
+            try:
+                result, error = await fn(*args, **kwargs), None
+            except Exception as e:
+                result, error = None, e
+            self._store(key, result, error, time.monotonic() - start)
+            if error is not None:
+                raise error
+            return result
+        result, error, elapsed = self._lookup(key)
+        delay = elapsed if self.latency == "recorded" else (self.latency or 0)
+        if delay:
+            await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return result
+
+    def _store(self, key: tuple, result: Any, error: Optional[Exception], elapsed: float):
+        with self._lock:
+            self._entries[key].append((result, error, elapsed))
+            self.recorded += 1
+
+    def _replay(self, key: tuple) -> Any:
+        result, error, elapsed = self._lookup(key)
+        delay = elapsed if self.latency == "recorded" else (self.latency or 0)
+        if delay:
+            time.sleep(delay)
+        if error is not None:
+            raise error
+        return result
+
+    def _lookup(self, key: tuple) -> tuple:
+        with self._lock:
+            responses = self._entries.get(key)
+            if not responses:
+                raise CassetteMiss(f"No recorded response for {key}")
+            cursor = self._cursors[key]
+            self._cursors[key] = cursor + 1
+            self.replayed += 1
+            return responses[min(cursor, len(responses) - 1)]
+
+    def record_markets(self, exchange):
+        """Keep a CCXT client's loaded markets so replay never needs load_markets()."""
+        if exchange.markets:
+            with self._lock:
+                self.markets[exchange.id] = {"markets": exchange.markets, "currencies": exchange.currencies}
+
+    def apply_markets(self, exchange) -> bool:
+        """Give a CCXT client its recorded markets. Returns False if none were recorded."""
+        entry = self.markets.get(exchange.id)
+        if not entry:
+            return False
+        exchange.set_markets(entry["markets"], entry.get("currencies"))
+        return True
+
+    def save(self, path: Optional[str] = None):
+        path = path or self.path
+        for hook in self.before_save:
+            hook()
+        with self._lock:
+            payload = {
+                "version": CASSETTE_VERSION,
+                "entries": dict(self._entries),
+                "clock": list(self._clock),
+                "markets": dict(self.markets),
+            }
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with gzip.open(tmp_path, "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def load(self):
+        with gzip.open(self.path, "rb") as f:
+            payload = pickle.load(f)
+        if payload.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"Cassette {self.path} has version {payload.get('version')}, expected {CASSETTE_VERSION}")
+        self._entries = defaultdict(list, payload["entries"])
+        self._clock = payload["clock"]
+        self.markets = payload.get("markets", {})
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"mode": self.mode, "requests": len(self._entries), "recorded": self.recorded, "replayed": self.replayed}
@@ -1,145 +1,652 @@
 import ccxt
 import yfinance as yf
 import pandas as pd
+import numpy as np
 import datetime
-import streamlit as st
 import requests
+import threading
+import time
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional, Union, Dict, Any
+from .ohlcv_store import OHLCVStore
+from .schema import empty_ohlcv, normalize_ohlcv
+from .market_router import MarketRouter
+from .order_book import OrderBookEngine, BinanceDepthTransport
+from .markets_cache import MarketsCache
+from .singleflight import SingleFlight
+from .resampler import resample_ohlcv, timeframe_seconds
+from .rate_limiter import RateScheduler
+from .swr_cache import SWRCache
+from .cassette import Cassette
+from .block_index import BlockIndex, BlockPoller
+from .ticker_snapshots import TickerSnapshotService
+from .ticker_search import TickerSearchIndex
+from .registry import get_shared
+
+MACRO_TICKERS = {
+    "GOLD": "GC=F",
+    "S&P500": "^GSPC",
+    "DXY": "DX-Y.NYB",
+    "NASDAQ": "^IXIC",
+    "BTC-USD": "BTC-USD" # Yahoo backup
+}
+GECKOTERMINAL_POOLS_URL = "https://api.geckoterminal.com/api/v2/networks/world-chain/pools"
+GECKOTERMINAL_MULTI_LIMIT = 30  # addresses per /pools/multi request
+GECKOTERMINAL_OHLCV_LIMIT = 1000  # bars per /pools/{address}/ohlcv request
+# CCXT timeframe -> GeckoTerminal (period, aggregate)
+GECKOTERMINAL_TIMEFRAMES = {
+    "1m": ("minute", 1), "5m": ("minute", 5), "15m": ("minute", 15),
+    "1h": ("hour", 1), "4h": ("hour", 4), "12h": ("hour", 12),
+    "1d": ("day", 1),
+}
+FALLBACK_CRYPTO_TICKERS = ("BTC/USDT", "ETH/USDT", "SOL/USDT", "ICP/USDT", "ATH/USDT")  # Fallback includes ATH
+DEX_TICKER_PREFIX = "DEX:"  # "DEX:<pool address>" names any World Chain pool as an asset
+LIVE_BOOK_MAX_AGE = 5.0  # seconds since the last diff before fetch_order_book falls back to REST
+ATHENE_RPC_URL = "https://rpc.parthenon.athenescan.io"
+# Rate-limit tokens per call, relative to one single-symbol request (after the venues' request weights:
+# on Binance klines weigh 2, all-symbol 24h tickers 80, exchangeInfo 20)
+REQUEST_COSTS = {
+    "fetch_tickers": 20,   # every symbol of the exchange in one response
+    "load_markets": 10,    # market metadata, often several endpoints
+}
+# Order-book depth -> tokens (Binance depth weight 5 / 25 / 50 up to 100 / 500 / 1000 levels, 250 beyond)
+ORDER_BOOK_COSTS = [(100, 2), (500, 12), (1000, 25)]
+ORDER_BOOK_MAX_COST = 40
+# (fresh seconds, extra seconds a stale value may still be served while it refreshes) per data kind
+CACHE_BUDGETS = {
+    "tickers": (3600, 24 * 3600),
+    "ohlcv": (60, 3600),
+    "history": (300, 6 * 3600),
+    "macro": (300, 6 * 3600),
+    "news": (300, 6 * 3600),
+    "dex": (30, 600),
+    "order_book": (2, 30),
+    "ticker_snapshot": (5, 60),
+}
 
 class DataProvider:
-    def __init__(self):
-        self.binance = ccxt.binance({'enableRateLimit': True})
-        self.mexc = ccxt.mexc({'enableRateLimit': True})
-        self.gateio = ccxt.gateio({'enableRateLimit': True})
-        self.macro_tickers = {
-            "GOLD": "GC=F",
-            "S&P500": "^GSPC",
-            "DXY": "DX-Y.NYB",
-            "NASDAQ": "^IXIC",
-            "BTC-USD": "BTC-USD" # Yahoo backup
-        }
+    def __init__(self, ohlcv_dtype=np.float64):
+        # Pacing is done by the shared RateScheduler rather than CCXT's per-client sleeps
+        self.binance = ccxt.binance({'enableRateLimit': False})
+        self.mexc = ccxt.mexc({'enableRateLimit': False})
+        self.gateio = ccxt.gateio({'enableRateLimit': False})
+        self.macro_tickers = dict(MACRO_TICKERS)
         self._cached_tickers = []
         self._last_ticker_update = None
+        # Every OHLCV frame leaves the provider in the canonical schema (engine.schema), in this float dtype
+        self.ohlcv_dtype = ohlcv_dtype
+        self.ohlcv_store = OHLCVStore(dtype=ohlcv_dtype)
+        # (exchange, symbol, timeframe, first ms, last ms) of stored-series holes the venue returned no bars for
+        self._empty_gaps = set()
+        # (exchange, symbol, timeframe) -> (since ms, first bar ms): the venue has no bars in that range, e.g. before a listing
+        self._empty_heads: Dict[tuple, tuple] = {}
+        # Binance first, then MEXC/Gate for newer tokens like ATH
+        self.router = MarketRouter([ex.id for ex in self._exchanges()])
+        # Markets metadata survives restarts on disk; stale copies are refreshed in the background
+        self.markets_cache = MarketsCache(on_refresh=lambda ex: self.router.register_markets(ex.id, ex.markets.keys()),
+                                          load=lambda ex, reload: self._upstream_call(ex.id, "load_markets", ex.load_markets, reload),
+                                          background_context=RateScheduler.background)
+        # Max in-flight requests per upstream, shared by every caller of this provider
+        self.max_concurrency = {"binance": 5, "mexc": 3, "gateio": 3, "yahoo": 4, "geckoterminal": 2, "rpc": 4}
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._slots_lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="kitsune-fetch")
+        # Identical concurrent upstream requests (e.g. many sessions on BTC/USDT) share one call
+        self.single_flight = SingleFlight()
+        # One token bucket per upstream, shared by every provider in the process
+        self.rate_scheduler = get_shared("rate_scheduler", RateScheduler)
+        # Live books for subscribed symbols, maintained from the Binance diff-depth stream
+        self.order_books = OrderBookEngine(BinanceDepthTransport(self.binance, call=self._exchange_call))
+        # Warm keys are answered from memory; stale ones are refreshed off the render path at background priority
+        self.cache = SWRCache(CACHE_BUDGETS, background_context=RateScheduler.background)
+        # Last price / 24h change for every symbol of an exchange from one fetch_tickers call
+        self.snapshots = TickerSnapshotService(self.cache, lambda ex: self._exchange_call(ex, "fetch_tickers"))
+        # Type-ahead search over every selectable asset; crypto pairs are added as market lists load
+        self.ticker_index = TickerSearchIndex()
+        self.ticker_index.add(self.macro_tickers, kind="macro", aliases={name: [symbol] for name, symbol in self.macro_tickers.items()})
+        self.ticker_index.add(self.get_world_chain_assets(), kind="dex", aliases={name: [pool] for name, pool in self.get_world_chain_assets().items()})
+        # Keep-alive HTTP connections for GeckoTerminal and the JSON-RPC endpoint, instead of a handshake per request
+        self.http = requests.Session()
+        # Athene chain headers, followed in the background and read from the local index
+        self.block_poller: Optional[BlockPoller] = None
+        # Optional record/replay of every upstream response (see Cassette.from_env)
+        self.cassette: Optional[Cassette] = None
+        cassette = Cassette.from_env()
+        if cassette:
+            self.use_cassette(cassette)
+
+    def use_cassette(self, cassette: Cassette):
+        """Record upstream responses into `cassette`, or serve them from it instead of the network.
+
+        On replay every request goes to the cassette (a call it never recorded raises CassetteMiss,
+        including load_markets for an exchange whose markets were not captured) and live order-book
+        streams are not started.
+        """
+        self.cassette = cassette
+        if cassette.mode == "replay":
+            for ex in self._exchanges():
+                cassette.apply_markets(ex)
+        else:
+            cassette.before_save.append(lambda: [cassette.record_markets(ex) for ex in self._exchanges()])
+
+    def _now(self) -> float:
+        """Current time for anchoring request windows; taken from the cassette so replays ask for the recorded ranges."""
+        return self.cassette.now() if self.cassette is not None else time.time()
 
-    @st.cache_data(ttl=3600, show_spinner=False)
-    def get_all_crypto_tickers(_self) -> List[str]:
+    def get_all_crypto_tickers(self) -> List[str]:
         """Fetch and cache all available trading pairs from the exchange."""
+        markets = self.cache.get("tickers", "all", self._load_crypto_tickers)
+        if not markets:
+            markets = list(FALLBACK_CRYPTO_TICKERS)
+            self.ticker_index.add(markets)
+        return markets
+
+    def search_tickers(self, query: str, limit: int = 20) -> List[str]:
+        """Top matches for a type-ahead query across crypto pairs, macro names and DEX pools."""
+        if len(self.ticker_index) <= len(self.macro_tickers) + len(self.get_world_chain_assets()):
+            self.get_all_crypto_tickers()  # first search: load the crypto universe into the index
+        # Rank busier pairs first when a Binance snapshot is already in memory (never fetched just for search)
+        snapshot, state = self.cache.peek(TickerSnapshotService.KIND, self.binance.id)
+        popularity = {symbol: quote["quote_volume"] for symbol, quote in (snapshot or {}).items()}
+        return self.ticker_index.search(query, limit=limit, popularity=popularity)
+
+    def _load_crypto_tickers(self) -> List[str]:
         try:
-            binance_markets = sorted(list(_self.binance.load_markets().keys()))
-            mexc_markets = sorted(list(_self.mexc.load_markets().keys()))
+            binance_markets = sorted(list(self.markets_cache.ensure(self.binance).keys()))
+            mexc_markets = sorted(list(self.markets_cache.ensure(self.mexc).keys()))
+            self.router.register_markets(self.binance.id, binance_markets)
+            self.router.register_markets(self.mexc.id, mexc_markets)
+            self.ticker_index.add(binance_markets, exchange=self.binance.id)
+            self.ticker_index.add(mexc_markets, exchange=self.mexc.id)
             # Combine and unique
             all_markets = sorted(list(set(binance_markets + mexc_markets)))
             return all_markets
         except Exception as e:
             print(f"Error fetching symbols: {e}")
-            return ["BTC/USDT", "ETH/USDT", "SOL/USDT", "ICP/USDT", "ATH/USDT"] # Fallback includes ATH
+            return []
+
+    def _upstream_slot(self, upstream: str) -> threading.BoundedSemaphore:
+        """Semaphore bounding concurrent requests to one upstream (exchange id, 'yahoo', ...)."""
+        with self._slots_lock:
+            if upstream not in self._slots:
+                self._slots[upstream] = threading.BoundedSemaphore(self.max_concurrency.get(upstream, 2))
+            return self._slots[upstream]
+
+    def _upstream_call(self, upstream: str, method: str, fn, *args, **kwargs):
+        """Single choke point for every network request: coalesces identical in-flight calls, waits for a
+        rate-limit token, then bounds concurrency."""
+        key = (upstream, method, repr(args), repr(sorted(kwargs.items())))
+        cost = self._request_cost(method, kwargs)
+
+        def call():
+            self.rate_scheduler.acquire(upstream, cost)
+            with self._upstream_slot(upstream):
+                if self.cassette is not None:
+                    return self.cassette.play(upstream, method, fn, *args, **kwargs)
+                return fn(*args, **kwargs)
+
+        return self.single_flight.do(key, call)
+
+    @staticmethod
+    def _request_cost(method: str, kwargs: dict) -> float:
+        """Rate-limit tokens one call consumes (see REQUEST_COSTS)."""
+        if method == "fetch_order_book":
+            depth = kwargs.get("limit") or 100
+            return next((cost for max_depth, cost in ORDER_BOOK_COSTS if depth <= max_depth), ORDER_BOOK_MAX_COST)
+        return REQUEST_COSTS.get(method, 1)
+
+    def _exchange_call(self, ex, method: str, *args, **kwargs):
+        """_upstream_call for a CCXT client method. Markets are loaded first (from disk or through the
+        rate limiter), so CCXT never fetches them implicitly and unthrottled inside the call."""
+        if not ex.markets:
+            self.markets_cache.ensure(ex)
+        return self._upstream_call(ex.id, method, getattr(ex, method), *args, **kwargs)
 
-    @st.cache_data(ttl=300, show_spinner=False)
-    def fetch_crypto_data(_self, symbol: str, timeframe: str = '1d', limit: int = 100) -> pd.DataFrame:
-        """Fetch historical data from CCXT (Binance/MEXC). Cached for 5 minutes."""
-        # Try Binance first, then MEXC for newer tokens like ATH
-        exchanges = [_self.binance, _self.mexc, _self.gateio]
+    def _exchanges(self) -> list:
+        return [self.binance, self.mexc, self.gateio]
+
+    def _route(self, symbol: str) -> list:
+        """Exchanges to try for a symbol, in order, according to the routing index."""
+        exchanges = {ex.id: ex for ex in self._exchanges()}
+        # Markets come from the disk cache or from CCXT loading them on first use of a client
+        for ex_id, ex in exchanges.items():
+            if not ex.markets:
+                self.markets_cache.ensure(ex, load_if_missing=False)
+            if ex.markets and not self.router.is_indexed(ex_id):
+                self.router.register_markets(ex_id, ex.markets.keys())
+        return [exchanges[ex_id] for ex_id in self.router.route(symbol)]
+
+    def fetch_crypto_data(self, symbol: str, timeframe: str = '1d', limit: int = 100) -> pd.DataFrame:
+        """Fetch historical data from CCXT (Binance/MEXC), topping up the local OHLCV store. Served from the cache."""
+        return self.cache.get("ohlcv", (symbol, timeframe, limit), lambda: self._load_crypto_data(symbol, timeframe, limit))
+
+    def _load_crypto_data(self, symbol: str, timeframe: str, limit: int) -> pd.DataFrame:
+        exchanges = self._route(symbol)
+        # Prefer a venue we already hold history for, so only the missing bars are requested
+        exchanges.sort(key=lambda ex: not self.ohlcv_store.has(ex.id, symbol, timeframe))
+        unlisted = 0
         for ex in exchanges:
             try:
-                # Some exchanges might have different names, but we assume standard pair / format
-                ohlcv = ex.fetch_ohlcv(symbol, timeframe, limit=limit)
-                df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-                df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-                df.set_index('timestamp', inplace=True)
-                return df
+                df = self._sync_ohlcv(ex, symbol, timeframe, limit)
+                if df.empty:
+                    continue
+                self.router.record_success(symbol, ex.id)
+                return df.tail(limit)
+            except ccxt.BadSymbol:
+                unlisted += 1
+                self.router.record_unlisted(symbol, ex.id)
             except Exception as e:
                 continue
         
+        if exchanges and unlisted == len(exchanges):
+            self.router.mark_missing(symbol)
         print(f"Error: Symbol {symbol} not found on any supported exchanges.")
-        return pd.DataFrame()
+        return empty_ohlcv(self.ohlcv_dtype)
+
+    def _sync_ohlcv(self, ex, symbol: str, timeframe: str, limit: int) -> pd.DataFrame:
+        """Bring the stored series for (exchange, symbol, timeframe) up to date and return it."""
+        stored = self.ohlcv_store.load(ex.id, symbol, timeframe)
+        if len(stored) >= limit:
+            # Incremental: re-request from the last stored bar (it may still have been forming)
+            since = int(stored.index[-1].timestamp() * 1000)
+            ohlcv = self._exchange_call(ex, "fetch_ohlcv", symbol, timeframe, since=since, limit=limit)
+            if len(ohlcv) < limit:
+                return self.ohlcv_store.append(ex.id, symbol, timeframe, OHLCVStore.ohlcv_to_frame(ohlcv))
+            # The gap is wider than one page: take the latest window; the hole it leaves is filled by _backfill_ohlcv
+
+        ohlcv = self._exchange_call(ex, "fetch_ohlcv", symbol, timeframe, limit=limit)
+        return self.ohlcv_store.append(ex.id, symbol, timeframe, OHLCVStore.ohlcv_to_frame(ohlcv))
+
+    def fetch_crypto_history(self, symbol: str, timeframe: str = '1d', days: int = 3 * 365, since_ms: Optional[int] = None, until_ms: Optional[int] = None, page_limit: int = 1000) -> pd.DataFrame:
+        """Fetch history beyond a single exchange page (default: 3 years), writing it through to the OHLCV store.
+
+        Only the ranges the store does not already hold are requested, split into exchange-sized
+        pages that are fetched concurrently within the venue's concurrency slots. Served from the cache.
+        """
+        key = (symbol, timeframe, days, since_ms, until_ms, page_limit)
+        return self.cache.get("history", key, lambda: self._load_crypto_history(symbol, timeframe, days, since_ms, until_ms, page_limit))
+
+    def _load_crypto_history(self, symbol: str, timeframe: str, days: int, since_ms: Optional[int], until_ms: Optional[int], page_limit: int) -> pd.DataFrame:
+        # An open-ended window is re-anchored to "now" on every refresh
+        until_ms = until_ms or int(self._now() * 1000)
+        since_ms = since_ms if since_ms is not None else until_ms - days * 86400 * 1000
+        exchanges = self._route(symbol)
+        exchanges.sort(key=lambda ex: not self.ohlcv_store.has(ex.id, symbol, timeframe))
+        for ex in exchanges:
+            try:
+                df = self._backfill_ohlcv(ex, symbol, timeframe, since_ms, until_ms, page_limit)
+                if df.empty:
+                    continue
+                self.router.record_success(symbol, ex.id)
+                return df
+            except ccxt.BadSymbol:
+                self.router.record_unlisted(symbol, ex.id)
+            except Exception as e:
+                print(f"History fetch error for {symbol} on {ex.id}: {e}")
+        return empty_ohlcv(self.ohlcv_dtype)
+
+    def _backfill_ohlcv(self, ex, symbol: str, timeframe: str, since_ms: int, until_ms: int, page_limit: int) -> pd.DataFrame:
+        """Fill the store's gaps in [since_ms, until_ms] with concurrent paged requests and return that window."""
+        stored = self.ohlcv_store.load(ex.id, symbol, timeframe)
+        starts, holes, head = self._backfill_plan(ex.id, symbol, timeframe, stored, since_ms, until_ms, page_limit)
+        # A private pool: pages may be requested from inside fetch_many's shared workers
+        with ThreadPoolExecutor(max_workers=self.max_concurrency.get(ex.id, 2)) as pool:
+            fetch_page = lambda start: self._exchange_call(ex, "fetch_ohlcv", symbol, timeframe, since=start, limit=page_limit)
+            futures = [pool.submit(contextvars.copy_context().run, fetch_page, start) for start in starts]
+            pages = [future.result() for future in futures]
+
+        bars = [bar for page in pages for bar in page]
+        merged = self.ohlcv_store.append(ex.id, symbol, timeframe, OHLCVStore.ohlcv_to_frame(bars))
+        return self._backfill_window(ex.id, symbol, timeframe, merged, holes, head, since_ms, until_ms)
 
-    @st.cache_data(ttl=300, show_spinner=False)
-    def fetch_macro_data(_self, ticker: str, period: str = "1y") -> pd.DataFrame:
-        """Fetch historical data from YFinance."""
+    def _backfill_plan(self, exchange_id: str, symbol: str, timeframe: str, stored: pd.DataFrame,
+                       since_ms: int, until_ms: int, page_limit: int) -> tuple:
+        """(page start times to request, interior holes being filled, start of a requested range before the
+        first stored bar or None) to cover [since_ms, until_ms]."""
+        step = timeframe_seconds(timeframe) * 1000
+        holes, head = [], None
+        if stored.empty:
+            ranges, head = [(since_ms, until_ms)], since_ms
+        else:
+            first = int(stored.index[0].timestamp() * 1000)
+            last = int(stored.index[-1].timestamp() * 1000)
+            ranges = []
+            known = self._empty_heads.get((exchange_id, symbol, timeframe))
+            # Skipped when the venue already had nothing from since_ms up to this first bar (a pair listed later)
+            if since_ms < first and not (known and known[0] <= since_ms and known[1] == first):
+                ranges.append((since_ms, first - step))
+                head = since_ms
+            # Holes inside the stored series, e.g. left by an incremental sync that skipped a wide gap
+            holes = [(lo, hi) for lo, hi in self._ohlcv_gaps(stored.index, step)
+                     if hi >= since_ms and lo <= until_ms and (exchange_id, symbol, timeframe, lo, hi) not in self._empty_gaps]
+            ranges.extend(holes)
+            if last < until_ms:
+                ranges.append((last, until_ms))  # from the last bar, which may still have been forming
+
+        page_span = page_limit * step
+        return [start for lo, hi in ranges for start in range(lo, hi + 1, page_span)], holes, head
+
+    def _backfill_window(self, exchange_id: str, symbol: str, timeframe: str, merged: pd.DataFrame,
+                         holes: List[tuple], head: Optional[int], since_ms: int, until_ms: int) -> pd.DataFrame:
+        """Remember the ranges the venue had no bars for and cut the merged series to [since_ms, until_ms]."""
+        if merged.empty:
+            return merged
+        # Holes the venue has no bars for (e.g. a trading halt) are not requested again
+        remaining = set(self._ohlcv_gaps(merged.index, timeframe_seconds(timeframe) * 1000))
+        self._empty_gaps.update((exchange_id, symbol, timeframe) + hole for hole in holes if hole in remaining)
+        if head is not None:
+            # Nor is the range before the venue's first bar
+            self._empty_heads[(exchange_id, symbol, timeframe)] = (head, int(merged.index[0].timestamp() * 1000))
+        return merged[(merged.index >= pd.to_datetime(since_ms, unit='ms', utc=True)) & (merged.index <= pd.to_datetime(until_ms, unit='ms', utc=True))]
+
+    @staticmethod
+    def _ohlcv_gaps(index: pd.DatetimeIndex, step_ms: int) -> List[tuple]:
+        """(first missing, last missing) bar timestamps in ms for every hole of one or more bars in a series."""
+        if len(index) < 2:
+            return []
+        ms = index.as_unit('ms').asi8
+        # 1.5 steps: calendar timeframes (1M) vary a little in length, a missing bar doubles the spacing
+        holes = np.nonzero(np.diff(ms) > 1.5 * step_ms)[0]
+        return [(int(ms[i]) + step_ms, int(ms[i + 1]) - step_ms) for i in holes]
+
+    def fetch_multi_timeframe(self, symbol: str, timeframes: tuple, limit: int = 100, include_partial: bool = True) -> Dict[str, pd.DataFrame]:
+        """Fetch the finest of `timeframes` once and derive the coarser ones locally from the cached base series.
+
+        The base request is sized so the coarsest view gets `limit` bars, within one exchange page (1000 bars).
+        """
+        ordered = sorted(timeframes, key=timeframe_seconds)
+        base = ordered[0]
+        ratio = timeframe_seconds(ordered[-1]) // timeframe_seconds(base)
+        base_df = self.fetch_crypto_data(symbol, timeframe=base, limit=min(limit * ratio, 1000))
+        frames = {}
+        for tf in ordered:
+            if tf == base:
+                frames[tf] = base_df.tail(limit)
+            else:
+                frames[tf] = resample_ohlcv(base_df, tf, base, include_partial=include_partial).tail(limit)
+        return frames
+
+    def fetch_resampled(self, symbol: str, timeframe: str, base_timeframe: str = '1h', limit: int = 100) -> pd.DataFrame:
+        """Bars for `timeframe` aggregated from `base_timeframe` data instead of a separate exchange request."""
+        return self.fetch_multi_timeframe(symbol, (base_timeframe, timeframe), limit=limit)[timeframe]
+
+    def fetch_macro_data(self, ticker: str, period: str = "1y") -> pd.DataFrame:
+        """Fetch historical data from YFinance. Known macro names are served from the shared batch download."""
+        if ticker in self.macro_tickers:
+            return self.fetch_macro_batch(period=period).get(ticker, empty_ohlcv(self.ohlcv_dtype))
+        return self.cache.get("macro", (ticker, period), lambda: self._load_macro_data(ticker, period))
+
+    def _load_macro_data(self, ticker: str, period: str) -> pd.DataFrame:
         try:
             # Map common names to yfinance symbols
-            yf_ticker = _self.macro_tickers.get(ticker, ticker)
-            data = yf.download(yf_ticker, period=period)
+            yf_ticker = self.macro_tickers.get(ticker, ticker)
+            data = self._upstream_call("yahoo", "download", yf.download, yf_ticker, period=period)
             if data.empty:
-                return pd.DataFrame()
-            return data
+                return empty_ohlcv(self.ohlcv_dtype)
+            return normalize_ohlcv(data, self.ohlcv_dtype)
         except Exception as e:
             print(f"Error fetching YFinance data for {ticker}: {e}")
-            return pd.DataFrame()
+            return empty_ohlcv(self.ohlcv_dtype)
+
+    def fetch_macro_batch(self, extras: tuple = (), period: str = "1y") -> Dict[str, pd.DataFrame]:
+        """Download every macro ticker (plus any extras) in a single yf.download call. Served from the cache."""
+        names = list(self.macro_tickers) + [t for t in extras if t not in self.macro_tickers]
+        frames = self.cache.get("macro", (tuple(names), period), lambda: self._load_macro_batch(names, period))
+        return frames or {name: empty_ohlcv(self.ohlcv_dtype) for name in names}
+
+    def _load_macro_batch(self, names: List[str], period: str) -> Dict[str, pd.DataFrame]:
+        symbols = [self.macro_tickers.get(name, name) for name in names]
+        try:
+            data = self._upstream_call("yahoo", "download", yf.download, symbols, period=period, group_by='ticker', progress=False)
+        except Exception as e:
+            print(f"Error fetching YFinance batch {symbols}: {e}")
+            return {}
+        if data.empty:
+            return {}
+        return self._split_macro_batch(data, names, symbols, self.ohlcv_dtype)
+
+    @staticmethod
+    def _split_macro_batch(data: pd.DataFrame, names: List[str], symbols: List[str], dtype=np.float64) -> Dict[str, pd.DataFrame]:
+        """Split a group_by='ticker' multi-download into one canonical OHLCV frame per macro name."""
+        # group_by='ticker' puts the Yahoo symbol on the first column level
+        downloaded = set(data.columns.get_level_values(0)) if not data.empty else set()
+        frames = {}
+        for name, symbol in zip(names, symbols):
+            if symbol not in downloaded:
+                frames[name] = empty_ohlcv(dtype)
+                continue
+            # Each symbol trades on its own calendar: drop the other markets' dates
+            frames[name] = normalize_ohlcv(data[symbol].dropna(how='all'), dtype)
+        return frames
 
     def get_asset_data(self, ticker: str) -> pd.DataFrame:
         """Smart asset selection logic."""
+        pool = self.dex_pool_address(ticker)
+        if pool:
+            return self.fetch_dex_ohlcv(pool)
         if "/" in ticker:
             return self.fetch_crypto_data(ticker)
         else:
             return self.fetch_macro_data(ticker)
 
+    def get_quote(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """Last price and 24h change ({'last', 'change_pct', ...}) for any asset, or None.
+
+        Crypto pairs are read from the routed exchange's ticker snapshot, DEX pools from the pool
+        quote; other assets fall back to their last two bars.
+        """
+        pool = self.dex_pool_address(ticker)
+        if pool:
+            quote = self.fetch_dex_price(pool)
+            return {"last": quote["price"], "change_pct": quote["change_24h"]} if quote["price"] else None
+        if "/" in ticker:
+            for ex in self._route(ticker):
+                quote = self.snapshots.quote(ex, ticker)
+                if quote:
+                    return quote
+            return None
+        df = self.get_asset_data(ticker)
+        if df.empty:
+            return None
+        last = float(df['close'].iloc[-1])
+        prev = float(df['close'].iloc[-2]) if len(df) > 1 else last
+        return {"last": last, "change_pct": (last - prev) / prev * 100 if prev else 0.0}
+
+    def get_quotes(self, tickers: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """get_quote for several assets; crypto pairs share their exchange's snapshot."""
+        pools = [pool for pool in map(self.dex_pool_address, tickers) if pool]
+        if pools:
+            self.fetch_dex_prices(pools)  # one multi-pool request warms every DEX quote
+        return {ticker: self.get_quote(ticker) for ticker in tickers}
+
+    def get_quote_board(self, exchange_id: str = "binance", quote_currency: str = "USDT") -> pd.DataFrame:
+        """Every `quote_currency` pair on an exchange with last price and 24h change, by quote volume."""
+        ex = {ex.id: ex for ex in self._exchanges()}[exchange_id]
+        rows = {symbol: quote for symbol, quote in self.snapshots.snapshot(ex).items() if symbol.endswith(f"/{quote_currency}")}
+        if not rows:
+            return pd.DataFrame()
+        return pd.DataFrame.from_dict(rows, orient='index').sort_values('quote_volume', ascending=False)
+
     def get_latest_price(self, ticker: str) -> Optional[float]:
         """Fetch the most recent price for an asset."""
-        df = self.get_asset_data(ticker)
-        if not df.empty:
-            val = df['close'].iloc[-1] if 'close' in df.columns else df['Close'].iloc[-1]
-            return float(val.item()) if hasattr(val, 'item') else float(val)
-        return None
+        quote = self.get_quote(ticker)
+        return quote["last"] if quote else None
+
+    def fetch_many(self, batch: List[Dict[str, Any]]) -> List[Any]:
+        """Run several fetches concurrently and return their results in input order.
+
+        Each entry names a 'kind' plus that fetch's arguments, e.g.
+        {"kind": "ohlcv", "symbol": "BTC/USDT", "limit": 2} or {"kind": "price", "ticker": "GOLD"}.
+        Kinds: ohlcv, macro, asset, price, quote, news, order_book, dex. Failed entries yield None.
+        """
+        handlers = {
+            "ohlcv": self.fetch_crypto_data,
+            "macro": self.fetch_macro_data,
+            "asset": self.get_asset_data,
+            "price": self.get_latest_price,
+            "quote": self.get_quote,
+            "news": self.fetch_news,
+            "order_book": self.fetch_order_book,
+            "dex": self.fetch_dex_price,
+        }
+        def run(entry: Dict[str, Any]):
+            params = dict(entry)
+            handler = handlers[params.pop("kind")]
+            return handler(**params)
+
+        # Each worker inherits the caller's context, so background batches stay background priority
+        futures = [self._pool.submit(contextvars.copy_context().run, run, entry) for entry in batch]
+        results = []
+        for entry, future in zip(batch, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                print(f"Batch fetch error for {entry}: {e}")
+                results.append(None)
+        return results
+
+    def subscribe_order_book(self, symbol: str) -> bool:
+        """Start (or renew) streaming a live local book for a Binance-listed symbol. Returns True if one is maintained.
+
+        Subscriptions not renewed or read for a while are closed by the order-book engine.
+        """
+        if symbol not in (self.binance.markets or {}):
+            return False
+        if self.cassette is not None and self.cassette.mode == "replay":
+            return False  # no live websocket on replay: books come from the recorded REST responses
+        self.order_books.subscribe(symbol)
+        return True
 
     def fetch_order_book(self, symbol: str, limit: int = 50) -> dict:
-        """Fetch the order book for a given symbol."""
-        try:
-            return self.binance.fetch_order_book(symbol, limit=limit)
-        except Exception as e:
-            print(f"Error fetching order book for {symbol}: {e}")
-            return {}
+        """Fetch the order book for a given symbol: from the live local book if subscribed, else via REST."""
+        # A live book that stopped receiving diffs (quiet market, stalled stream) is not served as current
+        if self.order_books.is_ready(symbol, max_age=LIVE_BOOK_MAX_AGE):
+            return self.order_books.top(symbol, limit)
+        return self.cache.get("order_book", (symbol, limit), lambda: self._load_order_book(symbol, limit))
 
-    def fetch_news(self, ticker: str) -> List[dict]:
-        """Fetch news for a given ticker via Yahoo Finance."""
+    def _load_order_book(self, symbol: str, limit: int) -> dict:
+        for ex in self._route(symbol):
+            try:
+                book = self._exchange_call(ex, "fetch_order_book", symbol, limit=limit)
+                self.router.record_success(symbol, ex.id)
+                return book
+            except ccxt.BadSymbol:
+                self.router.record_unlisted(symbol, ex.id)
+            except Exception as e:
+                print(f"Error fetching order book for {symbol} on {ex.id}: {e}")
+        return {}
+
+    @staticmethod
+    def _news_symbol(ticker: str, macro_tickers: Dict[str, str]) -> str:
+        """Convert a ticker to the Yahoo symbol its news is filed under."""
+        if "/" in ticker:
+            # BTC/USDT -> BTC-USD (Yahoo format)
+            base = ticker.split("/")[0]
+            return f"{base}-USD"
+        return macro_tickers.get(ticker, ticker)
+
+    @staticmethod
+    def _load_yahoo_news(yf_ticker: str) -> List[dict]:
+        t = yf.Ticker(yf_ticker)
+        
+        # Try different news access methods (YFinance API varies)
+        news = []
         try:
-            # Convert ticker to YFinance format
-            if "/" in ticker:
-                # BTC/USDT -> BTC-USD (Yahoo format)
-                base = ticker.split("/")[0]
-                yf_ticker = f"{base}-USD"
-            else:
-                yf_ticker = self.macro_tickers.get(ticker, ticker)
-            
-            t = yf.Ticker(yf_ticker)
-            
-            # Try different news access methods (YFinance API varies)
-            news = []
+            news = t.news if hasattr(t, 'news') and t.news else []
+        except:
+            pass
+        
+        # Fallback: try get_news method if available
+        if not news:
             try:
-                news = t.news if hasattr(t, 'news') and t.news else []
+                news = t.get_news() if hasattr(t, 'get_news') else []
             except:
                 pass
-            
-            # Fallback: try get_news method if available
-            if not news:
-                try:
-                    news = t.get_news() if hasattr(t, 'get_news') else []
-                except:
-                    pass
-            
+        return news
+
+    def fetch_news(self, ticker: str) -> List[dict]:
+        """Fetch news for a given ticker via Yahoo Finance."""
+        return self.cache.get("news", ticker, lambda: self._load_news(ticker))
+
+    def _load_news(self, ticker: str) -> List[dict]:
+        try:
+            yf_ticker = self._news_symbol(ticker, self.macro_tickers)
+            news = self._upstream_call("yahoo", "news", self._load_yahoo_news, yf_ticker)
             return news[:10] if news else []
         except Exception as e:
             print(f"Error fetching news for {ticker}: {e}")
             return []
 
+    @staticmethod
+    def _parse_dex_pool(pool: dict) -> Dict[str, Any]:
+        """Extract price/change/volume from a GeckoTerminal pool resource."""
+        attr = pool.get('attributes', {})
+        return {
+            "price": float(attr.get('base_token_price_usd', 0)),
+            "change_24h": float(attr.get('price_change_percentage', {}).get('h24', 0)),
+            "volume": float(attr.get('volume_usd', {}).get('h24', 0)),
+            "name": attr.get('name', 'Unknown')
+        }
+
     def fetch_dex_price(self, pool_address: str) -> Dict[str, Any]:
         """Fetch real-time price from GeckoTerminal for a specific pool on World Chain."""
-        url = f"https://api.geckoterminal.com/api/v2/networks/world-chain/pools/{pool_address}"
-        try:
-            resp = requests.get(url, timeout=10)
-            if resp.status_code == 200:
-                data = resp.json()
-                attr = data.get('data', {}).get('attributes', {})
-                return {
-                    "price": float(attr.get('base_token_price_usd', 0)),
-                    "change_24h": float(attr.get('price_change_percentage', {}).get('h24', 0)),
-                    "volume": float(attr.get('volume_usd', {}).get('h24', 0)),
-                    "name": attr.get('name', 'Unknown')
-                }
-            return {"price": 0.0, "change_24h": 0.0, "volume": 0.0, "name": "N/A"}
-        except Exception as e:
-            print(f"DEX Fetch Error: {e}")
-            return {"price": 0.0, "change_24h": 0.0, "volume": 0.0, "name": "Error"}
+        return self.fetch_dex_prices([pool_address])[pool_address]
+
+    def fetch_dex_prices(self, pools: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Quotes for several World Chain pools, keyed by address.
+
+        Cached pools are answered immediately (stale ones refreshed in the background); the rest are
+        fetched together through GeckoTerminal's multi-pool endpoint.
+        """
+        quotes, stale, missing = {}, [], []
+        for pool in dict.fromkeys(pools):
+            quote, state = self.cache.peek("dex", pool)
+            if state == "miss":
+                missing.append(pool)
+                continue
+            quotes[pool] = quote
+            if state == "stale":
+                stale.append(pool)
+        if stale:
+            self.cache.refresh_many("dex", stale, self._load_dex_prices)
+        if missing:
+            try:
+                loaded = self._load_dex_prices(missing)
+            except Exception as e:
+                print(f"DEX Fetch Error: {e}")
+                loaded = {pool: {"price": 0.0, "change_24h": 0.0, "volume": 0.0, "name": "Error"} for pool in missing}
+            for pool in missing:
+                quote = loaded.get(pool) or {"price": 0.0, "change_24h": 0.0, "volume": 0.0, "name": "N/A"}
+                quotes[pool] = quote
+                if pool in loaded:
+                    self.cache.put("dex", pool, quote)
+        return {pool: quotes[pool] for pool in pools}
+
+    def _load_dex_prices(self, pools: List[str]) -> Dict[str, Dict[str, Any]]:
+        quotes = {}
+        for i in range(0, len(pools), GECKOTERMINAL_MULTI_LIMIT):
+            chunk = pools[i:i + GECKOTERMINAL_MULTI_LIMIT]
+            url = f"{GECKOTERMINAL_POOLS_URL}/multi/{','.join(chunk)}"
+            try:
+                data = self._upstream_call("geckoterminal", "get", self._http_json, "GET", url, timeout=10)
+            except Exception as e:
+                print(f"DEX multi-pool error: {e}")
+                continue
+            quotes.update(self._parse_dex_multi(data, chunk))
+        return quotes
+
+    @classmethod
+    def _parse_dex_multi(cls, data: dict, pools: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Quotes from a /pools/multi response, keyed by the requested pool addresses."""
+        # The API lowercases addresses; answer under the caller's spelling
+        requested = {pool.lower(): pool for pool in pools}
+        quotes = {}
+        for resource in data.get('data', []):
+            address = resource.get('attributes', {}).get('address', '').lower()
+            if address in requested:
+                quotes[requested[address]] = cls._parse_dex_pool(resource)
+        return quotes
 
     def get_world_chain_assets(self):
         """Pre-defined alpha assets for World Chain monitoring."""
@@ -148,16 +655,125 @@ class DataProvider:
             "ATHENE": "0x2cad161cf084a8a52cfdd5c0dd0102e49d498c39"
         }
 
-    def get_athene_chain_status(self):
-        """Fetch real-time technical status of the Athene Parthenon chain."""
-        rpc_url = "https://rpc.parthenon.athenescan.io"
+    def dex_pool_address(self, ticker: str) -> Optional[str]:
+        """Pool address for a DEX ticker (a World Chain watchlist name or "DEX:<address>"), else None."""
+        if ticker.startswith(DEX_TICKER_PREFIX):
+            return ticker[len(DEX_TICKER_PREFIX):]
+        return self.get_world_chain_assets().get(ticker)
+
+    def fetch_dex_ohlcv(self, pool_address: str, timeframe: str = '1d', limit: int = 100) -> pd.DataFrame:
+        """Pool OHLCV (USD) from GeckoTerminal, kept in the local OHLCV store under 'geckoterminal'. Served from the cache."""
+        return self.cache.get("ohlcv", ("dex", pool_address, timeframe, limit), lambda: self._load_dex_ohlcv(pool_address, timeframe, limit))
+
+    def _load_dex_ohlcv(self, pool_address: str, timeframe: str, limit: int) -> pd.DataFrame:
         try:
-            payload = {"jsonrpc":"2.0","method":"eth_blockNumber","params":[],"id":1}
-            resp = requests.post(rpc_url, json=payload, timeout=5)
-            if resp.status_code == 200:
-                block_hex = resp.json().get('result', "0x0")
-                block_num = int(block_hex, 16)
-                return {"status": "Online", "block": block_num, "tps_est": "4000 (Peak)"}
-            return {"status": "Congested", "block": "N/A", "tps_est": "---"}
-        except Exception:
-            return {"status": "Offline", "block": "N/A", "tps_est": "---"}
+            return self._sync_dex_ohlcv(pool_address, timeframe, limit).tail(limit)
+        except Exception as e:
+            print(f"DEX OHLCV error for {pool_address}: {e}")
+            return empty_ohlcv(self.ohlcv_dtype)
+
+    def _sync_dex_ohlcv(self, pool_address: str, timeframe: str, limit: int) -> pd.DataFrame:
+        """Bring the stored pool series up to date and return it, paging back in time for deeper history."""
+        stored = self.ohlcv_store.load("geckoterminal", pool_address, timeframe)
+        wanted = self._dex_bars_wanted(stored, timeframe, limit, self._now())
+        bars, before = [], None
+        while wanted > 0:
+            page_limit = min(wanted, GECKOTERMINAL_OHLCV_LIMIT)
+            page = self._fetch_dex_ohlcv_page(pool_address, timeframe, page_limit, before)
+            bars.extend(page)
+            wanted -= len(page)
+            if len(page) < page_limit:
+                break  # reached the pool's first trade
+            before = min(bar[0] for bar in page) // 1000
+        return self.ohlcv_store.append("geckoterminal", pool_address, timeframe, OHLCVStore.ohlcv_to_frame(bars))
+
+    @staticmethod
+    def _dex_bars_wanted(stored: pd.DataFrame, timeframe: str, limit: int, now: float) -> int:
+        """Bars to request for a pool series: `limit` on a cold store, else the bars since the last stored one."""
+        if len(stored) < limit:
+            return limit
+        # Incremental: only the bars since the last stored one (it may still have been forming)
+        elapsed = now - stored.index[-1].timestamp()
+        return min(int(elapsed // timeframe_seconds(timeframe)) + 1, GECKOTERMINAL_OHLCV_LIMIT)
+
+    @staticmethod
+    def _dex_ohlcv_request(pool_address: str, timeframe: str, limit: int, before: Optional[int] = None) -> tuple:
+        """(url, params) of one GeckoTerminal pool OHLCV page."""
+        if timeframe not in GECKOTERMINAL_TIMEFRAMES:
+            raise ValueError(f"GeckoTerminal has no {timeframe} candles")
+        period, aggregate = GECKOTERMINAL_TIMEFRAMES[timeframe]
+        params = {"aggregate": aggregate, "limit": limit, "currency": "usd"}
+        if before is not None:
+            params["before_timestamp"] = before
+        return f"{GECKOTERMINAL_POOLS_URL}/{pool_address}/ohlcv/{period}", params
+
+    @staticmethod
+    def _parse_dex_ohlcv(data: dict) -> list:
+        rows = data.get('data', {}).get('attributes', {}).get('ohlcv_list', [])
+        # Newest first, timestamps in seconds
+        return [[int(row[0]) * 1000] + [float(v) for v in row[1:6]] for row in rows]
+
+    def _fetch_dex_ohlcv_page(self, pool_address: str, timeframe: str, limit: int, before: Optional[int] = None) -> list:
+        """One page of pool bars ending before `before` (Unix seconds), as CCXT-style [ms, o, h, l, c, v] rows."""
+        url, params = self._dex_ohlcv_request(pool_address, timeframe, limit, before)
+        return self._parse_dex_ohlcv(self._upstream_call("geckoterminal", "get", self._http_json, "GET", url, params=params, timeout=10))
+
+    def _http_json(self, method: str, url: str, **kwargs) -> Any:
+        """One HTTP request on the keep-alive session; the decoded JSON body (HTTP errors raise).
+
+        The parsed body, not the response object, is what the cassette records, so sync and async
+        providers share recordings.
+        """
+        resp = self.http.request(method, url, **kwargs)
+        resp.raise_for_status()
+        return resp.json()
+
+    @staticmethod
+    def _check_rpc_batch(result: Any) -> List[dict]:
+        if not isinstance(result, list):
+            raise ValueError(f"Unexpected JSON-RPC batch response: {result}")
+        return result
+
+    def _rpc_batch(self, calls: List[dict]) -> List[dict]:
+        """POST a JSON-RPC batch to the Athene endpoint and return its responses."""
+        return self._check_rpc_batch(self._upstream_call("rpc", "post", self._http_json, "POST", ATHENE_RPC_URL, json=calls, timeout=5))
+
+    def start_block_poller(self, wait: float = 0.0) -> BlockPoller:
+        """Start following the Athene chain in the background (idempotent); optionally wait for the first block."""
+        poller = self._block_poller()
+        if poller.start() and wait:
+            poller.wait_ready(wait)
+        return poller
+
+    def _block_poller(self) -> BlockPoller:
+        """The provider's block poller (one per process via the shared provider), created but not started."""
+        with self._slots_lock:
+            if self.block_poller is None:
+                def rpc_batch(calls):
+                    with RateScheduler.background():
+                        return self._rpc_batch(calls)
+                self.block_poller = BlockPoller(rpc_batch, BlockIndex())
+            return self.block_poller
+
+    def get_athene_chain_status(self):
+        """Technical status of the Athene Parthenon chain, read from the local block index (no network call)."""
+        return self._chain_status(self.start_block_poller(wait=3.0))
+
+    @staticmethod
+    def _chain_status(poller: BlockPoller) -> Dict[str, Any]:
+        stats = poller.status()
+        if not stats.get("block"):
+            return {"status": "Offline" if poller.last_error else "Syncing", "block": "N/A", "tps_est": "---"}
+        # A head that stopped moving for a while means the node (or our link to it) is stuck
+        age = time.time() - stats["block_timestamp"]
+        status = "Online" if age < 60 and not poller.last_error else ("Congested" if age < 300 else "Offline")
+        return {
+            "status": status,
+            "block": stats["block"],
+            "tps_est": f"{stats['tps']:.1f} TPS",
+            "tps": stats["tps"],
+            "block_time": stats["block_time"],
+            "gas_utilization": stats["gas_utilization"],
+            "gas_used_avg": stats["gas_used_avg"],
+            "base_fee_gwei": stats["base_fee_gwei"],
+        }
@@ -0,0 +1,296 @@
+import math
+from collections import deque
+from typing import Any, Dict, Iterable, Optional
+import pandas as pd
+
+# Stateful indicators updated in O(1) per bar. Each one can be seeded from history, then fed one bar
+# at a time; to_state() returns plain JSON-serializable data and from_state() restores it, so the
+# state can be stored next to the cached bars and resumed without re-reading the history.
+
+class RollingStats:
+    """Mean and sample variance over the last `window` values (Welford's update with removal)."""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values: deque = deque()
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def seed(self, values: Iterable[float]) -> "RollingStats":
+        for value in values:
+            self.update(value)
+        return self
+
+    def update(self, value: float):
+        value = float(value)
+        if len(self.values) < self.window:
+            self.values.append(value)
+            delta = value - self.mean
+            self.mean += delta / len(self.values)
+            self._m2 += delta * (value - self.mean)
+        else:
+            old = self.values.popleft()
+            self.values.append(value)
+            old_mean = self.mean
+            self.mean += (value - old) / self.window
+            self._m2 += (value - old) * (value - self.mean + old - old_mean)
+        self._m2 = max(self._m2, 0.0)
+
+    def checkpoint(self) -> list:
+        """State before the next update, for revert(): the scalars and the value that update will evict."""
+        return [self.mean, self._m2, self.values[0] if len(self.values) == self.window else None]
+
+    def revert(self, checkpoint: list):
+        """Undo the one update made since `checkpoint` was taken."""
+        self.mean, self._m2, evicted = checkpoint
+        self.values.pop()
+        if evicted is not None:
+            self.values.appendleft(evicted)
+
+    @property
+    def ready(self) -> bool:
+        return len(self.values) == self.window
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (len(self.values) - 1) if len(self.values) > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def to_state(self) -> Dict[str, Any]:
+        return {"window": self.window, "values": list(self.values), "mean": self.mean, "m2": self._m2}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "RollingStats":
+        stats = cls(state["window"])
+        stats.values = deque(state["values"])
+        stats.mean, stats._m2 = state["mean"], state["m2"]
+        return stats
+
+
+class WilderRSI:
+    """Relative strength index with Wilder's smoothing: a simple average over the first `window`
+    changes, then avg = (avg * (window - 1) + change) / window."""
+
+    def __init__(self, window: int = 14):
+        self.window = window
+        self.prev_close: Optional[float] = None
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.count = 0  # price changes seen
+
+    def seed(self, closes: Iterable[float]) -> "WilderRSI":
+        for close in closes:
+            self.update(close)
+        return self
+
+    def update(self, close: float) -> Optional[float]:
+        close = float(close)
+        if self.prev_close is not None:
+            change = close - self.prev_close
+            gain, loss = max(change, 0.0), max(-change, 0.0)
+            self.count += 1
+            n = min(self.count, self.window)
+            self.avg_gain += (gain - self.avg_gain) / n
+            self.avg_loss += (loss - self.avg_loss) / n
+        self.prev_close = close
+        return self.value
+
+    def checkpoint(self) -> list:
+        return [self.prev_close, self.avg_gain, self.avg_loss, self.count]
+
+    def revert(self, checkpoint: list):
+        self.prev_close, self.avg_gain, self.avg_loss, self.count = checkpoint
+
+    @property
+    def value(self) -> Optional[float]:
+        if self.count < self.window:
+            return None
+        if self.avg_loss == 0:
+            return 100.0 if self.avg_gain > 0 else 50.0
+        return 100.0 - 100.0 / (1.0 + self.avg_gain / self.avg_loss)
+
+    def to_state(self) -> Dict[str, Any]:
+        return {"window": self.window, "prev_close": self.prev_close, "avg_gain": self.avg_gain,
+                "avg_loss": self.avg_loss, "count": self.count}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "WilderRSI":
+        rsi = cls(state["window"])
+        rsi.prev_close, rsi.avg_gain, rsi.avg_loss, rsi.count = (
+            state["prev_close"], state["avg_gain"], state["avg_loss"], state["count"])
+        return rsi
+
+
+class RollingVolatility:
+    """Annualized standard deviation of simple returns over the last `window` bars
+    (the last value of AnalyticsEngine.calculate_volatility)."""
+
+    def __init__(self, window: int = 21, periods_per_year: int = 252):
+        self.periods_per_year = periods_per_year
+        self.prev_close: Optional[float] = None
+        self.stats = RollingStats(window)
+
+    def seed(self, closes: Iterable[float]) -> "RollingVolatility":
+        for close in closes:
+            self.update(close)
+        return self
+
+    def update(self, close: float) -> Optional[float]:
+        close = float(close)
+        if self.prev_close:
+            self.stats.update(close / self.prev_close - 1.0)
+        self.prev_close = close
+        return self.value
+
+    def checkpoint(self) -> list:
+        # The window only moves when there is a previous close to take a return from
+        return [self.prev_close, self.stats.checkpoint() if self.prev_close else None]
+
+    def revert(self, checkpoint: list):
+        self.prev_close, stats = checkpoint
+        if stats is not None:
+            self.stats.revert(stats)
+
+    @property
+    def value(self) -> Optional[float]:
+        return self.stats.std * math.sqrt(self.periods_per_year) if self.stats.ready else None
+
+    def to_state(self) -> Dict[str, Any]:
+        return {"periods_per_year": self.periods_per_year, "prev_close": self.prev_close, "stats": self.stats.to_state()}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "RollingVolatility":
+        vol = cls(state["stats"]["window"], state["periods_per_year"])
+        vol.prev_close = state["prev_close"]
+        vol.stats = RollingStats.from_state(state["stats"])
+        return vol
+
+
+class VolumeZScore:
+    """Z-score of the latest volume against the rolling mean/std of the last `window` bars (the bar
+    included, as in AnalyticsEngine.detect_whale_activity); `is_whale` when it exceeds `threshold`."""
+
+    def __init__(self, window: int = 20, threshold: float = 2.0):
+        self.threshold = threshold
+        self.stats = RollingStats(window)
+        self.last: Optional[float] = None
+
+    def seed(self, volumes: Iterable[float]) -> "VolumeZScore":
+        for volume in volumes:
+            self.update(volume)
+        return self
+
+    def update(self, volume: float) -> Optional[float]:
+        self.last = float(volume)
+        self.stats.update(self.last)
+        return self.value
+
+    def checkpoint(self) -> list:
+        return [self.last, self.stats.checkpoint()]
+
+    def revert(self, checkpoint: list):
+        self.last, stats = checkpoint
+        self.stats.revert(stats)
+
+    @property
+    def value(self) -> Optional[float]:
+        if not self.stats.ready:
+            return None
+        std = self.stats.std
+        return (self.last - self.stats.mean) / std if std > 0 else 0.0
+
+    @property
+    def is_whale(self) -> bool:
+        z = self.value
+        return z is not None and z > self.threshold
+
+    def to_state(self) -> Dict[str, Any]:
+        return {"threshold": self.threshold, "last": self.last, "stats": self.stats.to_state()}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "VolumeZScore":
+        z = cls(state["stats"]["window"], state["threshold"])
+        z.last = state["last"]
+        z.stats = RollingStats.from_state(state["stats"])
+        return z
+
+
+class IndicatorSet:
+    """RSI, volatility and volume z-score of one symbol, kept current bar by bar.
+
+    `last_timestamp` records the newest bar applied, so catch_up(df) on a refreshed frame only
+    feeds the bars that arrived since. The newest bar may still be forming: a checkpoint from before
+    it is kept (scalars and the values it evicted from the rolling windows, so O(1) per bar), and a
+    bar with the same timestamp reverts it and is applied in its place instead of being applied twice.
+    """
+
+    def __init__(self, rsi_window: int = 14, vol_window: int = 21, volume_window: int = 20, whale_threshold: float = 2.0):
+        self.rsi = WilderRSI(rsi_window)
+        self.volatility = RollingVolatility(vol_window)
+        self.volume = VolumeZScore(volume_window, whale_threshold)
+        self.last_timestamp: Optional[pd.Timestamp] = None
+        self._committed: Optional[Dict[str, list]] = None  # component checkpoints from before the newest bar
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, **windows) -> "IndicatorSet":
+        return cls(**windows).catch_up(df)
+
+    def _components(self) -> Dict[str, Any]:
+        return {"rsi": self.rsi.to_state(), "volatility": self.volatility.to_state(), "volume": self.volume.to_state()}
+
+    def _restore(self, state: Dict[str, Any]):
+        self.rsi = WilderRSI.from_state(state["rsi"])
+        self.volatility = RollingVolatility.from_state(state["volatility"])
+        self.volume = VolumeZScore.from_state(state["volume"])
+
+    def _apply(self, close: float, volume: float, timestamp: Optional[pd.Timestamp]):
+        if timestamp is not None and timestamp == self.last_timestamp and self._committed is not None:
+            self.rsi.revert(self._committed["rsi"])
+            self.volatility.revert(self._committed["volatility"])
+            self.volume.revert(self._committed["volume"])
+        self._committed = {"rsi": self.rsi.checkpoint(), "volatility": self.volatility.checkpoint(),
+                           "volume": self.volume.checkpoint()}
+        self.rsi.update(close)
+        self.volatility.update(close)
+        self.volume.update(volume)
+        if timestamp is not None:
+            self.last_timestamp = timestamp
+
+    def update(self, close: float, volume: float, timestamp: Optional[pd.Timestamp] = None) -> Dict[str, Any]:
+        """Apply one bar; a bar with the same timestamp as the newest one revises it."""
+        self._apply(close, volume, pd.Timestamp(timestamp) if timestamp is not None else None)
+        return self.values()
+
+    def catch_up(self, df: pd.DataFrame) -> "IndicatorSet":
+        """Apply the bars of a canonical OHLCV frame from `last_timestamp` on (that bar is revised)."""
+        if self.last_timestamp is not None:
+            # Without the pre-bar state (state saved by an older version) the last bar cannot be revised
+            df = df[df.index >= self.last_timestamp] if self._committed is not None else df[df.index > self.last_timestamp]
+        if df.empty:
+            return self
+        for timestamp, close, volume in zip(df.index, df['close'].to_numpy(), df['volume'].to_numpy()):
+            self._apply(close, volume, timestamp)
+        return self
+
+    def values(self) -> Dict[str, Any]:
+        return {"rsi": self.rsi.value, "volatility": self.volatility.value,
+                "volume_z": self.volume.value, "whale": self.volume.is_whale}
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            **self._components(),
+            "committed": self._committed,
+            "last_timestamp": self.last_timestamp.isoformat() if self.last_timestamp is not None else None,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "IndicatorSet":
+        indicators = cls()
+        indicators._restore(state)
+        indicators._committed = state.get("committed")
+        if state.get("last_timestamp"):
+            indicators.last_timestamp = pd.Timestamp(state["last_timestamp"])
+        return indicators
@@ -0,0 +1,64 @@
+import time
+import threading
+from typing import Dict, Iterable, List
+
+class MarketRouter:
+    """Symbol -> exchange routing index built from loaded markets, with a negative cache."""
+
+    def __init__(self, exchange_order: List[str], negative_ttl: int = 3600):
+        self.exchange_order = list(exchange_order)
+        self.negative_ttl = negative_ttl
+        self._listings: Dict[str, frozenset] = {}  # exchange id -> listed symbols
+        self._preferred: Dict[str, str] = {}       # symbol -> venue that last served it
+        self._missing: Dict[str, float] = {}       # symbol -> negative cache expiry
+        self._lock = threading.Lock()
+
+    def register_markets(self, exchange_id: str, symbols: Iterable[str]):
+        """Index the symbols listed on an exchange (e.g. the keys of load_markets())."""
+        listed = frozenset(symbols)
+        with self._lock:
+            self._listings[exchange_id] = listed
+            # A fresh listing may contain symbols we previously gave up on
+            for symbol in [s for s in self._missing if s in listed]:
+                del self._missing[symbol]
+
+    def is_indexed(self, exchange_id: str) -> bool:
+        return exchange_id in self._listings
+
+    def route(self, symbol: str) -> List[str]:
+        """Ordered exchange ids worth trying for a symbol; empty if it is known to exist nowhere."""
+        with self._lock:
+            expiry = self._missing.get(symbol)
+            if expiry is not None:
+                if expiry > time.time():
+                    return []
+                del self._missing[symbol]
+
+            listed = [ex for ex in self.exchange_order if symbol in self._listings.get(ex, ())]
+            # Venues whose markets were never loaded cannot be ruled out, so they stay as fallbacks
+            unindexed = [ex for ex in self.exchange_order if ex not in self._listings]
+            candidates = listed + unindexed
+
+            preferred = self._preferred.get(symbol)
+            if preferred in candidates:
+                candidates.remove(preferred)
+                candidates.insert(0, preferred)
+
+            if not candidates:
+                self._missing[symbol] = time.time() + self.negative_ttl
+            return candidates
+
+    def record_success(self, symbol: str, exchange_id: str):
+        with self._lock:
+            self._preferred[symbol] = exchange_id
+            self._missing.pop(symbol, None)
+
+    def record_unlisted(self, symbol: str, exchange_id: str):
+        """The exchange rejected the symbol: stop preferring it there."""
+        with self._lock:
+            if self._preferred.get(symbol) == exchange_id:
+                del self._preferred[symbol]
+
+    def mark_missing(self, symbol: str):
+        with self._lock:
+            self._missing[symbol] = time.time() + self.negative_ttl
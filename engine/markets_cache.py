@@ -0,0 +1,105 @@
+import os
+import json
+import time
+import threading
+import ccxt
+from contextlib import nullcontext
+from typing import Dict, Any, Optional, Callable
+
+# Bump when the on-disk layout changes; files written by another version/CCXT release are ignored
+MARKETS_CACHE_VERSION = 1
+
+class MarketsCache:
+    """Disk cache of CCXT load_markets() payloads with TTL, version stamp and background refresh."""
+
+    def __init__(self, root: str = os.path.join("data_cache", "markets"), ttl: int = 6 * 3600, on_refresh: Optional[Callable] = None,
+                 load: Optional[Callable[[Any, bool], dict]] = None, background_context: Callable = nullcontext):
+        self.root = root
+        self.ttl = ttl
+        self.on_refresh = on_refresh  # called with the exchange after a background reload
+        # (exchange, reload) -> markets; DataProvider passes its rate-limited upstream call
+        self.load = load or (lambda exchange, reload: exchange.load_markets(reload))
+        self.background_context = background_context  # entered around background reloads
+        self._lock = threading.Lock()
+        self._refreshing = set()
+
+    def _path(self, exchange_id: str) -> str:
+        return os.path.join(self.root, f"{exchange_id}.json")
+
+    def read(self, exchange_id: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry ({'fetched_at', 'markets', 'currencies'}) or None if absent/incompatible."""
+        path = self._path(exchange_id)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except Exception as e:
+            print(f"Markets cache read error ({path}): {e}")
+            return None
+        if entry.get('version') != MARKETS_CACHE_VERSION or entry.get('ccxt') != ccxt.__version__:
+            return None
+        return entry
+
+    def write(self, exchange):
+        """Persist the markets currently loaded on a CCXT client."""
+        path = self._path(exchange.id)
+        entry = {
+            "version": MARKETS_CACHE_VERSION,
+            "ccxt": ccxt.__version__,
+            "exchange": exchange.id,
+            "fetched_at": time.time(),
+            "markets": exchange.markets,
+            "currencies": exchange.currencies,
+        }
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Markets cache write error ({path}): {e}")
+
+    def ensure(self, exchange, load_if_missing: bool = True) -> Optional[dict]:
+        """Give a CCXT client its markets, from disk when possible.
+
+        A stale cache entry is still used immediately and refreshed in the background.
+        Without any entry the markets are loaded synchronously (unless load_if_missing is False).
+        """
+        if exchange.markets:
+            return exchange.markets
+        with self._lock:
+            if exchange.markets:
+                return exchange.markets
+            entry = self.read(exchange.id)
+            if entry:
+                exchange.set_markets(entry['markets'], entry.get('currencies'))
+                if time.time() - entry['fetched_at'] > self.ttl:
+                    self.refresh_async(exchange)
+                return exchange.markets
+        if not load_if_missing:
+            return None
+        markets = self.load(exchange, False)
+        self.write(exchange)
+        return markets
+
+    def refresh_async(self, exchange):
+        """Reload an exchange's markets on a daemon thread and persist them."""
+        if exchange.id in self._refreshing:
+            return
+        self._refreshing.add(exchange.id)
+
+        def refresh():
+            try:
+                with self.background_context():
+                    self.load(exchange, True)
+                self.write(exchange)
+                if self.on_refresh:
+                    self.on_refresh(exchange)
+            except Exception as e:
+                print(f"Markets refresh error ({exchange.id}): {e}")
+            finally:
+                self._refreshing.discard(exchange.id)
+
+        threading.Thread(target=refresh, name=f"markets-refresh-{exchange.id}", daemon=True).start()
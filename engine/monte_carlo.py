@@ -0,0 +1,135 @@
+import numpy as np
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+TRADING_DAYS = 252
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+# Half-width of the histogram range used for streamed bands, in standard deviations of the log-return
+BAND_SIGMAS = 8
+
+class MonteCarloEngine:
+    """Vectorized geometric Brownian motion simulator.
+
+    Shocks are drawn in batches from a seeded numpy Generator, so a run is reproducible for a given
+    (seed, chunk_size). Paths are produced in chunks of `chunk_size` rows to bound peak memory, and
+    antithetic variates (each shock also used with its sign flipped) halve the draws and reduce the
+    variance of estimated means. mu and sigma are annualized; one step is one trading day.
+    """
+
+    def __init__(self, seed: Optional[int] = None, chunk_size: int = 20_000, dtype=np.float64):
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.dtype = dtype
+
+    def _shocks(self, rng: np.random.Generator, rows: int, steps: int, antithetic: bool) -> np.ndarray:
+        if not antithetic:
+            return rng.standard_normal((rows, steps), dtype=self.dtype)
+        half = rng.standard_normal(((rows + 1) // 2, steps), dtype=self.dtype)
+        return np.concatenate([half, -half])[:rows]
+
+    def _iter_log_chunks(self, days: int, mu: float, sigma: float, simulations: int,
+                         antithetic: bool) -> Iterator[np.ndarray]:
+        """Cumulative log-returns, (rows, days) per chunk with column 0 at zero."""
+        rng = np.random.default_rng(self.seed)
+        dt = 1.0 / TRADING_DAYS
+        drift = (mu - 0.5 * sigma ** 2) * dt
+        vol = sigma * np.sqrt(dt)
+        for start in range(0, simulations, self.chunk_size):
+            rows = min(self.chunk_size, simulations - start)
+            log_paths = np.empty((rows, days), dtype=self.dtype)
+            log_paths[:, 0] = 0.0
+            if days > 1:
+                # Log-returns accumulate in place: x_t = sum(drift + vol * z)
+                log_steps = self._shocks(rng, rows, days - 1, antithetic)
+                log_steps *= vol
+                log_steps += drift
+                np.cumsum(log_steps, axis=1, out=log_paths[:, 1:])
+            yield log_paths
+
+    def iter_chunks(self, initial_price: float, days: int, mu: float, sigma: float, simulations: int,
+                    antithetic: bool = False) -> Iterator[np.ndarray]:
+        """Yield (rows, days) price-path blocks whose rows add up to `simulations`; column 0 is the initial price."""
+        for paths in self._iter_log_chunks(days, mu, sigma, simulations, antithetic):
+            np.exp(paths, out=paths)
+            paths *= initial_price
+            yield paths
+
+    def simulate_paths(self, initial_price: float, days: int, mu: float, sigma: float, simulations: int,
+                       antithetic: bool = False) -> np.ndarray:
+        """Full (simulations, days) path matrix."""
+        out = np.empty((simulations, days), dtype=self.dtype)
+        row = 0
+        for chunk in self.iter_chunks(initial_price, days, mu, sigma, simulations, antithetic):
+            out[row:row + len(chunk)] = chunk
+            row += len(chunk)
+        return out
+
+    def percentile_bands(self, initial_price: float, days: int, mu: float, sigma: float, simulations: int,
+                         percentiles: Sequence[float] = DEFAULT_PERCENTILES, antithetic: bool = True,
+                         terminal_bins: int = 64) -> Dict[str, np.ndarray]:
+        """Per-day price percentiles ({'p5': array(days), ...}), the mean path and a terminal-price histogram.
+
+        Chunks are folded into a StreamingQuantiles reducer over log-returns and discarded, so memory
+        is O(days) whatever the path count. Bins span +/- BAND_SIGMAS standard deviations around the
+        GBM drift of each day; 'terminal_edges' / 'terminal_counts' describe the last day's distribution.
+        """
+        t = np.arange(days) / TRADING_DAYS
+        center = (mu - 0.5 * sigma ** 2) * t
+        spread = np.maximum(BAND_SIGMAS * sigma * np.sqrt(t), 1e-9)
+        reducer = StreamingQuantiles(center - spread, center + spread)
+        total = np.zeros(days)
+        for log_paths in self._iter_log_chunks(days, mu, sigma, simulations, antithetic):
+            reducer.update(log_paths)
+            total += np.exp(log_paths).sum(axis=0)
+
+        quantiles = initial_price * np.exp(reducer.quantiles(np.asarray(percentiles) / 100.0))
+        bands = {f"p{p:g}": band for p, band in zip(percentiles, quantiles)}
+        bands["mean"] = initial_price * total / max(simulations, 1)
+        edges, counts = reducer.histogram(days - 1, terminal_bins)
+        bands["terminal_edges"] = initial_price * np.exp(edges)
+        bands["terminal_counts"] = counts
+        return bands
+
+
+class StreamingQuantiles:
+    """Column-wise quantiles of a stream of (rows, columns) blocks, from fixed-range histograms.
+
+    Each column gets `bins` equal-width bins between lo[c] and hi[c]; values outside are counted in
+    the edge bins. Memory is columns * bins counters regardless of how many rows are fed, and
+    quantiles are interpolated linearly inside a bin, so the error is under one bin width.
+    """
+
+    def __init__(self, lo: np.ndarray, hi: np.ndarray, bins: int = 4096):
+        self.lo = np.asarray(lo, dtype=np.float64)
+        self.hi = np.asarray(hi, dtype=np.float64)
+        self.bins = bins
+        self.width = (self.hi - self.lo) / bins
+        self.counts = np.zeros((len(self.lo), bins), dtype=np.int64)
+        self.count = 0
+        self._offsets = np.arange(len(self.lo)) * bins
+
+    def update(self, block: np.ndarray):
+        idx = ((block - self.lo) / self.width).astype(np.int64)
+        np.clip(idx, 0, self.bins - 1, out=idx)
+        idx += self._offsets
+        self.counts += np.bincount(idx.ravel(), minlength=self.counts.size).reshape(self.counts.shape)
+        self.count += len(block)
+
+    def quantiles(self, qs: Sequence[float]) -> np.ndarray:
+        """(len(qs), columns) array of quantiles, qs in [0, 1]."""
+        cdf = np.cumsum(self.counts, axis=1)
+        rows = np.arange(len(self.lo))
+        out = np.empty((len(qs), len(self.lo)))
+        for i, q in enumerate(qs):
+            target = q * self.count
+            j = np.minimum((cdf < target).sum(axis=1), self.bins - 1)
+            before = np.where(j > 0, cdf[rows, j - 1], 0)
+            inside = np.maximum(self.counts[rows, j], 1)
+            frac = np.clip((target - before) / inside, 0.0, 1.0)
+            out[i] = self.lo + (j + frac) * self.width
+        return out
+
+    def histogram(self, column: int, bins: int = 64) -> Tuple[np.ndarray, np.ndarray]:
+        """(edges, counts) for one column, merged down to `bins` bins (must divide the reducer's bin count)."""
+        counts = self.counts[column].reshape(bins, -1).sum(axis=1)
+        edges = np.linspace(self.lo[column], self.hi[column], bins + 1)
+        return edges, counts
@@ -0,0 +1,69 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+from typing import Optional
+from .schema import OHLCV_COLUMNS, normalize_ohlcv
+
+class OHLCVStore:
+    """On-disk Parquet store for OHLCV bars, one file per exchange/symbol/timeframe."""
+
+    def __init__(self, root: str = os.path.join("data_cache", "ohlcv"), dtype=np.float64):
+        self.root = root
+        self.dtype = dtype  # float32 halves disk and memory for long histories
+        self._lock = threading.Lock()
+
+    def _path(self, exchange: str, symbol: str, timeframe: str) -> str:
+        # BTC/USDT:USDT -> BTC_USDT-USDT (keeps file names portable on Windows)
+        safe_symbol = symbol.replace("/", "_").replace(":", "-")
+        return os.path.join(self.root, exchange, f"{safe_symbol}_{timeframe}.parquet")
+
+    def has(self, exchange: str, symbol: str, timeframe: str) -> bool:
+        return os.path.exists(self._path(exchange, symbol, timeframe))
+
+    def load(self, exchange: str, symbol: str, timeframe: str) -> pd.DataFrame:
+        """Return the stored bars in the canonical OHLCV schema (empty if none)."""
+        path = self._path(exchange, symbol, timeframe)
+        if not os.path.exists(path):
+            return normalize_ohlcv(None, self.dtype)
+        try:
+            # Files written before the schema was fixed have naive timestamps; normalizing reads them as UTC
+            return normalize_ohlcv(pd.read_parquet(path), self.dtype)
+        except Exception as e:
+            print(f"OHLCV Store read error ({path}): {e}")
+            return normalize_ohlcv(None, self.dtype)
+
+    def last_timestamp(self, exchange: str, symbol: str, timeframe: str) -> Optional[int]:
+        """Millisecond timestamp of the newest stored bar, if any."""
+        df = self.load(exchange, symbol, timeframe)
+        if df.empty:
+            return None
+        return int(df.index[-1].timestamp() * 1000)
+
+    def append(self, exchange: str, symbol: str, timeframe: str, new_bars: pd.DataFrame) -> pd.DataFrame:
+        """Merge new bars into the stored series and persist it. Returns the merged frame."""
+        with self._lock:
+            stored = self.load(exchange, symbol, timeframe)
+            if new_bars.empty:
+                return stored
+            new_bars = normalize_ohlcv(new_bars, self.dtype)
+            # The newest bar of a previous fetch is usually still forming: the latest copy wins
+            merged = normalize_ohlcv(pd.concat([stored, new_bars]), self.dtype) if not stored.empty else new_bars
+
+            path = self._path(exchange, symbol, timeframe)
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.tmp"
+                merged.to_parquet(tmp_path)
+                os.replace(tmp_path, path)
+            except Exception as e:
+                print(f"OHLCV Store write error ({path}): {e}")
+            return merged
+
+    @staticmethod
+    def ohlcv_to_frame(ohlcv: list) -> pd.DataFrame:
+        """Convert a raw CCXT OHLCV list into the canonical frame layout."""
+        df = pd.DataFrame(ohlcv, columns=['timestamp'] + OHLCV_COLUMNS)
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms', utc=True)
+        df.set_index('timestamp', inplace=True)
+        return normalize_ohlcv(df)
@@ -0,0 +1,288 @@
+import json
+import time
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left, insort
+from collections import deque
+from typing import Callable, Dict, Any, Iterator, List, Optional
+
+class LocalOrderBook:
+    """In-memory L2 book maintained from a snapshot plus diff updates (price -> size, 0 deletes)."""
+
+    def __init__(self):
+        self.bids: Dict[float, float] = {}
+        self.asks: Dict[float, float] = {}
+        # Sorted price ladders; bids are stored negated so index 0 is always the best level
+        self._bid_prices: List[float] = []
+        self._ask_prices: List[float] = []
+        self.update_id = 0
+        self.updated_at = 0.0
+
+    def apply_snapshot(self, bids: list, asks: list, update_id: int):
+        self.bids = {float(p): float(q) for p, q, *_ in bids if float(q) > 0}
+        self.asks = {float(p): float(q) for p, q, *_ in asks if float(q) > 0}
+        self._bid_prices = sorted(-p for p in self.bids)
+        self._ask_prices = sorted(self.asks)
+        self.update_id = update_id
+        self.updated_at = time.time()
+
+    def apply_diff(self, bids: list, asks: list, update_id: int):
+        for price, qty, *_ in bids:
+            self._set_level(self.bids, self._bid_prices, -float(price), float(price), float(qty))
+        for price, qty, *_ in asks:
+            self._set_level(self.asks, self._ask_prices, float(price), float(price), float(qty))
+        self.update_id = update_id
+        self.updated_at = time.time()
+
+    @staticmethod
+    def _set_level(levels: Dict[float, float], ladder: List[float], key: float, price: float, qty: float):
+        if qty > 0:
+            if price not in levels:
+                insort(ladder, key)
+            levels[price] = qty
+        elif price in levels:
+            del levels[price]
+            ladder.pop(bisect_left(ladder, key))
+
+    def top(self, depth: int = 10) -> Dict[str, list]:
+        """Best `depth` levels per side in CCXT order-book layout."""
+        return {
+            "bids": [[-k, self.bids[-k]] for k in self._bid_prices[:depth]],
+            "asks": [[k, self.asks[k]] for k in self._ask_prices[:depth]],
+            "nonce": self.update_id,
+            "timestamp": int(self.updated_at * 1000),
+        }
+
+    def mid(self) -> Optional[float]:
+        if not self._bid_prices or not self._ask_prices:
+            return None
+        return (-self._bid_prices[0] + self._ask_prices[0]) / 2
+
+    def imbalance(self, depth: int = 10) -> float:
+        """Bid/ask size ratio over the top `depth` levels (same measure as AnalyticsEngine.analyze_order_imbalance)."""
+        bid_vol = sum(self.bids[-k] for k in self._bid_prices[:depth])
+        ask_vol = sum(self.asks[k] for k in self._ask_prices[:depth])
+        return bid_vol / ask_vol if ask_vol > 0 else 1.0
+
+
+# --- Transports ---
+class BookTransport(ABC):
+    """Source of order-book snapshots and diff messages.
+
+    Diff messages follow Binance's depthUpdate layout:
+    {"U": first_update_id, "u": final_update_id, "b": [[price, qty], ...], "a": [[price, qty], ...]}
+    """
+    reconnect = True  # re-open the stream when it ends
+
+    @abstractmethod
+    def snapshot(self, symbol: str, limit: int) -> Dict[str, Any]:
+        """Full book with 'bids', 'asks' and the 'nonce' (last update id) it reflects."""
+        pass
+
+    @abstractmethod
+    def stream(self, symbol: str) -> Iterator[Dict[str, Any]]:
+        """Yield diff messages for a symbol until the connection ends."""
+        pass
+
+
+class BinanceDepthTransport(BookTransport):
+    """Binance spot diff-depth websocket with REST snapshots through a CCXT client.
+
+    `call(exchange, method, *args, **kwargs)` performs the snapshot request; DataProvider passes its
+    rate-limited exchange call so deep snapshots are paced with every other Binance request.
+    """
+
+    def __init__(self, exchange, ws_url: str = "wss://stream.binance.com:9443/ws", call: Optional[Callable] = None):
+        self.exchange = exchange
+        self.ws_url = ws_url
+        self.call = call or (lambda exchange, method, *args, **kwargs: getattr(exchange, method)(*args, **kwargs))
+
+    def snapshot(self, symbol: str, limit: int) -> Dict[str, Any]:
+        return self.call(self.exchange, "fetch_order_book", symbol, limit=limit)
+
+    def stream(self, symbol: str) -> Iterator[Dict[str, Any]]:
+        try:
+            from websockets.sync.client import connect
+        except ImportError:
+            raise ImportError("websockets is not installed. Run 'pip install websockets'.")
+
+        stream_name = symbol.replace("/", "").lower()
+        with connect(f"{self.ws_url}/{stream_name}@depth@100ms") as ws:
+            for raw in ws:
+                yield json.loads(raw)
+
+
+class ReplayTransport(BookTransport):
+    """Serves a canned snapshot and diff sequence, e.g. recorded messages or a local stand-in feed."""
+    reconnect = False
+
+    def __init__(self, snapshots: Dict[str, Dict[str, Any]], messages: Dict[str, List[Dict[str, Any]]], delay: float = 0.0):
+        self.snapshots = snapshots
+        self.messages = messages
+        self.delay = delay
+
+    def snapshot(self, symbol: str, limit: int) -> Dict[str, Any]:
+        return self.snapshots[symbol]
+
+    def stream(self, symbol: str) -> Iterator[Dict[str, Any]]:
+        for msg in self.messages.get(symbol, []):
+            if self.delay:
+                time.sleep(self.delay)
+            yield msg
+
+
+# --- Engine ---
+class _Subscription:
+    def __init__(self, symbol: str, history_size: int):
+        self.symbol = symbol
+        self.book = LocalOrderBook()
+        self.lock = threading.Lock()
+        self.history = deque(maxlen=history_size)
+        self.ready = threading.Event()
+        self.stopped = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+        self.last_used = time.time()
+
+
+class OrderBookEngine:
+    """Keeps a live local book per subscribed symbol, fed by a BookTransport on a background thread.
+
+    A book is only ready while its stream is in sequence: a gap, a stream error or a reconnect clears
+    it until the next snapshot. Subscriptions nobody has read or renewed for `idle_timeout` seconds are
+    closed, and beyond `max_subscriptions` the least recently used ones are.
+    """
+
+    def __init__(self, transport: BookTransport, snapshot_depth: int = 1000, history_size: int = 3600, imbalance_depth: int = 10,
+                 max_subscriptions: int = 20, idle_timeout: float = 300.0):
+        self.transport = transport
+        self.snapshot_depth = snapshot_depth
+        self.history_size = history_size
+        self.imbalance_depth = imbalance_depth
+        self.max_subscriptions = max_subscriptions
+        self.idle_timeout = idle_timeout
+        self._subs: Dict[str, _Subscription] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, symbol: str) -> bool:
+        """Start maintaining a book for a symbol. Returns False if it was already subscribed (which renews it)."""
+        with self._lock:
+            sub = self._subs.get(symbol)
+            if sub:
+                sub.last_used = time.time()
+                created = False
+            else:
+                sub = _Subscription(symbol, self.history_size)
+                sub.thread = threading.Thread(target=self._run, args=(sub,), name=f"orderbook-{symbol}", daemon=True)
+                self._subs[symbol] = sub
+                created = True
+            evicted = self._evict()
+        for old in evicted:
+            old.stopped.set()
+        if created:
+            sub.thread.start()
+        return created
+
+    def _evict(self) -> List[_Subscription]:
+        # Caller holds self._lock
+        now = time.time()
+        by_use = sorted(self._subs.values(), key=lambda sub: sub.last_used)
+        excess = len(by_use) - self.max_subscriptions
+        evicted = [sub for i, sub in enumerate(by_use) if i < excess or now - sub.last_used > self.idle_timeout]
+        for sub in evicted:
+            del self._subs[sub.symbol]
+        return evicted
+
+    def _use(self, symbol: str) -> Optional[_Subscription]:
+        sub = self._subs.get(symbol)
+        if sub:
+            sub.last_used = time.time()
+        return sub
+
+    def symbols(self) -> List[str]:
+        return list(self._subs)
+
+    def unsubscribe(self, symbol: str):
+        with self._lock:
+            sub = self._subs.pop(symbol, None)
+        if sub:
+            sub.stopped.set()
+
+    def stop(self):
+        for symbol in list(self._subs):
+            self.unsubscribe(symbol)
+
+    def is_ready(self, symbol: str, max_age: Optional[float] = None) -> bool:
+        """True if the book is in sync (and, with `max_age`, received an update within that many seconds)."""
+        sub = self._use(symbol)
+        if not sub or not sub.ready.is_set():
+            return False
+        return max_age is None or time.time() - sub.book.updated_at <= max_age
+
+    def wait_ready(self, symbol: str, timeout: float = None) -> bool:
+        sub = self._subs.get(symbol)
+        return bool(sub and sub.ready.wait(timeout))
+
+    def _run(self, sub: _Subscription):
+        backoff = 1.0
+        while not sub.stopped.is_set():
+            try:
+                synced = False
+                for msg in self.transport.stream(sub.symbol):
+                    if sub.stopped.is_set():
+                        return
+                    if not synced:
+                        # Snapshot after the stream is open so no diff between the two is lost
+                        snap = self.transport.snapshot(sub.symbol, self.snapshot_depth)
+                        with sub.lock:
+                            sub.book.apply_snapshot(snap['bids'], snap['asks'], int(snap.get('nonce') or 0))
+                        synced = True
+                    if msg['u'] <= sub.book.update_id:
+                        continue  # already contained in the snapshot
+                    if msg['U'] > sub.book.update_id + 1:
+                        # Sequence gap: the book is wrong until rebuilt from a fresh snapshot on the next message
+                        sub.ready.clear()
+                        synced = False
+                        continue
+                    with sub.lock:
+                        sub.book.apply_diff(msg.get('b', []), msg.get('a', []), msg['u'])
+                        sub.history.append({"ts": sub.book.updated_at, "mid": sub.book.mid(), "imbalance": sub.book.imbalance(self.imbalance_depth)})
+                    sub.ready.set()
+                    backoff = 1.0
+                if not self.transport.reconnect:
+                    return  # end of a finite feed: its final book stays readable
+            except Exception as e:
+                print(f"Order book stream error for {sub.symbol}: {e}")
+            # Disconnected: no diffs arrive until the stream is back and re-snapshotted
+            sub.ready.clear()
+            sub.stopped.wait(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+    # --- Snapshot-free reads ---
+    def top(self, symbol: str, depth: int = 10) -> Dict[str, list]:
+        sub = self._use(symbol)
+        if not sub or not sub.ready.is_set():
+            return {}
+        with sub.lock:
+            return sub.book.top(depth)
+
+    def mid(self, symbol: str) -> Optional[float]:
+        sub = self._use(symbol)
+        if not sub or not sub.ready.is_set():
+            return None
+        with sub.lock:
+            return sub.book.mid()
+
+    def imbalance(self, symbol: str, depth: int = 10) -> Optional[float]:
+        sub = self._use(symbol)
+        if not sub or not sub.ready.is_set():
+            return None
+        with sub.lock:
+            return sub.book.imbalance(depth)
+
+    def history(self, symbol: str) -> List[Dict[str, Any]]:
+        """Recent (ts, mid, imbalance) samples, oldest first, bounded by history_size."""
+        sub = self._use(symbol)
+        if not sub:
+            return []
+        with sub.lock:
+            return list(sub.history)
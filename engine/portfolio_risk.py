@@ -0,0 +1,184 @@
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+DEFAULT_HORIZONS = (1, 5, 10, 21)
+DEFAULT_CONFIDENCE = (0.95, 0.99)
+
+def aligned_log_returns(frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Daily log-returns of each asset's close on the dates every asset has a bar for.
+
+    Bars are keyed by UTC calendar day, so crypto (00:00 UTC) and exchange-traded series (session
+    timestamps) line up; days missing for any asset (e.g. weekends for macro) are dropped.
+    """
+    closes = {}
+    for ticker, df in frames.items():
+        if df is None or df.empty:
+            continue
+        close = df['close'].astype(np.float64)
+        close.index = close.index.normalize()
+        closes[ticker] = close[~close.index.duplicated(keep='last')]
+    if not closes:
+        return pd.DataFrame()
+    aligned = pd.concat(closes, axis=1, join='inner').dropna()
+    return np.log(aligned).diff().dropna()
+
+def _factor(cov: np.ndarray) -> np.ndarray:
+    """A matrix A with A @ A.T == cov: Cholesky, or an eigen factor if cov is only semi-definite."""
+    try:
+        return np.linalg.cholesky(cov)
+    except np.linalg.LinAlgError:
+        values, vectors = np.linalg.eigh(cov)
+        return vectors * np.sqrt(np.clip(values, 0.0, None))
+
+def _limit_blas_threads():
+    # One BLAS thread per worker process, otherwise the pool oversubscribes the cores
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(1)
+    except ImportError:
+        pass
+
+def _simulate_chunk(mu: np.ndarray, factor: np.ndarray, weights: np.ndarray, horizons: Sequence[int],
+                    rows: int, seed: np.random.SeedSequence) -> np.ndarray:
+    """Portfolio simple returns, (rows, len(horizons)), for one chunk of correlated paths.
+
+    Log-returns are i.i.d. normal per day, so the path only needs sampling at the horizons: each step
+    adds the increment over (previous horizon, horizon], with mean dt * mu and covariance dt * cov.
+    """
+    rng = np.random.default_rng(seed)
+    out = np.empty((rows, len(horizons)))
+    cumulative = np.zeros((rows, len(mu)))
+    previous = 0
+    for k, horizon in enumerate(horizons):
+        dt = horizon - previous
+        shocks = rng.standard_normal((rows, len(mu)))
+        cumulative += np.sqrt(dt) * (shocks @ factor.T) + dt * mu
+        out[:, k] = np.expm1(cumulative) @ weights
+        previous = horizon
+    return out
+
+def _simulate_chunks(mu: np.ndarray, factor: np.ndarray, weights: np.ndarray, horizons: Sequence[int],
+                     chunks: Sequence[Tuple[int, np.random.SeedSequence]]) -> np.ndarray:
+    """Several chunks in one task, stacked in order (one pool round-trip instead of one per chunk)."""
+    return np.vstack([_simulate_chunk(mu, factor, weights, horizons, n, s) for n, s in chunks])
+
+
+class PortfolioRiskEngine:
+    """Correlated multi-asset Monte Carlo for portfolio VaR / CVaR.
+
+    The return covariance is estimated from aligned daily history and factored once (Cholesky);
+    paths are simulated in small vectorized chunks, grouped into a few tasks per worker of a process
+    pool. Chunk seeds are spawned from one SeedSequence, so results depend on (seed, chunk_size) but
+    not on the worker count. The pool is created on first use and kept for the life of the engine.
+
+    Seeded results are memoized per basket (tickers and their last bar timestamp), so a Streamlit
+    rerun with no new bar does not re-run the simulation.
+    """
+
+    def __init__(self, workers: Optional[int] = None, chunk_size: int = 4_096, tasks_per_worker: int = 2,
+                 max_cached: int = 16):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.tasks_per_worker = tasks_per_worker
+        self.max_cached = max_cached
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._results: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # forkserver/spawn: forking the threaded Streamlit process could copy held locks
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                                 initializer=_limit_blas_threads)
+            return self._pool
+
+    def close(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+                self._pool = None
+
+    def _run(self, mu, factor, weights, horizons, simulations, seed) -> np.ndarray:
+        sizes = [min(self.chunk_size, simulations - start) for start in range(0, simulations, self.chunk_size)]
+        chunks = list(zip(sizes, np.random.SeedSequence(seed).spawn(len(sizes))))
+        if self.workers <= 1 or len(chunks) <= 1:
+            return _simulate_chunks(mu, factor, weights, horizons, chunks)
+        # Contiguous groups keep the output order (and so the result) independent of the task count
+        tasks = min(len(chunks), self.workers * self.tasks_per_worker)
+        bounds = np.linspace(0, len(chunks), tasks + 1).astype(int)
+        try:
+            pool = self._executor()
+            futures = [pool.submit(_simulate_chunks, mu, factor, weights, horizons, chunks[a:b])
+                       for a, b in zip(bounds[:-1], bounds[1:])]
+            return np.vstack([f.result() for f in futures])
+        except (BrokenProcessPool, OSError) as e:
+            print(f"Portfolio simulation pool error, running in-process: {e}")
+            self.close()
+            return _simulate_chunks(mu, factor, weights, horizons, chunks)
+
+    def simulate(self, frames: Dict[str, pd.DataFrame], weights: Optional[Dict[str, float]] = None,
+                 horizons: Sequence[int] = DEFAULT_HORIZONS, confidence: Sequence[float] = DEFAULT_CONFIDENCE,
+                 simulations: int = 100_000, seed: Optional[int] = None, min_history: int = 30) -> pd.DataFrame:
+        """Portfolio VaR and CVaR per horizon (trading days), as positive loss fractions of the value.
+
+        `frames` maps ticker -> OHLCV frame; `weights` defaults to an equal-weight basket and is
+        normalized to sum to 1. Returns one row per horizon with 'VaR 95%' / 'CVaR 95%' style columns,
+        or an empty frame when fewer than `min_history` aligned returns are available.
+        """
+        key = None
+        if seed is not None:
+            basket = tuple(sorted((t, df.index[-1]) for t, df in frames.items() if df is not None and not df.empty))
+            key = (basket, tuple(sorted((weights or {}).items())), tuple(horizons), tuple(confidence),
+                   simulations, seed, min_history, self.chunk_size)
+            with self._lock:
+                if key in self._results:
+                    self._results.move_to_end(key)
+                    return self._results[key].copy()
+        result = self._simulate(frames, weights, horizons, confidence, simulations, seed, min_history)
+        if key is not None:
+            with self._lock:
+                self._results[key] = result
+                while len(self._results) > self.max_cached:
+                    self._results.popitem(last=False)
+            result = result.copy()
+        return result
+
+    def _simulate(self, frames, weights, horizons, confidence, simulations, seed, min_history) -> pd.DataFrame:
+        returns = aligned_log_returns(frames)
+        if len(returns) < min_history:
+            return pd.DataFrame()
+        tickers: List[str] = list(returns.columns)
+        w = np.array([(weights or {}).get(t, 1.0) for t in tickers], dtype=np.float64)
+        w /= w.sum()
+        horizons = sorted(set(int(h) for h in horizons))
+
+        mu = returns.mean().to_numpy()
+        factor = _factor(np.atleast_2d(returns.cov().to_numpy()))
+        pnl = self._run(mu, factor, w, horizons, simulations, seed)
+
+        rows = []
+        for k, horizon in enumerate(horizons):
+            losses = np.sort(-pnl[:, k])
+            row = {"Horizon (days)": horizon}
+            for level in confidence:
+                var, cvar = self._var_cvar(losses, level)
+                row[f"VaR {level:.0%}"] = var
+                row[f"CVaR {level:.0%}"] = cvar
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+    @staticmethod
+    def _var_cvar(sorted_losses: np.ndarray, level: float) -> Tuple[float, float]:
+        """VaR = the `level` quantile of the loss; CVaR = mean loss at or beyond it."""
+        cut = min(int(np.floor(level * len(sorted_losses))), len(sorted_losses) - 1)
+        return float(sorted_losses[cut]), float(sorted_losses[cut:].mean())
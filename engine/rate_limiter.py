@@ -0,0 +1,178 @@
+import time
+import asyncio
+import heapq
+import itertools
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, Any, Tuple
+
+INTERACTIVE = 0
+BACKGROUND = 1
+
+_priority = contextvars.ContextVar("kitsune_request_priority", default=INTERACTIVE)
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, cost: float = 1.0) -> float:
+        """Seconds until `cost` tokens are available (0 if they are now)."""
+        self._refill()
+        if self.tokens >= cost:
+            return 0.0
+        return (cost - self.tokens) / self.rate
+
+    def consume(self, cost: float = 1.0):
+        self._refill()
+        self.tokens -= cost
+
+
+class _Upstream:
+    def __init__(self, rate: float, capacity: float):
+        self.bucket = TokenBucket(rate, capacity)
+        self.cond = threading.Condition()
+        self.queue = []  # heap of (priority, seq)
+        self.granted = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.waits_by_priority = {INTERACTIVE: [0, 0.0], BACKGROUND: [0, 0.0]}
+
+
+class RateScheduler:
+    """Central per-upstream token-bucket scheduler; interactive requests are served before background ones."""
+
+    # (requests per second, burst) per upstream, kept under each venue's published limits
+    DEFAULT_LIMITS: Dict[str, Tuple[float, float]] = {
+        "binance": (20.0, 40.0),
+        "mexc": (10.0, 20.0),
+        "gateio": (10.0, 20.0),
+        "yahoo": (2.0, 5.0),
+        "geckoterminal": (0.5, 5.0),  # public API: 30 calls/minute
+        "rpc": (10.0, 20.0),
+    }
+
+    def __init__(self, limits: Dict[str, Tuple[float, float]] = None):
+        self.limits = dict(self.DEFAULT_LIMITS)
+        self.limits.update(limits or {})
+        self._upstreams: Dict[str, _Upstream] = {}
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+
+    def _get(self, upstream: str) -> _Upstream:
+        with self._lock:
+            if upstream not in self._upstreams:
+                rate, capacity = self.limits.get(upstream, (5.0, 10.0))
+                self._upstreams[upstream] = _Upstream(rate, capacity)
+            return self._upstreams[upstream]
+
+    def acquire(self, upstream: str, cost: float = 1.0, priority: int = None):
+        """Block until the upstream's bucket grants `cost` tokens to this caller.
+
+        A cost above the bucket's burst capacity is charged as a full bucket (it could never be granted otherwise).
+        """
+        if priority is None:
+            priority = _priority.get()
+        state = self._get(upstream)
+        cost = min(cost, state.bucket.capacity)
+        entry = (priority, next(self._seq))
+        start = time.monotonic()
+        with state.cond:
+            heapq.heappush(state.queue, entry)
+            while True:
+                if state.queue[0] == entry:
+                    wait = state.bucket.wait_time(cost)
+                    if wait <= 0:
+                        state.bucket.consume(cost)
+                        heapq.heappop(state.queue)
+                        break
+                    state.cond.wait(wait)
+                else:
+                    state.cond.wait()
+            self._granted(state, priority, time.monotonic() - start)
+
+    async def acquire_async(self, upstream: str, cost: float = 1.0, priority: int = None):
+        """acquire() for coroutines: same buckets and queue, but waits on the event loop instead of blocking it.
+
+        Waiting coroutines sleep until their tokens could be available (5 ms at least) and re-check;
+        blocked threads are woken by every grant, so both kinds of caller share one priority order.
+        """
+        if priority is None:
+            priority = _priority.get()
+        state = self._get(upstream)
+        cost = min(cost, state.bucket.capacity)
+        entry = (priority, next(self._seq))
+        start = time.monotonic()
+        with state.cond:
+            heapq.heappush(state.queue, entry)
+        try:
+            while True:
+                with state.cond:
+                    wait = state.bucket.wait_time(cost)
+                    if state.queue[0] == entry and wait <= 0:
+                        state.bucket.consume(cost)
+                        heapq.heappop(state.queue)
+                        self._granted(state, priority, time.monotonic() - start)
+                        return
+                await asyncio.sleep(max(wait, 0.005))
+        except asyncio.CancelledError:
+            with state.cond:
+                if entry in state.queue:
+                    state.queue.remove(entry)
+                    heapq.heapify(state.queue)
+                state.cond.notify_all()
+            raise
+
+    @staticmethod
+    def _granted(state: _Upstream, priority: int, waited: float):
+        # Caller holds state.cond
+        state.granted += 1
+        state.total_wait += waited
+        state.max_wait = max(state.max_wait, waited)
+        stats = state.waits_by_priority.setdefault(priority, [0, 0.0])
+        stats[0] += 1
+        stats[1] += waited
+        # Let the next caller in line re-check the bucket
+        state.cond.notify_all()
+
+    @staticmethod
+    @contextmanager
+    def background():
+        """Run the enclosed requests at background priority (shadow agents, pollers, refreshes)."""
+        token = _priority.set(BACKGROUND)
+        try:
+            yield
+        finally:
+            _priority.reset(token)
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Queue depth and wait-time statistics per upstream."""
+        report = {}
+        with self._lock:
+            upstreams = dict(self._upstreams)
+        for name, state in upstreams.items():
+            with state.cond:
+                report[name] = {
+                    "queue_depth": len(state.queue),
+                    "granted": state.granted,
+                    "avg_wait_ms": 1000 * state.total_wait / state.granted if state.granted else 0.0,
+                    "max_wait_ms": 1000 * state.max_wait,
+                    "interactive_avg_wait_ms": self._avg_ms(state.waits_by_priority.get(INTERACTIVE)),
+                    "background_avg_wait_ms": self._avg_ms(state.waits_by_priority.get(BACKGROUND)),
+                    "tokens": round(state.bucket.tokens, 2),
+                }
+        return report
+
+    @staticmethod
+    def _avg_ms(stats) -> float:
+        return 1000 * stats[1] / stats[0] if stats and stats[0] else 0.0
@@ -0,0 +1,34 @@
+import threading
+from typing import Any, Callable, Dict
+
+# Process-wide engine instances shared by every Streamlit session, background agent and tool
+_instances: Dict[str, Any] = {}
+_locks: Dict[str, threading.Lock] = {}
+_lock = threading.Lock()
+
+def get_shared(name: str, factory: Callable[[], Any]) -> Any:
+    """Return the shared instance registered under `name`, creating it once with `factory`.
+
+    Each name has its own creation lock, so a factory may itself ask for other shared instances
+    (DataProvider takes the shared RateScheduler) without deadlocking.
+    """
+    instance = _instances.get(name)
+    if instance is None:
+        with _lock:
+            name_lock = _locks.setdefault(name, threading.Lock())
+        with name_lock:
+            instance = _instances.get(name)
+            if instance is None:
+                instance = factory()
+                _instances[name] = instance
+    return instance
+
+def get_data_provider():
+    """The single DataProvider (CCXT clients, pools, caches, order books) for this process."""
+    from .data_provider import DataProvider
+    return get_shared("data_provider", DataProvider)
+
+def get_analytics_engine():
+    """The single AnalyticsEngine for this process."""
+    from .analytics import AnalyticsEngine
+    return get_shared("analytics_engine", AnalyticsEngine)
@@ -0,0 +1,49 @@
+import pandas as pd
+
+OHLCV_AGGREGATION = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+_UNIT_SECONDS = {'m': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+# Exchanges open weekly candles on Monday 00:00 UTC; everything else is aligned to the Unix epoch
+_WEEK_ORIGIN = pd.Timestamp("1970-01-05")
+
+def timeframe_seconds(timeframe: str) -> int:
+    """'15m' -> 900, '4h' -> 14400, '1w' -> 604800 (CCXT timeframe notation)."""
+    return int(timeframe[:-1]) * _UNIT_SECONDS[timeframe[-1]]
+
+def can_derive(timeframe: str, base_timeframe: str) -> bool:
+    """True if `timeframe` bars are whole multiples of `base_timeframe` bars."""
+    target, base = timeframe_seconds(timeframe), timeframe_seconds(base_timeframe)
+    return target >= base and target % base == 0
+
+def resample_ohlcv(df: pd.DataFrame, timeframe: str, base_timeframe: str, include_partial: bool = False) -> pd.DataFrame:
+    """Aggregate base-timeframe OHLCV bars into coarser `timeframe` bars.
+
+    The first bucket is dropped when history starts mid-bucket (its open/high/low would be wrong).
+    The last bucket is still forming unless all its base bars are present; it is kept only with
+    include_partial=True, matching what an exchange returns for the current candle. When both are
+    the same bucket it is the forming candle, so include_partial=True keeps it.
+    """
+    if df.empty:
+        return df
+    if not can_derive(timeframe, base_timeframe):
+        raise ValueError(f"Cannot derive {timeframe} bars from {base_timeframe} bars")
+
+    target = timeframe_seconds(timeframe)
+    origin = 'epoch'
+    if timeframe.endswith('w'):
+        origin = _WEEK_ORIGIN.tz_localize(df.index.tz) if df.index.tz is not None else _WEEK_ORIGIN
+    resampler = df.resample(f"{target}s", origin=origin, label='left', closed='left')
+
+    bars = resampler.agg(OHLCV_AGGREGATION)
+    counts = resampler['close'].count()
+    bars = bars[counts > 0]
+    counts = counts[counts > 0]
+    if bars.empty:
+        return bars
+
+    expected = target // timeframe_seconds(base_timeframe)
+    keep = pd.Series(True, index=bars.index)
+    if counts.iloc[0] < expected and not (len(bars) == 1 and include_partial):
+        keep.iloc[0] = False
+    if counts.iloc[-1] < expected and not include_partial:
+        keep.iloc[-1] = False
+    return bars[keep]
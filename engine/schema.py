@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+# Canonical OHLCV frame emitted by DataProvider for every source (CCXT, Yahoo, GeckoTerminal):
+# exactly these float columns, in this order, on a sorted, duplicate-free UTC DatetimeIndex
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+def empty_ohlcv(dtype=np.float64) -> pd.DataFrame:
+    return pd.DataFrame({c: pd.Series(dtype=dtype) for c in OHLCV_COLUMNS},
+                        index=pd.DatetimeIndex([], tz='UTC', name='timestamp'))
+
+def _flatten_columns(columns: pd.Index) -> pd.Index:
+    """Pick the OHLCV level out of yfinance MultiIndex columns (('Close', 'GC=F') or ('GC=F', 'Close'))."""
+    if not isinstance(columns, pd.MultiIndex):
+        return columns
+    for level in range(columns.nlevels):
+        values = columns.get_level_values(level)
+        if 'close' in {str(v).lower() for v in values}:
+            if values.duplicated().any():
+                raise ValueError("Frame holds several tickers; split it before normalizing")
+            return values
+    raise ValueError(f"No OHLCV level in columns {list(columns)}")
+
+def normalize_ohlcv(df: pd.DataFrame, dtype=np.float64) -> pd.DataFrame:
+    """Convert any source frame to the canonical OHLCV schema.
+
+    Column names are lower-cased (yfinance's 'Adj Close' and other extras are dropped), a missing
+    volume becomes 0 and missing open/high/low fall back to close. Naive timestamps are taken as UTC.
+    Rows without a close are dropped and, for duplicate timestamps, the last row wins. `dtype`
+    (float64 or float32) applies to every column; float32 halves the memory of long histories.
+    """
+    if df is None or df.empty:
+        return empty_ohlcv(dtype)
+    df = df.copy(deep=False)
+    df.columns = [str(c).lower() for c in _flatten_columns(df.columns)]
+    if 'close' not in df.columns:
+        raise ValueError(f"No close column in {list(df.columns)}")
+    for col in ('open', 'high', 'low'):
+        if col not in df.columns:
+            df[col] = df['close']
+    if 'volume' not in df.columns:
+        df['volume'] = 0.0
+    df = df[OHLCV_COLUMNS].dropna(subset=['close'])
+
+    index = pd.DatetimeIndex(df.index)
+    df.index = index.tz_localize('UTC') if index.tz is None else index.tz_convert('UTC')
+    df.index.name = 'timestamp'
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index(kind='stable')
+    if df.index.has_duplicates:
+        df = df[~df.index.duplicated(keep='last')]
+    # A single-dtype frame is one 2-D block, so df.to_numpy() is a view rather than a per-column copy
+    return df.astype(dtype)
@@ -0,0 +1,158 @@
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, Hashable, Iterable, Tuple
+import pandas as pd
+from .singleflight import SingleFlight
+
+class SWRCache:
+    """Size-bounded LRU cache with stale-while-revalidate semantics.
+
+    Each data kind has a freshness budget (fresh_seconds, stale_seconds): within fresh_seconds a value is
+    served as-is; for stale_seconds after that it is still served immediately while one background
+    refresh replaces it. Only cold or fully expired keys make the caller wait for the loader.
+    Empty results (no news for a small token, a failed market load) are cached for only `empty_ttl`
+    seconds, and never replace a value that can still be served.
+    Cached values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, budgets: Dict[str, Tuple[float, float]], max_entries: int = 512,
+                 refresh_workers: int = 4, background_context: Callable = nullcontext, empty_ttl: float = 60):
+        self.budgets = budgets
+        self.empty_ttl = empty_ttl
+        self.max_entries = max_entries
+        self.background_context = background_context
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any, bool]]" = OrderedDict()  # (stored at, value, empty)
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._flight = SingleFlight()
+        self._executor = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix="kitsune-swr")
+        self.counters = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "refresh_errors": 0, "evictions": 0}
+
+    @staticmethod
+    def _is_empty(value: Any) -> bool:
+        """Failed fetches and empty answers look alike; both are cached briefly so the next call soon retries."""
+        if value is None:
+            return True
+        if isinstance(value, pd.DataFrame):
+            return value.empty
+        if isinstance(value, (list, dict, tuple)):
+            return len(value) == 0
+        return False
+
+    def _budget(self, kind: str, empty: bool) -> Tuple[float, float]:
+        return (self.empty_ttl, 0) if empty else self.budgets.get(kind, (60, 600))
+
+    def _lookup(self, kind: str, cache_key: Hashable) -> Tuple[Any, str]:
+        # Caller holds self._lock
+        entry = self._entries.get(cache_key)
+        if entry is not None:
+            fresh, stale = self._budget(kind, entry[2])
+            age = time.time() - entry[0]
+            if age < fresh + stale:
+                self._entries.move_to_end(cache_key)
+                state = "fresh" if age < fresh else "stale"
+                self.counters["hits" if state == "fresh" else "stale_hits"] += 1
+                return entry[1], state
+        self.counters["misses"] += 1
+        return None, "miss"
+
+    def get(self, kind: str, key: Hashable, loader: Callable[[], Any]) -> Any:
+        cache_key = (kind, key)
+        with self._lock:
+            value, state = self._lookup(kind, cache_key)
+            if state == "stale":
+                self._schedule_refresh(cache_key, loader)
+            if state != "miss":
+                return value
+
+        # Cold key: concurrent callers share a single load
+        return self._flight.do(cache_key, self._load, cache_key, loader)
+
+    def peek(self, kind: str, key: Hashable) -> Tuple[Any, str]:
+        """(value, 'fresh' | 'stale' | 'miss') without loading; for callers that batch their own loads."""
+        with self._lock:
+            return self._lookup(kind, (kind, key))
+
+    def put(self, kind: str, key: Hashable, value: Any):
+        self._store((kind, key), value)
+
+    def refresh_many(self, kind: str, keys: Iterable[Hashable], loader: Callable[[list], Dict[Hashable, Any]]):
+        """Refresh several stale keys in the background with one batched `loader(keys) -> {key: value}`."""
+        with self._lock:
+            pending = [key for key in keys if (kind, key) not in self._refreshing]
+            self._refreshing.update((kind, key) for key in pending)
+        if not pending:
+            return
+
+        def refresh():
+            try:
+                with self.background_context():
+                    values = loader(pending)
+                for key, value in values.items():
+                    self.put(kind, key, value)
+                with self._lock:
+                    self.counters["refreshes"] += 1
+            except Exception as e:
+                with self._lock:
+                    self.counters["refresh_errors"] += 1
+                print(f"Cache refresh error for {kind} {pending}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.difference_update((kind, key) for key in pending)
+
+        self._executor.submit(refresh)
+
+    def _load(self, cache_key: Hashable, loader: Callable[[], Any]) -> Any:
+        value = loader()
+        self._store(cache_key, value)
+        return value
+
+    def _store(self, cache_key: Hashable, value: Any):
+        empty = self._is_empty(value)
+        with self._lock:
+            now = time.time()
+            current = self._entries.get(cache_key)
+            if empty and current is not None and not current[2] and now - current[0] < sum(self._budget(cache_key[0], False)):
+                return  # a failed refresh keeps serving the last good value
+            self._entries[cache_key] = (now, value, empty)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.counters["evictions"] += 1
+
+    def _schedule_refresh(self, cache_key: Hashable, loader: Callable[[], Any]):
+        # Caller holds self._lock
+        if cache_key in self._refreshing:
+            return
+        self._refreshing.add(cache_key)
+
+        def refresh():
+            try:
+                with self.background_context():
+                    self._load(cache_key, loader)
+                with self._lock:
+                    self.counters["refreshes"] += 1
+            except Exception as e:
+                with self._lock:
+                    self.counters["refresh_errors"] += 1
+                print(f"Cache refresh error for {cache_key}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(cache_key)
+
+        self._executor.submit(refresh)
+
+    def invalidate(self, kind: str = None):
+        """Drop every entry (or every entry of one kind)."""
+        with self._lock:
+            for cache_key in [k for k in self._entries if kind is None or k[0] == kind]:
+                del self._entries[cache_key]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.counters["hits"] + self.counters["stale_hits"] + self.counters["misses"]
+            return dict(self.counters, entries=len(self._entries),
+                        hit_rate=(self.counters["hits"] + self.counters["stale_hits"]) / total if total else 0.0)
@@ -0,0 +1,157 @@
+import bisect
+import difflib
+import heapq
+import threading
+from typing import Dict, Iterable, List, Optional, Set
+
+# Alternative names users type for the same asset (both directions are indexed)
+DEFAULT_ALIASES = {
+    "ATH": ["ATN", "ATHENE"],
+    "BTC": ["XBT", "BITCOIN"],
+    "ETH": ["ETHEREUM"],
+    "WLD": ["WORLDCOIN"],
+    "GOLD": ["XAU"],
+}
+# Tie-break between listings of the same base: the usual quote currencies first
+QUOTE_PRIORITY = {"USDT": 0, "USDC": 1, "USD": 2, "FDUSD": 3, "BTC": 4, "ETH": 5}
+
+class _Entry:
+    __slots__ = ("ticker", "base", "quote", "kind", "exchanges", "aliases")
+
+    def __init__(self, ticker: str, base: str, quote: str, kind: str):
+        self.ticker = ticker
+        self.base = base
+        self.quote = quote
+        self.kind = kind
+        self.exchanges: Set[str] = set()
+        self.aliases: Set[str] = set()
+
+
+class TickerSearchIndex:
+    """Prefix and fuzzy search over the ticker universe (crypto pairs, macro names, DEX pools).
+
+    Entries can be added incrementally (per exchange, as market lists arrive). The sorted token list
+    used for prefix lookups is rebuilt lazily on the first search after a change.
+    """
+
+    def __init__(self, aliases: Dict[str, List[str]] = None):
+        self._aliases: Dict[str, Set[str]] = {}
+        for name, others in (aliases or DEFAULT_ALIASES).items():
+            for a, b in [(name, o) for o in others] + [(o, name) for o in others]:
+                self._aliases.setdefault(a, set()).add(b)
+        self._entries: Dict[str, _Entry] = {}
+        self._tokens: Dict[str, Set[str]] = {}   # ticker, base and alias tokens (upper-case) -> tickers
+        self._filters: Dict[str, Set[str]] = {}  # quote and exchange tokens, used to narrow a query -> tickers
+        self._sorted: List[str] = []
+        self._sorted_filters: List[str] = []
+        self._bases: List[str] = []
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self._entries
+
+    @staticmethod
+    def _index(table: Dict[str, Set[str]], token: str, ticker: str):
+        table.setdefault(token.upper(), set()).add(ticker)
+
+    def add(self, tickers: Iterable[str], exchange: Optional[str] = None, kind: str = "crypto", aliases: Dict[str, List[str]] = None):
+        """Index tickers ('BASE/QUOTE' pairs or plain names), optionally tagged with the listing exchange."""
+        aliases = aliases or {}
+        with self._lock:
+            for ticker in tickers:
+                entry = self._entries.get(ticker)
+                if entry is None:
+                    base, _, quote = ticker.partition("/")
+                    quote = quote.split(":")[0]  # BTC/USDT:USDT (perpetuals) -> USDT
+                    entry = self._entries[ticker] = _Entry(ticker, base.upper(), quote.upper(), kind)
+                    self._index(self._tokens, ticker, ticker)
+                    self._index(self._tokens, entry.base, ticker)
+                    if entry.quote:
+                        self._index(self._filters, entry.quote, ticker)
+                    for alias in self._aliases.get(entry.base, ()):
+                        entry.aliases.add(alias)
+                        self._index(self._tokens, alias, ticker)
+                for alias in aliases.get(ticker, ()):
+                    entry.aliases.add(alias.upper())
+                    self._index(self._tokens, alias, ticker)
+                if exchange and exchange not in entry.exchanges:
+                    entry.exchanges.add(exchange)
+                    self._index(self._filters, exchange, ticker)
+            self._dirty = True
+
+    def _refresh(self):
+        # Caller holds self._lock
+        if self._dirty:
+            self._sorted = sorted(self._tokens)
+            self._sorted_filters = sorted(self._filters)
+            self._bases = sorted({e.base for e in self._entries.values()} | {a for e in self._entries.values() for a in e.aliases})
+            self._dirty = False
+
+    @staticmethod
+    def _prefix(table: Dict[str, Set[str]], tokens: List[str], prefix: str) -> Dict[str, int]:
+        """Tickers with a token starting with `prefix`, scored 0 (exact) / 1 (prefix)."""
+        hits = {}
+        start = bisect.bisect_left(tokens, prefix)
+        for token in tokens[start:]:
+            if not token.startswith(prefix):
+                break
+            score = 0 if token == prefix else 1
+            for ticker in table[token]:
+                hits[ticker] = min(score, hits.get(ticker, score))
+        return hits
+
+    def _rank_key(self, ticker: str, score: int, term: str, popularity: Dict[str, float]):
+        entry = self._entries[ticker]
+        # The asset itself beats an alias of it, which beats a longer name sharing the prefix
+        if entry.base == term or ticker.upper() == term:
+            match = 0
+        elif term in entry.aliases:
+            match = 1
+        else:
+            match = 2
+        return (
+            score,
+            match,
+            -popularity.get(ticker, 0.0),
+            QUOTE_PRIORITY.get(entry.quote, 99),
+            len(ticker),
+            ticker,
+        )
+
+    def search(self, query: str, limit: int = 20, kinds: Iterable[str] = None, popularity: Dict[str, float] = None) -> List[str]:
+        """Top `limit` tickers for a query.
+
+        The first word is matched against tickers, bases and aliases (exact, then prefix, then fuzzy);
+        further words narrow the result by quote or exchange, e.g. "eth usdc" or "ath mexc".
+        'BASE/QU' queries match the pair prefix directly. `popularity` (e.g. quote volume) breaks ties.
+        """
+        terms = query.upper().split()
+        popularity = popularity or {}
+        with self._lock:
+            self._refresh()
+            if not terms:
+                candidates = {ticker: 1 for ticker in self._entries}
+                term = ""
+            else:
+                term = terms[0]
+                candidates = self._prefix(self._tokens, self._sorted, term)
+                if not candidates and "/" not in term:
+                    # Typos: nearest bases/aliases, scored below every prefix match
+                    for close in difflib.get_close_matches(term, self._bases, n=5, cutoff=0.6):
+                        for ticker in self._tokens.get(close, ()):
+                            candidates.setdefault(ticker, 2)
+            for extra in terms[1:]:
+                narrowed = self._prefix(self._filters, self._sorted_filters, extra)
+                candidates = {t: s for t, s in candidates.items() if t in narrowed}
+            if kinds is not None:
+                kinds = set(kinds)
+                candidates = {t: s for t, s in candidates.items() if self._entries[t].kind in kinds}
+            return heapq.nsmallest(limit, candidates, key=lambda t: self._rank_key(t, candidates[t], term, popularity))
+
+    def exchanges(self, ticker: str) -> Set[str]:
+        entry = self._entries.get(ticker)
+        return set(entry.exchanges) if entry else set()
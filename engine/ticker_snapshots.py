@@ -0,0 +1,58 @@
+from typing import Any, Callable, Dict, Optional
+from .swr_cache import SWRCache
+
+class TickerSnapshotService:
+    """Whole-exchange quote snapshots, one fetch_tickers call per exchange, served from memory.
+
+    Snapshots live in the provider's SWRCache under the 'ticker_snapshot' kind, so a snapshot older than
+    its fresh budget (a few seconds) is refreshed in the background while readers keep the last one.
+    """
+
+    KIND = "ticker_snapshot"
+
+    def __init__(self, cache: SWRCache, fetch_tickers: Callable[[Any], Dict[str, dict]]):
+        self.cache = cache
+        self.fetch_tickers = fetch_tickers  # exchange client -> raw CCXT tickers keyed by symbol
+
+    @staticmethod
+    def compact(ticker: dict) -> Optional[Dict[str, Any]]:
+        """Reduce a CCXT ticker to the fields the UI uses; None if it has no last price."""
+        last = ticker.get('last') or ticker.get('close')
+        if not last:
+            return None
+        change = ticker.get('percentage')
+        if change is None and ticker.get('open'):
+            change = (last - ticker['open']) / ticker['open'] * 100
+        return {
+            "last": float(last),
+            "change_pct": float(change or 0.0),
+            "bid": ticker.get('bid'),
+            "ask": ticker.get('ask'),
+            "quote_volume": float(ticker.get('quoteVolume') or 0.0),
+            "timestamp": ticker.get('timestamp'),
+        }
+
+    @classmethod
+    def compact_all(cls, tickers: Dict[str, dict]) -> Dict[str, Dict[str, Any]]:
+        """compact() every ticker of a fetch_tickers response, dropping those without a price."""
+        quotes = {}
+        for symbol, ticker in tickers.items():
+            quote = cls.compact(ticker)
+            if quote:
+                quotes[symbol] = quote
+        return quotes
+
+    def _load(self, exchange) -> Dict[str, Dict[str, Any]]:
+        try:
+            tickers = self.fetch_tickers(exchange)
+        except Exception as e:
+            print(f"Ticker snapshot error ({exchange.id}): {e}")
+            return {}
+        return self.compact_all(tickers)
+
+    def snapshot(self, exchange) -> Dict[str, Dict[str, Any]]:
+        """Every quote on an exchange, keyed by symbol."""
+        return self.cache.get(self.KIND, exchange.id, lambda: self._load(exchange))
+
+    def quote(self, exchange, symbol: str) -> Optional[Dict[str, Any]]:
+        return self.snapshot(exchange).get(symbol)
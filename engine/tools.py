@@ -125,8 +125,8 @@ class NeuralPredictTool(Tool):
         ticker = params.get("ticker")
         if not ticker: return "[Error] Ticker required"
         try:
-            from .data_provider import DataProvider
-            provider = DataProvider()
+            from .registry import get_data_provider
+            provider = get_data_provider()
             data = provider.get_asset_data(ticker)
             if data.empty: return f"[Error] No data found for {ticker}"
             res = self.analytics.neural_core.predict_price_trend(data)
@@ -0,0 +1,76 @@
+"""Run a fixed set of DataProvider fetches against a cassette and compare their results.
+
+Record (network):  KITSUNE_CASSETTE=data_cache/session.cassette KITSUNE_CASSETTE_MODE=record python replay_check.py
+Replay (offline):  KITSUNE_CASSETTE=data_cache/session.cassette python replay_check.py
+
+Recording saves the cassette plus a digest of every result next to it; replay runs the same
+fetches from the cassette and exits non-zero if any result differs from the recorded digest.
+Both runs start from an empty local store in a temporary directory, like a cold start.
+"""
+import os
+import sys
+import json
+import hashlib
+import tempfile
+import pandas as pd
+
+CHECKS = [
+    ("tickers", lambda p: p.get_all_crypto_tickers()),
+    ("ohlcv BTC/USDT 1d", lambda p: p.fetch_crypto_data("BTC/USDT", "1d", 100)),
+    ("ohlcv ETH/USDT 1h", lambda p: p.fetch_crypto_data("ETH/USDT", "1h", 200)),
+    ("history BTC/USDT 1d", lambda p: p.fetch_crypto_history("BTC/USDT", "1d", days=365)),
+    ("macro batch", lambda p: p.fetch_macro_batch()),
+    ("order book BTC/USDT", lambda p: p.fetch_order_book("BTC/USDT", 20)),
+    ("quotes", lambda p: p.get_quotes(["BTC/USDT", "ETH/USDT", "GOLD"])),
+    ("dex prices", lambda p: p.fetch_dex_prices(list(p.get_world_chain_assets().values()))),
+    ("news BTC/USDT", lambda p: p.fetch_news("BTC/USDT")),
+]
+
+def digest(value) -> str:
+    """Stable fingerprint of a fetch result (frames, dicts of frames, lists, dicts)."""
+    if isinstance(value, pd.DataFrame):
+        value = {"rows": len(value), "hash": int(pd.util.hash_pandas_object(value).sum()) if not value.empty else 0}
+    elif isinstance(value, dict) and any(isinstance(v, pd.DataFrame) for v in value.values()):
+        value = {k: digest(v) for k, v in value.items()}
+    elif isinstance(value, dict) and "bids" in value:
+        value = {"bids": value.get("bids"), "asks": value.get("asks")}  # order books carry a local receive time
+    return hashlib.sha1(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()[:12]
+
+def main() -> int:
+    path = os.environ.get("KITSUNE_CASSETTE")
+    if not path:
+        print("Set KITSUNE_CASSETTE (and KITSUNE_CASSETTE_MODE=record to record).")
+        return 2
+    path = os.path.abspath(path)
+    os.environ["KITSUNE_CASSETTE"] = path
+    digest_path = f"{path}.digest.json"
+    # Cold start: empty OHLCV store and markets cache
+    os.chdir(tempfile.mkdtemp(prefix="kitsune-replay-"))
+
+    from engine.data_provider import DataProvider
+    provider = DataProvider()
+    cassette = provider.cassette
+
+    results = {}
+    for name, check in CHECKS:
+        try:
+            results[name] = digest(check(provider))
+        except Exception as e:
+            results[name] = f"error: {type(e).__name__}: {e}"
+        print(f"{name:<22} {results[name]}")
+
+    if cassette.mode == "record":
+        cassette.save()
+        with open(digest_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Recorded {cassette.stats()['recorded']} responses to {path}")
+        return 0
+
+    with open(digest_path, "r", encoding="utf-8") as f:
+        expected = json.load(f)
+    diffs = [name for name in expected if expected[name] != results.get(name)]
+    print(f"Replayed {cassette.stats()['replayed']} responses; {len(diffs)} mismatches {diffs if diffs else ''}")
+    return 1 if diffs else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,42 @@
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeExchange:
+    """Stand-in for a CCXT client: deterministic hourly/daily bars, no network."""
+
+    def __init__(self, exchange_id: str = "binance", step_ms: int = 3_600_000, end_ms: int = None, missing=()):
+        self.id = exchange_id
+        self.step_ms = step_ms
+        self.end_ms = end_ms  # newest bar the venue has (None: unbounded)
+        self.missing = set(missing)  # bar timestamps the venue has no data for
+        self.markets = {"BTC/USDT": {"symbol": "BTC/USDT"}}
+        self.currencies = {}
+        self.calls = []
+
+    def set_markets(self, markets, currencies=None):
+        self.markets = markets
+
+    def bar(self, ts: int) -> list:
+        price = 100.0 + ts / self.step_ms % 50
+        return [ts, price, price + 1, price - 1, price + 0.5, 10.0]
+
+    def fetch_ohlcv(self, symbol, timeframe='1h', since=None, limit=100):
+        self.calls.append(("fetch_ohlcv", since, limit))
+        end = self.end_ms if self.end_ms is not None else since + (limit - 1) * self.step_ms
+        start = since if since is not None else end - (limit - 1) * self.step_ms
+        start -= start % self.step_ms
+        rows = [self.bar(ts) for ts in range(start, end + 1, self.step_ms) if ts not in self.missing]
+        return rows[:limit]
+
+
+@pytest.fixture
+def provider(tmp_path, monkeypatch):
+    """A DataProvider whose on-disk stores live in a temporary directory."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("KITSUNE_CASSETTE", raising=False)
+    from engine.data_provider import DataProvider
+    return DataProvider()
@@ -0,0 +1,137 @@
+import asyncio
+import inspect
+import threading
+from types import SimpleNamespace
+import pytest
+from engine import async_data_provider
+from engine.async_data_provider import AsyncDataProvider, SyncDataProvider
+from engine.cassette import Cassette
+from engine.data_provider import DataProvider
+from engine.rate_limiter import RateScheduler, BACKGROUND, INTERACTIVE
+from conftest import FakeExchange
+
+SYMBOLS = [f"C{i}/USDT" for i in range(200)]
+
+
+class FakeAsyncExchange:
+    """Stand-in for a ccxt.async_support client: FakeExchange bars after a short await."""
+
+    def __init__(self, config):
+        self.id = "binance"
+        self.config = config
+        self.markets = {}
+        self.bars = FakeExchange()
+        self.in_flight = self.max_in_flight = 0
+        self.threads = set()
+
+    def set_markets(self, markets, currencies=None):
+        self.markets = markets
+
+    async def fetch_ohlcv(self, symbol, timeframe='1h', since=None, limit=100):
+        self.threads.add(threading.current_thread().name)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.02)
+        self.in_flight -= 1
+        return self.bars.fetch_ohlcv(symbol, timeframe, since=since or 1_700_000_000_000, limit=limit)
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_binance(provider, monkeypatch):
+    markets = {s: {"id": s.replace("/", ""), "symbol": s, "base": s.split("/")[0], "quote": "USDT",
+                   "type": "spot", "spot": True, "active": True} for s in SYMBOLS}
+    provider.binance.set_markets(markets)
+    provider.rate_scheduler = RateScheduler({"binance": (10_000.0, 10_000.0)})
+    clients = []
+    monkeypatch.setattr(async_data_provider, "ccxt_async",
+                        SimpleNamespace(binance=lambda config: clients.append(FakeAsyncExchange(config)) or clients[-1]))
+    return clients
+
+
+def test_every_public_method_is_a_coroutine():
+    for name, _ in inspect.getmembers(DataProvider, inspect.isfunction):
+        if not name.startswith("_"):
+            assert inspect.iscoroutinefunction(getattr(AsyncDataProvider, name, None)), name
+
+
+def test_concurrent_fetches_share_one_thread_and_the_provider_state(provider, fake_binance):
+    provider.max_concurrency["binance"] = 50
+    wrapper = AsyncDataProvider(provider)
+
+    async def main():
+        try:
+            return await asyncio.gather(*(wrapper.fetch_crypto_data(s, "1h", 20) for s in SYMBOLS))
+        finally:
+            await wrapper.close()
+
+    frames = asyncio.run(main())
+    (client,) = fake_binance
+    assert all(len(df) == 20 for df in frames)
+    # Awaited side by side on the loop thread, up to the venue's concurrency slots
+    assert client.threads == {"MainThread"}
+    assert client.max_in_flight == 50
+    assert client.config["session"] is not None and client.config["enableRateLimit"] is False
+    # Results landed in the provider's cache and store: the sync API answers without a request
+    assert provider.cache.peek("ohlcv", (SYMBOLS[0], "1h", 20))[1] == "fresh"
+    assert provider.ohlcv_store.has("binance", SYMBOLS[0], "1h")
+
+
+def test_identical_concurrent_requests_are_coalesced(provider, fake_binance):
+    wrapper = AsyncDataProvider(provider)
+
+    async def main():
+        calls = [wrapper._exchange_call(provider.binance, "fetch_ohlcv", "C1/USDT", "1h", since=0, limit=5) for _ in range(10)]
+        return await asyncio.gather(*calls)
+
+    results = asyncio.run(main())
+    assert all(r is results[0] for r in results)
+    assert provider.rate_scheduler.metrics()["binance"]["granted"] == 1
+
+
+def test_async_recordings_replay_in_the_sync_provider(provider, fake_binance, tmp_path, monkeypatch):
+    cassette = Cassette(str(tmp_path / "session.cassette"), mode="record")
+    provider.use_cassette(cassette)
+    recorded = asyncio.run(AsyncDataProvider(provider).fetch_crypto_data("C7/USDT", "1h", 30))
+    cassette.save()
+
+    # A cold store in another directory: every bar must come from the cassette
+    (tmp_path / "replay").mkdir()
+    monkeypatch.chdir(tmp_path / "replay")
+    monkeypatch.setenv("KITSUNE_CASSETTE", cassette.path)
+    replayed = DataProvider().fetch_crypto_data("C7/USDT", "1h", 30)
+    assert replayed.equals(recorded)
+
+
+def test_sync_facade_runs_on_its_loop_thread_at_the_caller_priority(provider, fake_binance):
+    facade = SyncDataProvider(provider)
+    try:
+        with RateScheduler.background():
+            df = facade.fetch_crypto_data("C3/USDT", "1h", 10)
+        assert len(df) == 10
+        (client,) = fake_binance
+        assert client.threads == {"kitsune-async-provider"}
+        assert provider.rate_scheduler._get("binance").waits_by_priority[BACKGROUND][0] == 1
+        assert facade.macro_tickers is provider.macro_tickers
+    finally:
+        facade.close()
+
+
+def test_async_acquire_shares_the_priority_queue():
+    scheduler = RateScheduler({"venue": (20.0, 1.0)})
+    scheduler.acquire("venue")  # drain the bucket
+    order = []
+
+    async def take(priority, delay):
+        await asyncio.sleep(delay)
+        await scheduler.acquire_async("venue", priority=priority)
+        order.append(priority)
+
+    async def main():
+        await asyncio.gather(take(BACKGROUND, 0), take(INTERACTIVE, 0.01))
+
+    asyncio.run(main())
+    assert order == [INTERACTIVE, BACKGROUND]
+    assert scheduler.metrics()["venue"]["queue_depth"] == 0
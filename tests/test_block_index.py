@@ -0,0 +1,112 @@
+import asyncio
+import threading
+import time
+from engine.async_data_provider import AsyncDataProvider
+from engine.block_index import BlockIndex, BlockPoller
+
+
+class FakeChain:
+    """JSON-RPC stand-in: blocks every 2 s ending now, block n carries n % 5 transactions."""
+
+    def __init__(self, head=1_000, block_time=2):
+        self.head = head
+        self.block_time = block_time
+        self.now = int(time.time())
+        self.batches = []
+
+    def header(self, number):
+        return {
+            "number": hex(number),
+            "hash": f"0x{number:064x}",
+            "timestamp": hex(self.now - (self.head - number) * self.block_time),
+            "transactions": [f"0x{i:x}" for i in range(number % 5)],
+            "gasUsed": hex(1_000_000),
+            "gasLimit": hex(4_000_000),
+            "baseFeePerGas": hex(2_000_000_000),
+        }
+
+    def __call__(self, calls):
+        self.batches.append(calls)
+        responses = []
+        for call in calls:
+            if call["method"] == "eth_blockNumber":
+                result = hex(self.head)
+            else:
+                number = int(call["params"][0], 16)
+                result = self.header(number) if number <= self.head else None
+            responses.append({"jsonrpc": "2.0", "id": call["id"], "result": result})
+        return responses
+
+
+def test_poller_follows_the_head(tmp_path):
+    chain = FakeChain()
+    poller = BlockPoller(chain, BlockIndex(str(tmp_path / "blocks.sqlite"), window=50), max_batch=20, backfill=50)
+
+    assert poller.poll_once() == 0  # learns the head only
+    while not poller.wait_ready(0):
+        poller.poll_once()
+    stats = poller.status()
+    assert stats["block"] == stats["head"] == chain.head
+    assert stats["blocks"] == 50
+    assert stats["block_time"] == 2
+    # 49 block intervals, transactions of blocks 952..1000 (the first block of the window is excluded)
+    assert stats["tps"] == sum(n % 5 for n in range(952, 1001)) / 98
+    assert stats["gas_utilization"] == 0.25
+    assert stats["base_fee_gwei"] == 2.0
+    # Every batch stays within max_batch requests
+    assert all(len(batch) <= 20 for batch in chain.batches)
+
+    # Requests are planned from the known head (plus the next block), so new blocks arrive over two polls
+    chain.head += 3
+    assert poller.poll_once() == 1
+    assert poller.poll_once() == 2
+    assert poller.status()["block"] == chain.head
+
+
+def test_index_prunes_to_retention(tmp_path):
+    chain = FakeChain()
+    index = BlockIndex(str(tmp_path / "blocks.sqlite"), window=10, retention=100)
+    for start in range(1, 1001, 50):
+        index.add([chain.header(n) for n in range(start, start + 50)])
+    assert index.count() == 100
+    assert index.latest_number() == 1000
+
+    # Reopening restores the window from the retained rows
+    index.close()
+    reopened = BlockIndex(str(tmp_path / "blocks.sqlite"), window=10, retention=100)
+    assert reopened.stats()["block"] == 1000 and reopened.stats()["blocks"] == 10
+
+
+def test_chain_status_reads_the_block_index(provider):
+    chain = FakeChain()
+    provider._rpc_batch = chain
+
+    status = provider.get_athene_chain_status()
+    provider.block_poller.stop()
+
+    assert status["status"] == "Online"
+    assert status["block"] == chain.head
+    assert status["tps"] == provider.block_poller.index.stats()["tps"]
+    assert status["tps_est"] == f"{status['tps']:.1f} TPS"
+
+
+def test_async_chain_status_polls_on_the_event_loop(provider):
+    chain = FakeChain()
+    wrapper = AsyncDataProvider(provider)
+    posts = []
+
+    async def http_json(method, url, json=None, timeout=None):
+        posts.append((method, threading.current_thread().name))
+        return chain(json)
+
+    wrapper._http_json = http_json
+
+    async def main():
+        status = await wrapper.get_athene_chain_status()
+        provider.block_poller.stop()
+        return status
+
+    status = asyncio.run(main())
+    assert status["status"] == "Online" and status["block"] == chain.head
+    # JSON-RPC batches went out from the loop thread, not a poller thread
+    assert set(posts) == {("POST", "MainThread")}
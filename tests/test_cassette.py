@@ -0,0 +1,95 @@
+import pytest
+from engine.cassette import Cassette, CassetteMiss
+from engine.data_provider import DataProvider
+from conftest import FakeExchange
+
+HOUR = 3_600_000
+
+
+def test_record_then_replay_round_trip(tmp_path):
+    path = str(tmp_path / "session.cassette")
+    recorder = Cassette(path, mode="record")
+    assert recorder.play("binance", "fetch_ticker", lambda s: {"last": 1.0}, "BTC/USDT") == {"last": 1.0}
+    assert recorder.play("binance", "fetch_ticker", lambda s: {"last": 2.0}, "BTC/USDT") == {"last": 2.0}
+    with pytest.raises(ValueError):
+        recorder.play("yahoo", "download", lambda: (_ for _ in ()).throw(ValueError("down")))
+    recorder.save()
+
+    replay = Cassette(path, mode="replay")
+    offline = lambda *a: pytest.fail("replay must not call upstream")
+    # Responses come back in recorded order, the last one repeating
+    assert [replay.play("binance", "fetch_ticker", offline, "BTC/USDT")["last"] for _ in range(3)] == [1.0, 2.0, 2.0]
+    with pytest.raises(ValueError):
+        replay.play("yahoo", "download", offline)
+    # Different arguments never fall back to another request's responses
+    with pytest.raises(CassetteMiss):
+        replay.play("binance", "fetch_ticker", offline, "BTC/USDT", params={"x": 1})
+    with pytest.raises(CassetteMiss):
+        replay.play("binance", "fetch_ticker", offline, "ETH/USDT")
+
+
+def test_provider_replays_fetches_without_network(tmp_path, monkeypatch):
+    path = str(tmp_path / "session.cassette")
+    start = 1_700_000_000_000 - 1_700_000_000_000 % HOUR
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "record").mkdir()
+    monkeypatch.chdir(tmp_path / "record")
+    recorder = DataProvider()
+    recorder.use_cassette(Cassette(path, mode="record"))
+    recorded = recorder._sync_ohlcv(FakeExchange(end_ms=start + 49 * HOUR), "BTC/USDT", "1h", 50)
+    recorder.cassette.save()
+
+    (tmp_path / "replay").mkdir()
+    monkeypatch.chdir(tmp_path / "replay")
+    player = DataProvider()
+    player.use_cassette(Cassette(path, mode="replay"))
+    offline = FakeExchange()
+    offline.fetch_ohlcv = lambda *a, **kw: pytest.fail("replay must not call the exchange")
+    replayed = player._sync_ohlcv(offline, "BTC/USDT", "1h", 50)
+    assert replayed.equals(recorded)
+
+    # Unrecorded markets are a miss, not a live load_markets
+    offline.markets = {}
+    offline.load_markets = lambda reload=False: pytest.fail("replay must not load markets")
+    with pytest.raises(CassetteMiss):
+        player._exchange_call(offline, "fetch_ohlcv", "BTC/USDT", "1h", limit=5)
+
+    # No live websocket on replay
+    player.binance.markets = {"BTC/USDT": {}}
+    assert player.subscribe_order_book("BTC/USDT") is False
+    assert player.order_books.symbols() == []
+
+
+def test_open_ended_history_replays_the_recorded_pages(tmp_path, monkeypatch):
+    path = str(tmp_path / "session.cassette")
+    day = 24 * HOUR
+    now = 1_700_000_000_000
+    # The venue serves daily bars up to "now" (listed long before the window)
+    monkeypatch.setattr("time.time", lambda: now / 1000)
+
+    (tmp_path / "record").mkdir()
+    monkeypatch.chdir(tmp_path / "record")
+    recorder = DataProvider()
+    recorder.use_cassette(Cassette(path, mode="record"))
+    recorder.binance = FakeExchange(step_ms=day, end_ms=now - now % day)
+    recorder._sync_ohlcv(recorder.binance, "BTC/USDT", "1d", 100)
+    recorded = recorder._load_crypto_history("BTC/USDT", "1d", 365, None, None, 100)
+    recorder.cassette.save()
+    assert len(recorded) == 365
+
+    # Replayed later: the window is anchored to the recorded clock, not the current one
+    monkeypatch.setattr("time.time", lambda: now / 1000 + 3600)
+    (tmp_path / "replay").mkdir()
+    monkeypatch.chdir(tmp_path / "replay")
+    player = DataProvider()
+    player.binance = FakeExchange(step_ms=day, end_ms=0)
+    player.use_cassette(Cassette(path, mode="replay"))
+    player.binance.fetch_ohlcv = lambda *a, **kw: pytest.fail("replay must not call the exchange")
+    player._sync_ohlcv(player.binance, "BTC/USDT", "1d", 100)
+    replayed = player._load_crypto_history("BTC/USDT", "1d", 365, None, None, 100)
+    assert replayed.equals(recorded)
+
+    # A page that was never recorded is a miss, not another page's bars
+    with pytest.raises(CassetteMiss):
+        player._exchange_call(player.binance, "fetch_ohlcv", "BTC/USDT", "1d", since=now - 400 * day - 1, limit=100)
@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+import pytest
+from engine.rate_limiter import RateScheduler
+
+HOUR = 3600
+POOL = "0xpool"
+
+
+class FakeGecko:
+    """GeckoTerminal pool OHLCV stand-in: hourly bars from `first` up to `clock.now`, newest first."""
+
+    def __init__(self, clock, first):
+        self.clock = clock
+        self.first = first
+        self.requests = []
+
+    def __call__(self, method, url, params=None, timeout=None):
+        self.requests.append(dict(params))
+        end = min(params.get("before_timestamp", self.clock.now + 1) - 1, self.clock.now)
+        end -= end % HOUR
+        stamps = range(end, max(self.first, end - (params["limit"] - 1) * HOUR) - 1, -HOUR)
+        return {"data": {"attributes": {"ohlcv_list": [[ts, 1.0, 2.0, 0.5, 1.5, 10.0] for ts in stamps]}}}
+
+
+@pytest.fixture
+def gecko(provider):
+    clock = SimpleNamespace(now=1_700_000_000 - 1_700_000_000 % HOUR)
+    provider._now = lambda: clock.now
+    provider.rate_scheduler = RateScheduler({"geckoterminal": (1000.0, 1000.0)})
+    provider._http_json = FakeGecko(clock, first=clock.now - 4999 * HOUR)
+    return provider._http_json
+
+
+def test_cold_store_pages_back_with_before_timestamp(provider, gecko):
+    df = provider._sync_dex_ohlcv(POOL, "1h", 2500)
+
+    assert len(df) == 2500 and df.index.is_monotonic_increasing and not df.index.has_duplicates
+    assert [r["limit"] for r in gecko.requests] == [1000, 1000, 500]
+    # Each page ends where the previous one started
+    assert "before_timestamp" not in gecko.requests[0]
+    assert [r["before_timestamp"] for r in gecko.requests[1:]] == [gecko.clock.now - 999 * HOUR, gecko.clock.now - 1999 * HOUR]
+
+
+def test_paging_stops_at_the_first_trade(provider, gecko):
+    gecko.first = gecko.clock.now - 1199 * HOUR
+    df = provider._sync_dex_ohlcv(POOL, "1h", 2500)
+    assert len(df) == 1200
+    assert [r["limit"] for r in gecko.requests] == [1000, 1000]  # the short second page ends it
+
+
+def test_warm_store_requests_only_the_new_bars(provider, gecko):
+    provider._sync_dex_ohlcv(POOL, "1h", 100)
+    gecko.requests.clear()
+
+    gecko.clock.now += 3 * HOUR + 600
+    df = provider._sync_dex_ohlcv(POOL, "1h", 100)
+    # Three new bars plus the last stored one, which may still have been forming
+    assert gecko.requests == [{"aggregate": 1, "limit": 4, "currency": "usd"}]
+    assert len(df) == 103 and df.index[-1].timestamp() == gecko.clock.now - 600
+
+    # The cache-facing loader trims to the requested bar count
+    assert len(provider._load_dex_ohlcv(POOL, "1h", 100)) == 100
@@ -0,0 +1,21 @@
+import threading
+
+
+def test_fetch_many_runs_concurrently_in_input_order(provider):
+    barrier = threading.Barrier(3, timeout=5)
+
+    def price(ticker):
+        barrier.wait()  # all three entries must be in flight at once
+        if ticker == "BAD":
+            raise ValueError("boom")
+        return {"BTC": 1.0, "ETH": 2.0}[ticker]
+
+    provider.get_latest_price = price
+    batch = [{"kind": "price", "ticker": t} for t in ("ETH", "BAD", "BTC")]
+    assert provider.fetch_many(batch) == [2.0, None, 1.0]
+
+
+def test_fetch_many_workers_need_no_streamlit_context(provider):
+    provider.fetch_news = lambda ticker: [threading.current_thread().name]
+    (names,) = provider.fetch_many([{"kind": "news", "ticker": "BTC/USDT"}])
+    assert names[0].startswith("kitsune-fetch")
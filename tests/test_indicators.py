@@ -0,0 +1,87 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from engine.analytics import AnalyticsEngine
+from engine.indicators import IndicatorSet
+
+
+def frame(bars=120, seed=3):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2024-01-01", periods=bars, freq="h", tz="UTC")
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, bars)))
+    volume = rng.lognormal(3, 0.6, bars)
+    return pd.DataFrame({"open": close, "high": close, "low": close, "close": close, "volume": volume}, index=index)
+
+
+def forming(df, close_factor=0.93, volume_factor=0.2):
+    """The same frame as seen mid-candle: the last bar has a different close and less volume."""
+    df = df.copy()
+    df.iloc[-1, df.columns.get_loc("close")] *= close_factor
+    df.iloc[-1, df.columns.get_loc("volume")] *= volume_factor
+    return df
+
+
+def wilder_rsi(close, window=14):
+    delta = close.diff().iloc[1:]
+    averages = []
+    for side in (delta.clip(lower=0), -delta.clip(upper=0)):
+        seeded = side.copy()
+        seeded.iloc[:window] = np.nan
+        seeded.iloc[window - 1] = side.iloc[:window].mean()
+        averages.append(seeded.ewm(alpha=1 / window, adjust=False, ignore_na=True).mean())
+    gain, loss = averages
+    return (100 - 100 / (1 + gain / loss)).iloc[-1]
+
+
+def assert_values(indicators, df):
+    values = indicators.values()
+    volume = df["volume"]
+    mean, std = volume.rolling(20).mean().iloc[-1], volume.rolling(20).std().iloc[-1]
+    assert values["rsi"] == pytest.approx(wilder_rsi(df["close"]), rel=1e-9)
+    assert values["volatility"] == pytest.approx(AnalyticsEngine.calculate_volatility(df).iloc[-1], rel=1e-9)
+    assert values["volume_z"] == pytest.approx((volume.iloc[-1] - mean) / std, rel=1e-9)
+
+
+def resume(indicators, df):
+    state = json.loads(json.dumps(indicators.to_state()))
+    return AnalyticsEngine.update_indicators(df, state)
+
+
+def test_matches_pandas():
+    df = frame()
+    assert_values(IndicatorSet.from_frame(df), df)
+
+
+def test_forming_bar_is_revised_not_applied_twice():
+    full = frame()
+    indicators = IndicatorSet.from_frame(forming(full))
+    # Several reruns while the candle forms, then the closed bar
+    for factor in (0.95, 1.04):
+        indicators = resume(indicators, forming(full, factor, 0.5))
+    indicators = resume(indicators, full)
+    assert_values(indicators, full)
+    assert indicators.values() == IndicatorSet.from_frame(full).values()
+
+
+def test_forming_bar_closes_as_new_bars_arrive():
+    full = frame(130)
+    indicators = IndicatorSet.from_frame(forming(full.iloc[:120]))
+    indicators = resume(indicators, forming(full.iloc[:125]))
+    indicators = resume(indicators, full)
+    assert_values(indicators, full)
+
+    # A rerun with the same frame changes nothing
+    before = indicators.values()
+    assert resume(indicators, full).values() == before
+
+
+def test_revising_a_bar_restores_the_evicted_window_values():
+    full = frame()
+    indicators = IndicatorSet.from_frame(full)
+    window = list(indicators.volume.stats.values)
+    last = full.index[-1]
+    for factor in (0.5, 2.0, 1.0):
+        indicators.update(full["close"].iloc[-1], full["volume"].iloc[-1] * factor, last)
+    assert list(indicators.volume.stats.values) == window
+    assert indicators.values() == IndicatorSet.from_frame(full).values()
@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+import pytest
+from engine import market_router
+from engine.market_router import MarketRouter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(value=1_000.0)
+    monkeypatch.setattr(market_router, "time", SimpleNamespace(time=lambda: now.value))
+    return now
+
+
+def test_listed_venues_in_order_then_unindexed_fallbacks(clock):
+    router = MarketRouter(["binance", "mexc", "gateio"])
+    router.register_markets("mexc", ["ATH/USDT", "BTC/USDT"])
+    router.register_markets("binance", ["BTC/USDT"])
+    assert router.route("BTC/USDT") == ["binance", "mexc", "gateio"]
+    # gateio's markets were never loaded, so it cannot be ruled out
+    assert router.route("ATH/USDT") == ["mexc", "gateio"]
+
+
+def test_preferred_venue_goes_first_until_it_rejects_the_symbol(clock):
+    router = MarketRouter(["binance", "mexc", "gateio"])
+    router.record_success("ATH/USDT", "gateio")
+    assert router.route("ATH/USDT") == ["gateio", "binance", "mexc"]
+    router.record_unlisted("ATH/USDT", "mexc")  # another venue's rejection keeps the preference
+    assert router.route("ATH/USDT")[0] == "gateio"
+    router.record_unlisted("ATH/USDT", "gateio")
+    assert router.route("ATH/USDT") == ["binance", "mexc", "gateio"]
+
+    # A preferred venue whose fresh listing lacks the symbol is not tried
+    router.record_success("ATH/USDT", "binance")
+    router.register_markets("binance", ["BTC/USDT"])
+    assert router.route("ATH/USDT") == ["mexc", "gateio"]
+
+
+def test_negative_cache_expires(clock):
+    router = MarketRouter(["binance", "mexc"], negative_ttl=60)
+    router.register_markets("binance", ["BTC/USDT"])
+    router.register_markets("mexc", ["BTC/USDT"])
+    # Listed nowhere: the empty route is remembered
+    assert router.route("NOPE/USDT") == []
+    clock.value += 59
+    assert router.route("NOPE/USDT") == []
+    clock.value += 2
+    assert router.route("NOPE/USDT") == []  # expired, looked up again and still missing
+
+    # mark_missing hides even listed venues until it expires or the symbol succeeds
+    router.mark_missing("BTC/USDT")
+    assert router.route("BTC/USDT") == []
+    clock.value += 61
+    assert router.route("BTC/USDT") == ["binance", "mexc"]
+    router.mark_missing("BTC/USDT")
+    router.record_success("BTC/USDT", "mexc")
+    assert router.route("BTC/USDT") == ["mexc", "binance"]
+
+
+def test_new_listing_clears_the_negative_cache(clock):
+    router = MarketRouter(["binance"])
+    router.register_markets("binance", [])
+    assert router.route("ATH/USDT") == []
+    router.register_markets("binance", ["ATH/USDT"])
+    assert router.route("ATH/USDT") == ["binance"]
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+from engine.analytics import AnalyticsEngine
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(5)
+    bars = 400
+    index = pd.date_range("2023-01-01", periods=bars, freq="D", tz="UTC")
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.03, bars)))
+    volume = rng.lognormal(5, 0.5, bars)
+    volume[[50, 200, -1]] *= 8  # a few whale bars, the last one included
+    return pd.DataFrame({"open": close, "high": close, "low": close, "close": close, "volume": volume}, index=index)
+
+
+def test_matches_the_pandas_helpers(df):
+    metrics = AnalyticsEngine.calculate_metrics(df)
+    returns = df["close"].pct_change().dropna()
+    whales = AnalyticsEngine.detect_whale_activity(df)
+    ath = AnalyticsEngine.get_ath_stats(df)
+
+    assert metrics["price"] == df["close"].iloc[-1]
+    assert metrics["rsi"] == pytest.approx(AnalyticsEngine.calculate_rsi(df), rel=1e-9)
+    assert metrics["volatility"] == pytest.approx(AnalyticsEngine.calculate_volatility(df).iloc[-1], rel=1e-9)
+    assert metrics["sharpe"] == pytest.approx(AnalyticsEngine.calculate_sharpe_ratio(returns), rel=1e-9)
+    assert metrics["ath"] == pytest.approx(ath["ath"])
+    assert metrics["ath_distance_pct"] == pytest.approx(ath["distance_pct"])
+    assert metrics["whale_count"] == len(whales) >= 3
+    assert metrics["whale_last"] == (whales.index[-1] == df.index[-1])
+
+    peaks = df["close"].cummax()
+    assert metrics["max_drawdown_pct"] == pytest.approx(((df["close"] - peaks) / peaks * 100).min())
+
+
+def test_short_history(df):
+    one = AnalyticsEngine.calculate_metrics(df.iloc[:1])
+    assert one["rsi"] == 50.0 and one["volatility"] == 0.0 and one["price"] == df["close"].iloc[0]
+    few = AnalyticsEngine.calculate_metrics(df.iloc[:10])
+    assert few["volatility"] == 0.0 and few["whale_count"] == 0
+    assert AnalyticsEngine.calculate_metrics(df.iloc[:0])["price"] == 0.0
@@ -0,0 +1,29 @@
+import numpy as np
+from engine.monte_carlo import MonteCarloEngine, StreamingQuantiles
+
+
+def test_streaming_quantiles_match_np_percentile():
+    rng = np.random.default_rng(0)
+    blocks = [rng.normal([0.0, 1.0, -2.0], [1.0, 0.1, 3.0], (5_000, 3)) for _ in range(4)]
+    reducer = StreamingQuantiles(lo=[-8.0, 0.2, -26.0], hi=[8.0, 1.8, 22.0])
+    for block in blocks:
+        reducer.update(block)
+
+    qs = [0.05, 0.25, 0.5, 0.75, 0.95]
+    exact = np.percentile(np.vstack(blocks), np.array(qs) * 100, axis=0)
+    assert reducer.count == 20_000
+    # Within one bin width per column
+    assert (np.abs(reducer.quantiles(qs) - exact) <= reducer.width).all()
+
+
+def test_bands_match_the_full_path_matrix():
+    args = (100.0, 30, 0.1, 0.6, 20_000)
+    bands = MonteCarloEngine(seed=11).percentile_bands(*args)
+    paths = MonteCarloEngine(seed=11).simulate_paths(*args, antithetic=True)
+
+    for p in (5, 25, 50, 75, 95):
+        exact = np.percentile(paths, p, axis=0)
+        assert np.allclose(bands[f"p{p}"], exact, rtol=1e-3), p
+    assert np.allclose(bands["mean"], paths.mean(axis=0))
+    assert bands["terminal_counts"].sum() == 20_000
+    assert len(bands["terminal_edges"]) == len(bands["terminal_counts"]) + 1
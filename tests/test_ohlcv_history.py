@@ -0,0 +1,59 @@
+import pandas as pd
+from engine.ohlcv_store import OHLCVStore
+from conftest import FakeExchange
+
+HOUR = 3_600_000
+START = 1_700_000_000_000 - 1_700_000_000_000 % HOUR
+
+
+def test_backfill_fills_interior_hole(provider):
+    ex = FakeExchange(end_ms=START + 299 * HOUR)
+    # Stored series: bars 0-99 and 200-299, the hole an incremental sync leaves behind
+    stored = [ex.bar(START + i * HOUR) for i in list(range(100)) + list(range(200, 300))]
+    provider.ohlcv_store.append(ex.id, "BTC/USDT", "1h", OHLCVStore.ohlcv_to_frame(stored))
+
+    df = provider._backfill_ohlcv(ex, "BTC/USDT", "1h", START, START + 299 * HOUR, page_limit=50)
+
+    assert len(df) == 300
+    assert (df.index.to_series().diff().dropna() == pd.Timedelta(hours=1)).all()
+    # Only the hole was requested, as two pages
+    assert sorted(since for _, since, _ in ex.calls) == [START + 100 * HOUR, START + 150 * HOUR]
+
+
+def test_backfill_does_not_rerequest_unfillable_hole(provider):
+    halted = {START + i * HOUR for i in range(40, 60)}
+    ex = FakeExchange(end_ms=START + 99 * HOUR, missing=halted)
+    bars = [ex.bar(START + i * HOUR) for i in range(100) if START + i * HOUR not in halted]
+    provider.ohlcv_store.append(ex.id, "BTC/USDT", "1h", OHLCVStore.ohlcv_to_frame(bars))
+
+    provider._backfill_ohlcv(ex, "BTC/USDT", "1h", START, START + 99 * HOUR, page_limit=50)
+    assert (START + 40 * HOUR) in [since for _, since, _ in ex.calls]
+    ex.calls.clear()
+    provider._backfill_ohlcv(ex, "BTC/USDT", "1h", START, START + 99 * HOUR, page_limit=50)
+    assert ex.calls == []
+
+
+def test_gaps_detects_missing_bars():
+    index = pd.to_datetime([0, HOUR, 4 * HOUR, 5 * HOUR, 7 * HOUR], unit='ms', utc=True)
+    from engine.data_provider import DataProvider
+    assert DataProvider._ohlcv_gaps(index, HOUR) == [(2 * HOUR, 3 * HOUR), (6 * HOUR, 6 * HOUR)]
+
+
+def test_backfill_does_not_rerequest_before_listing(provider):
+    day = 24 * HOUR
+    start = START - START % day
+    listed = start + 165 * day
+    ex = FakeExchange(step_ms=day, end_ms=start + 364 * day, missing={start + i * day for i in range(165)})
+
+    df = provider._backfill_ohlcv(ex, "BTC/USDT", "1d", start, start + 364 * day, page_limit=100)
+    assert len(df) == 200 and df.index[0].value // 10**6 == listed
+    # Refreshes with a window drifting forward only ask for the bars after the last stored one
+    for drift in (HOUR, day):
+        ex.calls.clear()
+        provider._backfill_ohlcv(ex, "BTC/USDT", "1d", start + drift, start + 364 * day + drift, page_limit=100)
+        assert [since for _, since, _ in ex.calls] == [start + 364 * day]
+
+    # A window reaching further back than the one checked is requested again
+    ex.calls.clear()
+    provider._backfill_ohlcv(ex, "BTC/USDT", "1d", start - 10 * day, start + 364 * day, page_limit=100)
+    assert start - 10 * day in [since for _, since, _ in ex.calls]
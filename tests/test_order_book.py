@@ -0,0 +1,106 @@
+import queue
+import time
+from engine.order_book import BookTransport, LocalOrderBook, OrderBookEngine, ReplayTransport
+
+SNAPSHOT = {"bids": [[99.0, 1.0], [98.0, 2.0]], "asks": [[101.0, 1.0], [102.0, 3.0]], "nonce": 10}
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+class QueueTransport(BookTransport):
+    """Diff messages pushed by the test one at a time; None ends the stream (then reconnects)."""
+
+    def __init__(self):
+        self.messages = queue.Queue()
+        self.snapshots = 0
+
+    def snapshot(self, symbol, limit):
+        self.snapshots += 1
+        return SNAPSHOT
+
+    def stream(self, symbol):
+        while True:
+            msg = self.messages.get()
+            if msg is None:
+                return
+            yield msg
+
+
+def test_local_book_applies_diffs_in_price_order():
+    book = LocalOrderBook()
+    book.apply_snapshot(SNAPSHOT["bids"], SNAPSHOT["asks"], 10)
+    book.apply_diff([[99.5, 4.0], [98.0, 0]], [[101.0, 0], [100.5, 2.0]], 11)
+    top = book.top(5)
+    assert top["bids"] == [[99.5, 4.0], [99.0, 1.0]]
+    assert top["asks"] == [[100.5, 2.0], [102.0, 3.0]]
+    assert book.mid() == 100.0
+    assert book.imbalance() == 5.0 / 5.0
+
+
+def test_replay_transport_drives_the_engine():
+    messages = [
+        {"U": 5, "u": 9, "b": [], "a": []},  # already in the snapshot
+        {"U": 10, "u": 11, "b": [[99.0, 5.0]], "a": []},
+        {"U": 12, "u": 12, "b": [], "a": [[101.0, 0]]},
+    ]
+    engine = OrderBookEngine(ReplayTransport({"BTC/USDT": SNAPSHOT}, {"BTC/USDT": messages}))
+    engine.subscribe("BTC/USDT")
+    assert engine.wait_ready("BTC/USDT", timeout=2)
+    assert wait_for(lambda: engine.top("BTC/USDT").get("nonce") == 12)
+    top = engine.top("BTC/USDT")
+    assert top["bids"][0] == [99.0, 5.0] and top["asks"][0] == [102.0, 3.0]
+    assert [round(h["imbalance"], 3) for h in engine.history("BTC/USDT")] == [round(7 / 4, 3), round(7 / 3, 3)]
+
+
+def test_sequence_gap_and_disconnect_clear_ready():
+    transport = QueueTransport()
+    engine = OrderBookEngine(transport)
+    engine.subscribe("BTC/USDT")
+    transport.messages.put({"U": 11, "u": 11, "b": [], "a": []})
+    assert engine.wait_ready("BTC/USDT", timeout=2)
+
+    transport.messages.put({"U": 20, "u": 21, "b": [], "a": []})  # 12-19 lost
+    assert wait_for(lambda: not engine.is_ready("BTC/USDT"))
+    assert engine.top("BTC/USDT") == {}
+    transport.messages.put({"U": 11, "u": 12, "b": [], "a": []})  # re-snapshots, back in sequence
+    assert wait_for(lambda: engine.is_ready("BTC/USDT"))
+    assert transport.snapshots == 2
+
+    transport.messages.put(None)  # connection dropped; reconnect waits for the backoff
+    assert wait_for(lambda: not engine.is_ready("BTC/USDT"))
+    engine.stop()
+    transport.messages.put(None)
+
+
+def test_max_age_treats_a_quiet_book_as_stale():
+    transport = QueueTransport()
+    engine = OrderBookEngine(transport)
+    engine.subscribe("BTC/USDT")
+    transport.messages.put({"U": 11, "u": 11, "b": [], "a": []})
+    assert engine.wait_ready("BTC/USDT", timeout=2)
+    assert engine.is_ready("BTC/USDT", max_age=5)
+    time.sleep(0.06)
+    assert not engine.is_ready("BTC/USDT", max_age=0.05)
+    engine.stop()
+    transport.messages.put(None)
+
+
+def test_idle_and_least_recently_used_subscriptions_are_closed():
+    engine = OrderBookEngine(ReplayTransport({}, {}), max_subscriptions=2, idle_timeout=60)
+    engine.subscribe("A/USDT")
+    engine.subscribe("B/USDT")
+    engine.is_ready("A/USDT")  # a read renews A
+    engine.subscribe("C/USDT")
+    assert sorted(engine.symbols()) == ["A/USDT", "C/USDT"]
+
+    engine.idle_timeout = 0.01
+    time.sleep(0.02)
+    engine.subscribe("D/USDT")
+    assert engine.symbols() == ["D/USDT"]
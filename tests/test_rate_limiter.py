@@ -0,0 +1,83 @@
+import threading
+import time
+from engine.rate_limiter import BACKGROUND, INTERACTIVE, RateScheduler, TokenBucket
+from conftest import FakeExchange
+
+
+def test_token_bucket_refills_at_rate():
+    bucket = TokenBucket(rate=10.0, capacity=2.0)
+    bucket.consume(2.0)
+    assert 0.09 < bucket.wait_time(1.0) <= 0.1
+    time.sleep(0.1)
+    assert bucket.wait_time(1.0) == 0.0
+
+
+def test_interactive_requests_are_served_before_background_ones():
+    scheduler = RateScheduler({"venue": (20.0, 1.0)})
+    scheduler.acquire("venue")  # drain the bucket so everyone queues
+    order, threads = [], []
+
+    def request(name, priority):
+        scheduler.acquire("venue", priority=priority)
+        order.append(name)
+
+    for name, priority in [("bg1", BACKGROUND), ("bg2", BACKGROUND), ("ui", INTERACTIVE)]:
+        threads.append(threading.Thread(target=request, args=(name, priority)))
+        threads[-1].start()
+        time.sleep(0.005)  # enqueue in this order, well before the next token (50 ms)
+    for t in threads:
+        t.join(2)
+    assert order == ["ui", "bg1", "bg2"]
+    assert scheduler.metrics()["venue"]["granted"] == 4
+
+
+def test_background_context_sets_priority():
+    scheduler = RateScheduler({"venue": (1000.0, 10.0)})
+    with RateScheduler.background():
+        scheduler.acquire("venue")
+    scheduler.acquire("venue")
+    waits = scheduler._get("venue").waits_by_priority
+    assert waits[BACKGROUND][0] == 1 and waits[INTERACTIVE][0] == 1
+
+
+def test_cost_is_charged_and_clamped_to_capacity():
+    scheduler = RateScheduler({"venue": (10.0, 10.0)})
+    scheduler.acquire("venue", cost=4)
+    assert round(scheduler.metrics()["venue"]["tokens"]) == 6
+    start = time.monotonic()
+    scheduler.acquire("venue", cost=1000)  # waits for a full bucket (~0.4 s) instead of forever
+    assert 0.3 < time.monotonic() - start < 1.0
+
+
+def test_heavy_endpoints_cost_more(provider):
+    charged = []
+    provider.rate_scheduler = type("Recorder", (), {"acquire": lambda self, upstream, cost=1: charged.append((upstream, cost))})()
+    ex = FakeExchange()
+    ex.fetch_tickers = lambda: {}
+    ex.fetch_order_book = lambda symbol, limit=None: {"bids": [], "asks": []}
+    provider._exchange_call(ex, "fetch_tickers")
+    provider._exchange_call(ex, "fetch_order_book", "BTC/USDT", limit=1000)
+    provider._exchange_call(ex, "fetch_order_book", "BTC/USDT", limit=50)
+    provider._exchange_call(ex, "fetch_ohlcv", "BTC/USDT", "1h", since=0, limit=10)
+    assert charged == [("binance", 20), ("binance", 25), ("binance", 2), ("binance", 1)]
+
+
+def test_markets_and_depth_snapshots_go_through_the_limiter(provider):
+    calls = []
+    real = provider._upstream_call
+    provider._upstream_call = lambda upstream, method, fn, *a, **kw: calls.append(method) or real(upstream, method, fn, *a, **kw)
+    ex = FakeExchange()
+    ex.markets = {}
+
+    def load_markets(reload=False):
+        ex.markets = {"BTC/USDT": {}}
+        return ex.markets
+
+    ex.load_markets = load_markets
+    ex.currencies = {}
+    ex.fetch_order_book = lambda symbol, limit=None: {"bids": [], "asks": [], "nonce": 1}
+    # First exchange call loads the markets through the limiter instead of CCXT doing it implicitly
+    provider._exchange_call(ex, "fetch_ohlcv", "BTC/USDT", "1h", since=0, limit=2)
+    provider.order_books.transport.exchange = ex
+    provider.order_books.transport.snapshot("BTC/USDT", 1000)
+    assert calls == ["load_markets", "fetch_ohlcv", "fetch_order_book"]
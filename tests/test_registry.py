@@ -0,0 +1,38 @@
+import threading
+from engine import registry
+
+
+def test_data_provider_builds_in_a_clean_registry(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("KITSUNE_CASSETTE", raising=False)
+    monkeypatch.setattr(registry, "_instances", {})
+    monkeypatch.setattr(registry, "_locks", {})
+    result = []
+
+    # On a thread, so a deadlock fails the test instead of hanging the run
+    thread = threading.Thread(target=lambda: result.append(registry.get_data_provider()), daemon=True)
+    thread.start()
+    thread.join(30)
+    assert result, "get_data_provider() did not return"
+
+    provider = result[0]
+    assert registry.get_data_provider() is provider
+    assert provider.rate_scheduler is registry.get_shared("rate_scheduler", lambda: None)
+
+
+def test_factory_runs_once_under_concurrency(monkeypatch):
+    monkeypatch.setattr(registry, "_instances", {})
+    monkeypatch.setattr(registry, "_locks", {})
+    built = []
+
+    def factory():
+        built.append(1)
+        return object()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get_shared("engine", factory))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    assert len(built) == 1 and len(set(map(id, results))) == 1
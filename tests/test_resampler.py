@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+from engine.resampler import can_derive, resample_ohlcv, timeframe_seconds
+
+
+def hourly(start: str, hours: int) -> pd.DataFrame:
+    index = pd.date_range(start, periods=hours, freq="h", tz="UTC", name="timestamp")
+    close = np.arange(1.0, hours + 1)
+    return pd.DataFrame({"open": close - 0.5, "high": close + 1, "low": close - 1, "close": close, "volume": 1.0}, index=index)
+
+
+def test_timeframes():
+    assert timeframe_seconds("15m") == 900 and timeframe_seconds("1w") == 604800
+    assert can_derive("4h", "1h") and not can_derive("90m", "1h") and not can_derive("1h", "4h")
+    with pytest.raises(ValueError):
+        resample_ohlcv(hourly("2024-01-01", 4), "90m", "1h")
+
+
+def test_aggregates_full_buckets():
+    bars = resample_ohlcv(hourly("2024-01-01", 8), "4h", "1h")
+    assert list(bars.index.hour) == [0, 4]
+    first = bars.iloc[0]
+    assert (first["open"], first["high"], first["low"], first["close"], first["volume"]) == (0.5, 5.0, 0.0, 4.0, 4.0)
+
+
+def test_partial_buckets():
+    df = hourly("2024-01-01 02:00", 8)  # 02:00 .. 09:00
+    assert list(resample_ohlcv(df, "4h", "1h").index.hour) == [4]
+    assert list(resample_ohlcv(df, "4h", "1h", include_partial=True).index.hour) == [4, 8]
+
+
+def test_single_forming_bucket_is_kept_with_include_partial():
+    df = hourly("2024-01-01 00:00", 3)
+    assert resample_ohlcv(df, "4h", "1h").empty
+    bars = resample_ohlcv(df, "4h", "1h", include_partial=True)
+    assert len(bars) == 1 and bars["close"].iloc[0] == 3.0 and bars["volume"].iloc[0] == 3.0
+
+
+def test_weeks_open_on_monday():
+    df = hourly("2024-01-01", 24 * 14)  # 2024-01-01 is a Monday
+    weeks = resample_ohlcv(df, "1w", "1h")
+    assert len(weeks) == 2 and all(ts.dayofweek == 0 for ts in weeks.index)
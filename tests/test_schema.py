@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+from engine.schema import OHLCV_COLUMNS, empty_ohlcv, normalize_ohlcv
+
+
+def assert_canonical(df, dtype=np.float64):
+    assert list(df.columns) == OHLCV_COLUMNS
+    assert isinstance(df.index, pd.DatetimeIndex) and str(df.index.tz) == "UTC"
+    assert df.index.name == "timestamp"
+    assert df.index.is_monotonic_increasing and not df.index.has_duplicates
+    assert (df.dtypes == dtype).all()
+
+
+def test_yfinance_multiindex_frame():
+    index = pd.DatetimeIndex(["2024-01-03", "2024-01-02", "2024-01-04"], name="Date")
+    columns = pd.MultiIndex.from_product([["Open", "High", "Low", "Close", "Adj Close", "Volume"], ["GC=F"]])
+    raw = pd.DataFrame(np.arange(18, dtype=float).reshape(3, 6), index=index, columns=columns)
+    raw.iloc[2, 3] = np.nan  # no close on the last day
+
+    df = normalize_ohlcv(raw)
+    assert_canonical(df)
+    assert list(df.index) == list(pd.DatetimeIndex(["2024-01-02", "2024-01-03"], tz="UTC"))
+    assert df.loc["2024-01-03", "close"] == 3.0 and df.loc["2024-01-02", "volume"] == 11.0
+
+
+def test_missing_columns_duplicates_and_timezones():
+    index = pd.DatetimeIndex(["2024-01-01 01:00", "2024-01-01 02:00", "2024-01-01 02:00"], tz="Europe/Rome")
+    raw = pd.DataFrame({"Close": [1.0, 2.0, 3.0]}, index=index)
+
+    df = normalize_ohlcv(raw, np.float32)
+    assert_canonical(df, np.float32)
+    assert list(df.index.hour) == [0, 1]
+    # Last duplicate wins; open/high/low fall back to close, volume to 0
+    assert df.iloc[-1].tolist() == [3.0, 3.0, 3.0, 3.0, 0.0]
+
+
+def test_empty_and_invalid_input():
+    assert_canonical(normalize_ohlcv(None))
+    assert_canonical(empty_ohlcv(np.float32), np.float32)
+    with pytest.raises(ValueError):
+        normalize_ohlcv(pd.DataFrame({"price": [1.0]}, index=pd.DatetimeIndex(["2024-01-01"])))
+    two_tickers = pd.MultiIndex.from_product([["Close"], ["GC=F", "^GSPC"]])
+    with pytest.raises(ValueError):
+        normalize_ohlcv(pd.DataFrame([[1.0, 2.0]], index=pd.DatetimeIndex(["2024-01-01"]), columns=two_tickers))
+
+
+def test_failed_provider_fetches_are_canonical(provider):
+    def down(*args, **kwargs):
+        raise ConnectionError("offline")
+
+    provider._upstream_call = down
+    provider._sync_dex_ohlcv = down
+    assert_canonical(provider._load_macro_data("AAPL", "1y"))
+    assert_canonical(provider._load_dex_ohlcv("0xpool", "1h", 10))
+    for df in provider.fetch_macro_batch(period="5d").values():
+        assert_canonical(df)
+    frames = provider._split_macro_batch(pd.DataFrame(), ["Gold"], ["GC=F"], np.float32)
+    assert_canonical(frames["Gold"], np.float32)
@@ -0,0 +1,57 @@
+import threading
+import time
+import pytest
+from engine.singleflight import SingleFlight
+
+
+def run_concurrently(n, target):
+    results = [None] * n
+    def worker(i):
+        try:
+            results[i] = target()
+        except Exception as e:
+            results[i] = e
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    return results
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        # Stay in flight until the other seven callers have joined
+        deadline = time.time() + 5
+        while len(calls) == 1 and flight.stats()["coalesced"] < 7 and time.time() < deadline:
+            time.sleep(0.01)
+        return {"price": 1.0}
+
+    results = run_concurrently(8, lambda: flight.do(("binance", "fetch_ticker", "BTC/USDT"), fetch))
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    assert flight.stats() == {"executed": 1, "coalesced": 7, "in_flight": 0}
+
+    # Once finished, the next call runs again instead of reusing the old result
+    flight.do(("binance", "fetch_ticker", "BTC/USDT"), fetch)
+    assert len(calls) == 2
+
+
+def test_errors_reach_every_waiter_and_keys_are_independent():
+    flight = SingleFlight()
+
+    def fail():
+        time.sleep(0.2)
+        raise ConnectionError("upstream down")
+
+    results = run_concurrently(4, lambda: flight.do("ticker", fail))
+    assert all(isinstance(r, ConnectionError) for r in results)
+    assert flight.stats()["in_flight"] == 0
+
+    assert flight.do("a", lambda: 1) == 1 and flight.do("b", lambda: 2) == 2
+    with pytest.raises(ValueError):
+        flight.do("c", lambda: int("x"))
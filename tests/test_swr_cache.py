@@ -0,0 +1,104 @@
+import threading
+import time
+from types import SimpleNamespace
+import pandas as pd
+import pytest
+from engine import swr_cache
+from engine.swr_cache import SWRCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(value=1_000.0)
+    monkeypatch.setattr(swr_cache, "time", SimpleNamespace(time=lambda: now.value))
+    return now
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert condition()
+
+
+def test_fresh_stale_and_expired(clock):
+    cache = SWRCache({"quote": (10, 50)})
+    loads = []
+
+    def loader():
+        loads.append(clock.value)
+        return {"last": len(loads)}
+
+    assert cache.get("quote", "BTC", loader) == {"last": 1}
+    clock.value += 5
+    assert cache.get("quote", "BTC", loader) == {"last": 1}
+    assert loads == [1_000.0]
+
+    # Stale: served immediately, replaced by one background refresh
+    clock.value += 10
+    assert cache.get("quote", "BTC", loader) == {"last": 1}
+    wait_for(lambda: cache.stats()["refreshes"] == 1)
+    assert cache.peek("quote", "BTC") == ({"last": 2}, "fresh")
+
+    # Past fresh + stale the caller waits for the loader
+    clock.value += 100
+    assert cache.get("quote", "BTC", loader) == {"last": 3}
+    assert cache.stats()["misses"] == 2 and cache.stats()["stale_hits"] == 1
+
+
+def test_stale_key_refreshes_once(clock):
+    cache = SWRCache({"quote": (10, 50)})
+    cache.put("quote", "BTC", {"last": 1})
+    clock.value += 20
+    release = threading.Event()
+    loads = []
+
+    def loader():
+        loads.append(1)
+        release.wait(5)
+        return {"last": 2}
+
+    for _ in range(5):
+        assert cache.get("quote", "BTC", loader) == {"last": 1}
+    release.set()
+    wait_for(lambda: cache.stats()["refreshes"] == 1)
+    assert len(loads) == 1
+
+
+def test_empty_results_are_cached_briefly(clock):
+    cache = SWRCache({"news": (300, 3600)}, empty_ttl=30)
+    loads = []
+    loader = lambda: loads.append(1) or []
+
+    # No news for a small token: reruns within empty_ttl do not ask again
+    for _ in range(3):
+        assert cache.get("news", "ATH", loader) == []
+    assert len(loads) == 1
+    clock.value += 31
+    assert cache.get("news", "ATH", loader) == []
+    assert len(loads) == 2
+
+    # Nor is an empty frame kept for the full freshness budget
+    assert cache.get("news", "BTC", pd.DataFrame).empty
+    clock.value += 31
+    assert cache.peek("news", "BTC") == (None, "miss")
+
+
+def test_failed_refresh_keeps_the_last_good_value(clock):
+    cache = SWRCache({"news": (10, 50)})
+    cache.put("news", "BTC", ["headline"])
+    clock.value += 20
+    assert cache.get("news", "BTC", list) == ["headline"]
+    wait_for(lambda: cache.stats()["refreshes"] == 1)
+    assert cache.peek("news", "BTC") == (["headline"], "stale")
+
+
+def test_lru_eviction(clock):
+    cache = SWRCache({"quote": (10, 50)}, max_entries=2)
+    cache.put("quote", "A", 1)
+    cache.put("quote", "B", 2)
+    cache.get("quote", "A", lambda: 0)  # A becomes most recently used
+    cache.put("quote", "C", 3)
+    assert cache.peek("quote", "B") == (None, "miss")
+    assert cache.peek("quote", "A")[0] == 1 and cache.peek("quote", "C")[0] == 3
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,56 @@
+from engine.ticker_search import TickerSearchIndex
+
+
+def index():
+    search = TickerSearchIndex()
+    search.add(["BTC/USDT", "BTC/USDC", "BTC/EUR", "ETH/USDT", "ETH/USDC", "ETHFI/USDT", "ATH/USDT", "BTCDOM/USDT"],
+               exchange="binance")
+    search.add(["ATH/USDT", "ETH/USDT"], exchange="mexc")
+    search.add({"Gold": "GC=F", "S&P 500": "^GSPC"}, kind="macro", aliases={"Gold": ["GC=F"]})
+    return search
+
+
+def test_exact_base_before_prefix_matches():
+    search = index()
+    # The asset beats longer bases sharing the prefix; its pairs follow the usual quote order
+    assert search.search("btc") == ["BTC/USDT", "BTC/USDC", "BTC/EUR", "BTCDOM/USDT"]
+    assert search.search("eth")[:3] == ["ETH/USDT", "ETH/USDC", "ETHFI/USDT"]
+    # Among prefix matches the quote currency comes before the name length
+    assert search.search("bt", limit=2) == ["BTC/USDT", "BTCDOM/USDT"]
+    assert search.search("BTC/US") == ["BTC/USDT", "BTC/USDC"]
+
+
+def test_popularity_breaks_ties():
+    assert index().search("btc", popularity={"BTC/EUR": 1e9})[0] == "BTC/EUR"
+
+
+def test_aliases():
+    search = index()
+    assert search.search("xbt") == ["BTC/USDT", "BTC/USDC", "BTC/EUR"]
+    assert search.search("athene") == ["ATH/USDT"]
+    assert search.search("gc=f") == ["Gold"]
+    # An alias ranks below the asset it names
+    search.add(["XBT/USDT"], exchange="kraken")
+    assert search.search("xbt")[0] == "XBT/USDT"
+
+
+def test_fuzzy_matches_only_without_a_prefix_match():
+    search = index()
+    typo = search.search("etherium")
+    assert typo[0] == "ETH/USDT" and "ETH/USDC" in typo
+    assert "BTC/USDT" in search.search("bitcon")
+    assert search.search("qqq") == []
+    # Typo candidates are only looked for when nothing starts with the query
+    assert search.search("btx")[0] == "BTC/USDT"
+    search.add(["BTX/USDT"])
+    assert search.search("btx") == ["BTX/USDT"]
+
+
+def test_extra_words_narrow_by_quote_or_exchange():
+    search = index()
+    assert search.search("eth usdc") == ["ETH/USDC"]
+    assert search.search("ath mexc") == ["ATH/USDT"]
+    assert search.search("btc mexc") == []
+    assert search.search("eth binance usdt") == ["ETH/USDT", "ETHFI/USDT"]
+    assert search.search("", kinds=["macro"]) == ["Gold", "S&P 500"]
+    assert search.exchanges("ATH/USDT") == {"binance", "mexc"}
@@ -315,3 +315,33 @@ def macro_insight_banner(message: str):
         <span style='color: #E8EAED; font-size: 0.95rem;'>{message}</span>
     </div>
     """, unsafe_allow_html=True)
+
+def ticker_selector(label: str, search, key: str, default: str = None, allow_empty: bool = False, limit: int = 20):
+    """Type-ahead asset picker: only the top `limit` matches for the typed query are sent to the browser."""
+    query = st.text_input(f"{label} search", key=f"{key}_query", placeholder="BTC, ETH/USDC, ath mexc...", label_visibility="collapsed")
+    current = st.session_state.get(key, default)
+    options = search(query, limit)
+    # Keep the current choice selectable while the user types a new query
+    if current and current not in options:
+        options = [current] + options
+    if allow_empty:
+        options = [""] + options
+    if key not in st.session_state and default in options:
+        st.session_state[key] = default
+    return st.selectbox(label, options, key=key)
+
+def ticker_multiselector(label: str, search, key: str, default: list = None, limit: int = 20):
+    """Type-ahead multi-asset picker; selected tickers stay available whatever the current query."""
+    query = st.text_input(f"{label} search", key=f"{key}_query", placeholder="Search assets...", label_visibility="collapsed")
+    # The selection lives outside the widget, which Streamlit resets whenever its options change
+    selected_key = f"{key}_selected"
+    if selected_key not in st.session_state:
+        st.session_state[selected_key] = list(default or [])
+    selected = st.session_state[selected_key]
+    options = list(selected) + [ticker for ticker in search(query, limit) if ticker not in selected]
+    st.session_state[key] = list(selected)
+
+    def remember():
+        st.session_state[selected_key] = st.session_state[key]
+
+    return st.multiselect(label, options, key=key, on_change=remember)